@@ -1,8 +1,17 @@
 import os
 import re
+import json
 import numpy as np
 import csv
 
+LATENCY_STATS = ['nvme_read', 'search', 'scoring', 'query_embedding']
+
+# Function to read the relevant stats from a JSON summary written by `eurekastore.py --summary`
+def extract_stats_from_summary(summary_file):
+    with open(summary_file, 'r') as file:
+        latency_breakdown = json.load(file)['system']['latency_breakdown']
+    return {stat: float(latency_breakdown[stat]) for stat in LATENCY_STATS}
+
 # Function to extract the relevant stats from each log file
 def extract_stats_from_log(log_file):
     with open(log_file, 'r') as file:
@@ -36,13 +45,17 @@ def extract_stats_from_log(log_file):
 def calculate_stats(directory, output_file):
     config_stats = {}
 
-    for filename in os.listdir(directory):
-        if filename.endswith('.txt'):
-            parts = filename.split('-')
+    filenames = os.listdir(directory)
+    for filename in filenames:
+        name, extension = os.path.splitext(filename)
+        # Prefer the JSON summary of a run; only scrape logs of runs that have none
+        if extension == '.json' or (extension == '.txt' and f"{name}.json" not in filenames):
+            # Key on the name without extension so a run's summary and log group together
+            parts = name.split('-')
             config_key = f"{parts[0]}-{parts[1]}-{parts[2]}"
 
-            log_file = os.path.join(directory, filename)
-            stats = extract_stats_from_log(log_file)
+            path = os.path.join(directory, filename)
+            stats = extract_stats_from_summary(path) if extension == '.json' else extract_stats_from_log(path)
             
             if stats:
                 if config_key not in config_stats:
@@ -1,8 +1,8 @@
 import os
 import logging
+from collections import namedtuple
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging; the level is configured by the entry point
 logger = logging.getLogger(__name__)
 
 def check_kernel_exists(kernel_path):
@@ -16,13 +16,88 @@ def check_kernel_exists(kernel_path):
         bool: True if the kernel directory exists, False otherwise.
     """
     if os.path.isdir(kernel_path):
-        logger.info(f"Kernel directory found: {kernel_path}")
+        logger.debug("Kernel directory found: %s", kernel_path)
         return True
     else:
-        logger.error(f"Kernel directory does not exist: {kernel_path}")
+        logger.error("Kernel directory does not exist: %s", kernel_path)
         return False
 
 
+# A kernel resolved once per run: executors receive this instead of re-deriving the path per call
+ResolvedKernel = namedtuple('ResolvedKernel', ['name', 'path'])
+
+# Define all valid options for benchmarks, dataset sizes, batch sizes, and execution modes
+VALID_BENCHMARKS = ['splade', 'colbert', 'doc2vec', 'gtr', 'bm25']
+VALID_DATASET_SIZES = ['500K', '5M', '50M', '500M']
+VALID_BATCH_SIZES = [1, 8, 64, 256, 1024]
+VALID_EXECUTION_MODES = ['standalone', 'distributed', 'dimension_split']
+
+def kernel_directory(execution_mode, retrieval_type):
+    """
+    Directory of the compiled kernels an execution mode runs.
+
+    Only dense dimension-split kernels score a slice of every vector. Distributed accelerators
+    score whole vectors of their shard and sparse dimension-split accelerators whole postings of
+    theirs, so both run the standalone kernels.
+    """
+    if execution_mode == 'dimension_split' and retrieval_type == 'dense':
+        return 'dimension_split'
+    return 'standalone'
+
+def reachable_computations(config):
+    """
+    Return the computations a config can dispatch to GeneSys kernels.
+
+    Scoring runs in every mode; query embedding only runs for dense retrieval.
+    """
+    computations = ['scoring']
+    if config['execution_mode']['type'] == 'dense':
+        computations.insert(0, 'embedding')
+    return computations
+
+
+def resolve_kernels(config):
+    """
+    Build the kernel registry for a config, resolving every reachable kernel exactly once.
+
+    Unlike select_kernel, invalid options and missing kernel directories raise immediately
+    instead of falling back to a default kernel, so a bad config fails before simulation starts.
+
+    Args:
+        config (dict): The simulator configuration.
+
+    Returns:
+        dict: Maps each computation ('embedding', 'scoring') to a ResolvedKernel.
+
+    Raises:
+        ValueError: If the benchmark, dataset size, batch size, or execution mode is unsupported.
+        FileNotFoundError: If a reachable kernel directory does not exist.
+    """
+    benchmark = config['benchmark']
+    dataset_size = config['dataset_size']
+    batch_size = config['query']['batch_size']
+    execution_mode = config['execution_mode']['parallelism']
+    base_path = config['kernels']['base_directory']
+
+    for name, value, valid in [('benchmark', benchmark, VALID_BENCHMARKS),
+                               ('dataset size', dataset_size, VALID_DATASET_SIZES),
+                               ('batch size', batch_size, VALID_BATCH_SIZES),
+                               ('execution mode', execution_mode, VALID_EXECUTION_MODES)]:
+        if value not in valid:
+            raise ValueError(f"Invalid {name} '{value}' specified; expected one of {valid}.")
+
+    registry = {}
+    for computation in reachable_computations(config):
+        kernel_name = config['kernels'][computation]
+        kernel_path = os.path.join(base_path, benchmark, dataset_size, kernel_directory(execution_mode, config['execution_mode']['type']),
+                                   f"batch{batch_size}", kernel_name)
+        if not os.path.isdir(kernel_path):
+            raise FileNotFoundError(f"Kernel directory does not exist for {computation}: {kernel_path}")
+        registry[computation] = ResolvedKernel(kernel_name, kernel_path)
+        logger.info("Resolved %s kernel: %s, Path: %s", computation, kernel_name, kernel_path)
+    return registry
+
+
 def select_kernel(config, computation, benchmark, dataset_size, batch_size, execution_mode, base_path="/path/to"):
     """
     Select the appropriate kernel and its path based on benchmark, dataset size, batch size, and execution mode.
@@ -60,11 +135,10 @@ def select_kernel(config, computation, benchmark, dataset_size, batch_size, exec
           SPLADE_500K_Batch8_Train_Kernel
     """
 
-    # Define all valid options for benchmarks, dataset sizes, batch sizes, and execution modes
-    valid_benchmarks = ['splade', 'colbert', 'doc2vec', 'gtr', 'bm25']
-    valid_dataset_sizes = ['500K', '5M', '50M', '500M']
-    valid_batch_sizes = [1, 8, 64, 256, 1024]
-    valid_execution_modes = ['standalone', 'dimension_split']
+    valid_benchmarks = VALID_BENCHMARKS
+    valid_dataset_sizes = VALID_DATASET_SIZES
+    valid_batch_sizes = VALID_BATCH_SIZES
+    valid_execution_modes = VALID_EXECUTION_MODES
 
     # Validate inputs
     if benchmark not in valid_benchmarks:
@@ -100,15 +174,14 @@ def select_kernel(config, computation, benchmark, dataset_size, batch_size, exec
         # Construct the new kernel name with the specified batch size
         # kernel_name = f"{remove_batch}_b{batch_size}_{remainder}"
 
-    print (f"Kernel name: {kernel_name}")
-    kernel_path = os.path.join(base_path, benchmark, dataset_size, execution_mode, f"batch{batch_size}", kernel_name)
-    print (f"Kernel path: {kernel_path}")
+    kernel_path = os.path.join(base_path, benchmark, dataset_size, kernel_directory(execution_mode, config['execution_mode']['type']),
+                               f"batch{batch_size}", kernel_name)
 
     # Ensure the directory exists
     # create_kernel_directory(kernel_path)
     check_kernel_exists(kernel_path)
 
-    logger.info(f"Selected kernel: {kernel_name}, Path: {kernel_path}")
+    logger.debug("Selected kernel: %s, Path: %s", kernel_name, kernel_path)
     return kernel_name, kernel_path
 
 def create_kernel_directory(path):
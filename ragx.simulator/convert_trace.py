@@ -0,0 +1,24 @@
+import os
+import argparse
+import time
+from tracefile.tracefile import BINARY_TRACE_EXTENSION, load_trace, save_binary_trace
+
+# Convert JSON/JSONL traces (e.g. baseline-cpu-dram/traces/*.json) to the binary trace format
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert JSON trace files to the binary trace format.")
+    parser.add_argument('traces', type=str, nargs='+', help="paths to JSON or JSONL trace files.")
+    parser.add_argument('--sparse', action="store_true",
+                        help="posting-list layout (bm25, splade): neighbor counts come from 'Number of Neighbors'.")
+    parser.add_argument('--output_dir', type=str, default=None,
+                        help="directory for converted traces (default: next to each input).")
+    args = parser.parse_args()
+
+    for trace_path in args.traces:
+        output_dir = args.output_dir or os.path.dirname(trace_path)
+        output_path = os.path.join(output_dir, os.path.splitext(os.path.basename(trace_path))[0] + BINARY_TRACE_EXTENSION)
+
+        start = time.time()
+        trace = load_trace(trace_path, sparse_layout=args.sparse)
+        save_binary_trace(trace, output_path)
+        print(f"Converted {trace_path} ({len(trace)} entries) -> {output_path} "
+              f"[{os.path.getsize(trace_path)} -> {os.path.getsize(output_path)} bytes, {time.time() - start:.2f}s]")
@@ -1,12 +1,12 @@
-import random
-import sys
-import json
+import argparse
 import logging
+import numpy as np
 from config.configparser import ConfigParser
 from ragx.ragx import RAGXAccelerator
 from ragx.interconnect import Interconnect
-from collections import defaultdict
+from ragx.event_engine import EventEngine
 from stats.stats import Stats
+from tracefile.tracefile import DENSE_ENTRY, load_trace
 
 
 # Setting up custom logging levels
@@ -28,14 +28,24 @@ def system(self, message, *args, **kwargs):
 logging.Logger.stats = stats
 logging.Logger.system = system
 
-# Configure the base logging level and format globally
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
+# Configure the base logging format globally; configure_logging() sets the level
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
+
+# (parallelism, retrieval type) pairs the discrete-event engines simulate; 'analytical' runs every mode
+ENGINE_MODES = {
+    'event': [('standalone', 'dense'), ('standalone', 'sparse'), ('distributed', 'dense'), ('dimension_split', 'sparse')],
+    'pipelined': [('standalone', 'dense')],
+}
+
+COMPONENT_LOGGERS = ["SystolicExecutor", "VectorExecutor", "ScalarExecutor", "Interconnect", "Memory"]
+LOG_LEVELS = {"DEBUG": logging.DEBUG, "SYSTEM": SYSTEM_LEVEL_NUM, "INFO": logging.INFO,
+              "STATS": STATS_LEVEL_NUM, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
 
 # Function to create a customized logger for each component
 def get_component_logger(component_name):
     # Create a specific logger for the component
     logger = logging.getLogger(component_name)
-    logger.setLevel(logging.DEBUG)  # Set to desired level for this component
+    logger.setLevel(logging.INFO)  # configure_logging() changes this with the root level
 
     # Define a custom formatter for this component
     formatter = logging.Formatter(f'%(asctime)s - {component_name} - %(levelname)s - %(message)s')
@@ -59,12 +69,23 @@ memory_logger = get_component_logger("Memory")
 
 logger = logging.getLogger(__name__)
 
+def configure_logging(level=logging.INFO):
+    """
+    Set the level of the root logger and every component logger.
+
+    DEBUG enables per-entry and per-task tracing, SYSTEM adds the system configuration, INFO
+    (the default) reports progress only and WARNING is the quiet mode. The stats report is
+    printed regardless of the level.
+    """
+    logging.getLogger().setLevel(level)
+    for component_name in COMPONENT_LOGGERS:
+        logging.getLogger(component_name).setLevel(level)
+
 class EurekaStoreSim:
     def __init__(self, trace_file, config):
         self.trace_file = trace_file
         self.config = config
-        self.trace_data = []
-        self.combined_sparse_postings = set()  # For tracking unique documents in sparse data
+        self.trace_data = None
         self.sparse_statistics = {} 
         self.accelerators = []
         self.interconnect = None
@@ -85,134 +106,20 @@ class EurekaStoreSim:
         self.log_system_config()
 
     def load_trace_file(self):
-        """Load trace data from JSON file into a unified structure."""
-        with open(self.trace_file, 'r') as file:
-            trace_json = json.load(file)
-            
-            for entry in trace_json:
-                if 'node' in entry:
-                    # Process as dense entry
-                    node = entry["node"]
-                    neighbors = entry["neighbors"]
-                    partitions = entry["partitions"]
-                    embedding_size = entry.get("embedding_size", 128)
-                    data_size = entry.get("data_size", 50)
-                    assigned_accelerator = entry.get("assigned_accelerator", 0 if self.execution_type != 'distributed' else None)
-
-                    if self.execution_type == 'distributed' and assigned_accelerator is None:
-                        raise KeyError(f"Trace entry missing 'assigned_accelerator' in distributed mode: {entry}")
-
-                    # Calculate dense-specific metrics
-                    neighbor_count = len(neighbors)
-                    
-                    # Handle `partitions` as a list, and calculate unique partition count
-                    partition_count = len(set(partitions)) if isinstance(partitions, list) else 1
-                    
-                    # Calculate neighbors per partition
-                    neighbors_per_partition = defaultdict(int)
-                    if isinstance(partitions, list):
-                        for partition, neighbor in zip(partitions, neighbors):
-                            neighbors_per_partition[partition] += 1
-
-                    # Add entry to unified trace_data structure
-                    self.trace_data.append({
-                        "type": "dense",
-                        "node": node,
-                        "token": None,
-                        "neighbors": neighbors,
-                        "neighbor_count": neighbor_count,
-                        "partitions": partitions,
-                        "partition_count": partition_count,
-                        "neighbors_per_partition": dict(neighbors_per_partition),
-                        "assigned_accelerator": assigned_accelerator,
-                        "embedding_size": embedding_size,
-                        "data_size": data_size,
-                        "document_count": None,
-                        "posting_size": None,
-                    })
-
-                elif 'token' in entry:
-                    # Process as sparse entry
-                    token = entry["token"]
-                    documents = entry["documents"]
-                    partitions = entry["partitions"]
-                    posting_size = entry.get("posting_size", 128)
-                    data_size = entry.get("data_size", 50)
-                    document_count = len(documents)
-
-                    # Update combined postings for sparse data statistics
-                    self.combined_sparse_postings.update(documents)
-
-                    # Add entry to unified trace_data structure
-                    self.trace_data.append({
-                        "type": "sparse",
-                        "node": None,
-                        "token": token,
-                        "neighbors": documents,
-                        "neighbor_count": document_count,
-                        "partitions": partitions,
-                        "partition_count": len(set(partitions)) if isinstance(partitions, list) else 1,
-                        "neighbors_per_partition": None,  # Not applicable for sparse
-                        "assigned_accelerator": None,  # Not applicable for sparse
-                        "embedding_size": None,  # Not applicable for sparse
-                        "data_size": data_size,
-                        "document_count": document_count,
-                        "posting_size": posting_size,
-                    })
-
-                else:
-                    raise ValueError("Trace entry format not recognized. Each entry must contain either 'node' or 'token'.")
+        """Stream trace data from a JSON (or JSON-lines) file into columnar storage."""
+        self.trace_data = load_trace(self.trace_file)
 
         # Calculate sparse statistics if sparse data was loaded
-        if any(entry['type'] == 'sparse' for entry in self.trace_data):
+        if self.trace_data.num_sparse > 0:
             self._calculate_sparse_statistics()
 
         logger.info(f"Trace File: Loaded {len(self.trace_data)} entries from the trace file.")
 
     def load_sparse_trace_file(self):
-        """Load trace data from JSON file into a unified structure."""
-        with open(self.trace_file, 'r') as file:
-            trace_json = json.load(file)
-            for entry in trace_json:
-                if 'node' in entry:
-                    # For the new format, we need to generate neighbors based on "Number of Neighbors"
-                    neighbors = [random.randint(1, 1_000_000) for _ in range(entry["Number of Neighbors"])]
-                    partitions = [0]
-
-                    # Extract other relevant fields
-                    node = entry["node"]
-                    embedding_size = entry.get("embedding_size", 128)
-                    data_size = entry.get("data_size", 50)
-
-                    # Calculate dense-specific metrics
-                    neighbor_count = entry["Number of Neighbors"]
-                    partition_count = len(set(partitions)) if isinstance(partitions, list) else 1
-
-                    # Calculate neighbors per partition (assuming equal distribution if partitions are provided)
-                    neighbors_per_partition = defaultdict(int)
-                    for partition in partitions:
-                        neighbors_per_partition[partition] += 1
-
-                    # Add entry to unified trace data structure
-                    self.trace_data.append({
-                        "type": "dense",
-                        "node": node,
-                        "token": None,  # No token field in this trace format
-                        "neighbors": neighbors,
-                        "neighbor_count": neighbor_count,
-                        "partitions": partitions,
-                        "partition_count": partition_count,
-                        "neighbors_per_partition": dict(neighbors_per_partition),
-                        "assigned_accelerator": None,  # Assuming no assigned accelerator for now
-                        "embedding_size": embedding_size,
-                        "data_size": data_size,
-                        "document_count": None,  # No document count in this trace format
-                        "posting_size": neighbor_count,  # No posting size in this trace format
-                    })
-                else:
-                    raise ValueError("Trace entry format not recognized. Entry must contain 'node'.")
+        """Stream a posting-list trace (entries carry "Number of Neighbors") into columnar storage."""
+        self.trace_data = load_trace(self.trace_file, sparse_layout=True)
 
-        print(f"Trace File: Loaded {len(self.trace_data)} entries.")
+        logger.info("Trace File: Loaded %d entries.", len(self.trace_data))
 
         
     def get_query_vector_size(self, batch_size, query_dimensions):
@@ -220,32 +127,23 @@ class EurekaStoreSim:
         return total_elements
 
     def get_doc_vector_size(self, batch_size, query_dimensions, num_docs):
-        print (f"batch_size: {batch_size}, query_dimensions: {query_dimensions}, num_docs: {num_docs}")
         total_elements = int(batch_size) * int(query_dimensions) * int(self.config['query']['datatype_bytes']) * num_docs
         ## returns the total number of bytes in the query vector
-        print (f"total_elements: {total_elements}")
+        logger.debug("batch_size: %s, query_dimensions: %s, num_docs: %s, total_elements: %s",
+                     batch_size, query_dimensions, num_docs, total_elements)
         return total_elements
     
     def _calculate_sparse_statistics(self):
         """Calculate statistics for sparse data, such as unique documents and average postings per token."""
-        total_postings = sum(entry['document_count'] for entry in self.trace_data if entry['type'] == 'sparse')
-        avg_postings_per_token = total_postings / len([entry for entry in self.trace_data if entry['type'] == 'sparse'])
-        unique_documents_count = len(self.combined_sparse_postings)
-
-        # Store calculated statistics
-        self.sparse_statistics = {
-            "total_postings": total_postings,
-            "avg_postings_per_token": avg_postings_per_token,
-            "unique_documents_count": unique_documents_count
-        }
+        self.sparse_statistics = self.trace_data.sparse_statistics()
 
     def print_trace_stats(self):
         """Print a summary of trace file statistics."""
-        num_dense_entries = sum(1 for entry in self.trace_data if entry['type'] == 'dense')
-        num_sparse_entries = sum(1 for entry in self.trace_data if entry['type'] == 'sparse')
+        num_dense_entries = self.trace_data.num_dense
+        num_sparse_entries = self.trace_data.num_sparse
         
         # Calculate average neighbor count for dense entries
-        total_neighbors_dense = sum(entry['neighbor_count'] for entry in self.trace_data if entry['type'] == 'dense')
+        total_neighbors_dense = int(self.trace_data.neighbor_counts[self.trace_data.entry_types == DENSE_ENTRY].sum())
         avg_neighbors_per_node = total_neighbors_dense / num_dense_entries if num_dense_entries > 0 else 0
 
         # Sparse statistics
@@ -311,15 +209,19 @@ class EurekaStoreSim:
     
     def calculate_nvme_read_time(self, data_size):
         """Calculate NVMe read time for a given data size using bandwidth and latency values."""
+        read_time_us = self.nvme_read_time_us(data_size)
+        logger.debug("NVMe read of %s bytes (%s pages at %s GB/s, %s ns latency): %s us",
+                     data_size, (data_size + self.config['page_size'] - 1) // self.config['page_size'],
+                     self.config['nvme_bandwidth_gbps'], self.config['nvme_latency_ns'], read_time_us)
+        return read_time_us
+
+    def nvme_read_time_us(self, data_size):
+        """NVMe read time in us; data_size may be a single size or a numpy array of sizes."""
         page_size = self.config['page_size']  # Page size in bytes
         nvme_bandwidth_gbps = self.config['nvme_bandwidth_gbps']  # NVMe bandwidth in GB/s
         nvme_latency_ns = self.config['nvme_latency_ns']  # NVMe latency in nanoseconds
-        print (f"nvme_bandwidth_gbps: {nvme_bandwidth_gbps}")
-        print (f"nvme_latency_ns: {nvme_latency_ns}")
-        print (f"data_size: {data_size}")
         # Round data size to nearest page size
         pages = (data_size + page_size - 1) // page_size
-        print (f"pages: {pages}")
         total_data_size = pages * page_size  # Adjusted data size for rounding
 
         # Calculate read time using both latency and bandwidth
@@ -329,6 +231,18 @@ class EurekaStoreSim:
         total_read_time_us =  total_read_time/1e3 # convert to us
         return total_read_time_us
 
+    def charge_staging_energy(self, accelerator, data_sizes):
+        """
+        Charge the energy of staging NVMe reads of the given sizes into the accelerator's scratchpad.
+
+        The event engine's navigators charge the same energy per read, so both engines report
+        comparable energy. The memory model is queried once per distinct read size.
+        """
+        sizes, reads = np.unique(np.asarray(data_sizes, dtype=np.int64), return_counts=True)
+        energy = sum(accelerator.memory_unit.load_from_dram_to_scratchpad(0, size) * count
+                     for size, count in zip(sizes.tolist(), reads.tolist()))
+        self.stats.update_scratchpad_energy(accelerator.accelerator_id, energy)
+
     def send_top_k_to_cpu_latency(self, top_k_size):
         """Calculate the latency for transferring top-k results to the CPU in microseconds."""
         d2h_pcie_latency_ns = self.config['d2h_pcie_latency_ns']  # PCIe latency in nanoseconds
@@ -352,13 +266,11 @@ class EurekaStoreSim:
         accelerator = self.accelerators[0]
         total_energy, total_latency = 0, 0
         cnt = 1
-        for entry in self.trace_data:
+        nodes = self.trace_data.nodes.tolist()
+        for i, (node, num_neighbors) in enumerate(zip(nodes, self.trace_data.neighbor_counts.tolist())):
             max_latency = 0
-            logger.system(f"Processing entry {cnt} of {len(self.trace_data)}")
-            node = entry["node"]
-            neighbors = entry["neighbors"]
-            num_neighbors = len(neighbors)
-            targets = [node] + neighbors
+            logger.debug("Processing entry %d of %d", cnt, len(self.trace_data))
+            targets = self.trace_data.targets(i)
             
             # metadata_size = self.config['metadata']['size_bytes'] * len(targets)
             
@@ -367,12 +279,9 @@ class EurekaStoreSim:
             # metadata_compute_latency = accelerator.execute_task("search", node=node, neighbors=targets, num_dimensions=self.query_dimensions)
             # Calculate query vector size and NVMe read time
             data_size = self.get_doc_vector_size(self.batch_size, self.query_dimensions, len(targets))
-            print (f"the data_size is {data_size}")
-            print (f"query dimensions are ", self.query_dimensions)
-            print (f"targers are {len(targets)}") 
+            logger.debug("data_size: %s, query dimensions: %s, targets: %d", data_size, self.query_dimensions, len(targets))
             nvme_latency_us = self.calculate_nvme_read_time(data_size)
             self.stats.update_system_stat("latency_breakdown", nvme_latency_us, "nvme_read")
-            print (f"the nvme_latency_us is {nvme_latency_us}")
             
             # Execute scoring task and update trace
             scoring_latency_us = accelerator.execute_task("scoring", node=node, neighbors=targets, num_dimensions=self.query_dimensions)
@@ -392,7 +301,7 @@ class EurekaStoreSim:
             
             # Optional reduce task for intermediate entries
             if cnt < len(self.trace_data):
-                reduce_latency = accelerator.execute_task("reduce", node=self.trace_data[cnt - 2]["node"], neighbors=targets, num_dimensions=2)
+                reduce_latency = accelerator.execute_task("reduce", node=nodes[cnt - 2], neighbors=targets, num_dimensions=2)
                 max_latency = max(latency_us, reduce_latency)
                 # print (f"the reduce_latency is {reduce_latency}")
                 # print (f"the max_latency is {max_latency}")
@@ -406,9 +315,10 @@ class EurekaStoreSim:
 
         # Final reduction on last node in trace data
         if len(self.trace_data) > 0:
-            final_reduce_latency = accelerator.execute_task("reduce", node=self.trace_data[-1]["node"], neighbors=targets, num_dimensions=self.query_dimensions)
+            final_reduce_latency = accelerator.execute_task("reduce", node=nodes[-1], neighbors=targets, num_dimensions=self.query_dimensions)
             total_latency += final_reduce_latency
-            self.stats.update_trace_stat(node_id=self.trace_data[-1]["node"], reduce_time=final_reduce_latency)
+            self.stats.update_trace_stat(node_id=nodes[-1], reduce_time=final_reduce_latency)
+            self.charge_staging_energy(accelerator, self.get_doc_vector_size(self.batch_size, self.query_dimensions, self.trace_data.neighbor_counts + 1))
 
         # Final Top-K transfer to CPU and update system latency breakdown
         top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
@@ -421,53 +331,364 @@ class EurekaStoreSim:
         self.stats.update_system_stat("total_latency", total_latency)
 
 
-    def execute_distributed_dense(self):
-        """Distributed dense retrieval with parallel scoring across accelerators."""
-        total_energy, total_latency = 0, 0
-        latencies = {acc.accelerator_id: [] for acc in self.accelerators}
-        cnt = 1
+    def dense_entry_latencies(self, accelerator):
+        """
+        Per-entry data size, NVMe read time and scoring latency of a dense trace, as numpy columns.
+
+        Each entry reads and scores its node plus all neighbors; the scoring kernel is looked
+        up once per distinct number of scored vectors.
+        """
+        num_targets = self.trace_data.neighbor_counts + 1
+        data_sizes = int(self.batch_size) * int(self.query_dimensions) * int(self.config['query']['datatype_bytes']) * num_targets
+        nvme_latencies = self.nvme_read_time_us(data_sizes)
+
+        distinct_targets, entry_kernel = np.unique(num_targets, return_inverse=True)
+        scoring_table = np.array([
+            accelerator.execute_task("scoring", neighbors=range(count), num_dimensions=self.query_dimensions)
+            for count in distinct_targets.tolist()
+        ], dtype=np.float64)
+        return data_sizes, nvme_latencies, scoring_table[entry_kernel]
+
+    def sparse_entry_latencies(self, accelerator):
+        """
+        Per-entry data size, NVMe read time, scoring latency and reduce latency of a posting-list trace.
+
+        Kernel and reduce costs are computed once per distinct posting-list length. The reduce
+        cost comes from ScalarExecutor.compute_cost, so no stats are updated.
+        """
+        counts = self.trace_data.neighbor_counts
+        data_sizes = counts * self.config['query']['datatype_bytes']
+        nvme_latencies = self.nvme_read_time_us(data_sizes)
+
+        distinct_counts, entry_kernel = np.unique(counts, return_inverse=True)
+        scoring_table = np.array([
+            accelerator.execute_task("posting_list_scoring", neighbors=range(count))
+            for count in distinct_counts.tolist()
+        ], dtype=np.float64)
+        reduce_table = np.array([
+            accelerator.scalar_executor.compute_cost("addition", count)[2]
+            for count in distinct_counts.tolist()
+        ], dtype=np.float64)
+        return data_sizes, nvme_latencies, scoring_table[entry_kernel], reduce_table[entry_kernel]
+
+    def execute_standalone_dense_vectorized(self):
+        """
+        Column-wise equivalent of execute_standalone_dense.
+
+        Per-entry latency depends only on the entry's neighbor count, so the scoring kernel is
+        looked up once per distinct count and the NVMe page math, scoring/reduce overlap and
+        summation run as numpy operations. Stats receive the same values in the same order as
+        the loop, so all totals are bit-identical.
+        """
+        accelerator = self.accelerators[0]
+        nodes = self.trace_data.nodes
+        num_entries = len(nodes)
+        total_latency = 0
+
+        if num_entries > 0:
+            data_sizes, nvme_latencies, scoring_latencies = self.dense_entry_latencies(accelerator)
+            self.stats.accumulate_system_stat("latency_breakdown", nvme_latencies, "nvme_read")
+            self.stats.accumulate_system_stat("latency_breakdown", scoring_latencies, "scoring")
+            latencies = scoring_latencies + nvme_latencies
+
+            self.stats.update_trace_stats(
+                nodes,
+                scoring_time=scoring_latencies,
+                data_size=data_sizes,
+                num_neighbors=self.trace_data.neighbor_counts,
+                nvme_read=nvme_latencies,
+            )
 
-        for entry in self.trace_data:
-            max_latency = 0
-            logger.system(f"Processing entry {cnt} of {len(self.trace_data)}")
-            targets = [entry["node"]] + entry["neighbors"]
-            
-            assigned_acc = entry["partitions"]
-            accelerator = self.accelerators[assigned_acc]
+            # **Reduce**: every entry but the last overlaps a reduce with its scoring
+            reduce_latency = accelerator.perform_reduce_repeated(2, num_entries - 1)
+            latencies[:-1] = np.maximum(latencies[:-1], reduce_latency)
+            self.stats.update_trace_stats(nodes[:-1], reduce_time=np.full(num_entries - 1, reduce_latency))
+            total_latency = np.cumsum(np.concatenate(([total_latency], latencies)))[-1].item()
 
-            # **Scoring**: Calculate document vector size and NVMe read time
-            data_size = self.get_doc_vector_size(self.batch_size, self.query_dimensions, len(targets))
-            nvme_latency = self.calculate_nvme_read_time(data_size)
-            self.stats.update_system_stat("latency_breakdown", nvme_latency, "nvme_read")
+            # Final reduction on last node in trace data
+            final_reduce_latency = accelerator.execute_task("reduce", node=nodes[-1], neighbors=self.trace_data.targets(num_entries - 1), num_dimensions=self.query_dimensions)
+            total_latency += final_reduce_latency
+            self.stats.update_trace_stats(nodes[-1:], reduce_time=[final_reduce_latency])
+            self.charge_staging_energy(accelerator, data_sizes)
 
-            # Execute scoring task
-            scoring_latency = accelerator.execute_task("scoring", node=entry["node"], neighbors=targets, num_dimensions=self.query_dimensions)
-            total_scoring_latency = scoring_latency + nvme_latency
-            self.stats.update_trace_stat(
-                node_id=entry["node"],
-                scoring_time=scoring_latency,
-                data_size=data_size,
-                num_neighbors=len(entry["neighbors"]),
-                nvme_read=nvme_latency,
+        # Final Top-K transfer to CPU and update system latency breakdown
+        top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
+
+        metadata_latency = self.config['metadata']['compute_latency']
+        total_latency += top_k_latency + metadata_latency
+        
+        self.stats.update_system_stat("latency_breakdown", metadata_latency, "search")
+        self.stats.update_system_stat("latency_breakdown", top_k_latency, "top_k_transfer")
+        self.stats.update_system_stat("total_latency", total_latency)
+
+    def execute_standalone_event_driven(self):
+        """
+        Standalone retrieval on the discrete-event engine.
+
+        Each hop is an NVMe fetch followed by scoring on the vector unit; its reduce runs on the
+        scalar unit while later hops fetch and score. Hop i may start fetching once hop
+        i - 1 - prefetch_depth has been scored, so prefetch_depth 0 reproduces the analytical
+        one-hop-at-a-time schedule and larger depths keep several NVMe reads outstanding.
+        """
+        accelerator = self.accelerators[0]
+        nodes = self.trace_data.nodes
+        num_entries = len(nodes)
+        prefetch_depth = self.config['execution_mode'].get('prefetch_depth', 0)
+        engine = EventEngine(self.config, self.accelerators, self.nvme_read_time_us, logger)
+
+        if num_entries > 0:
+            if self.execution_type == 'dense':
+                data_sizes, nvme_latencies, scoring_latencies = self.dense_entry_latencies(accelerator)
+                reduce_latencies = np.full(num_entries - 1, accelerator.perform_reduce_repeated(2, num_entries - 1))
+                scoring_kernel = "scoring"
+            else:
+                data_sizes, nvme_latencies, scoring_latencies, _ = self.sparse_entry_latencies(accelerator)
+                reduce_latencies = np.array([accelerator.perform_reduce(count) for count in self.trace_data.neighbor_counts[:-1].tolist()])
+                scoring_kernel = "posting_list_scoring"
+
+            # **Hops**: fetch, score, then reduce in the background
+            scored, reduced = [], []
+            for i, (data_size, scoring_latency) in enumerate(zip(data_sizes.tolist(), scoring_latencies.tolist())):
+                gate = scored[i - 1 - prefetch_depth:i - prefetch_depth] if i > prefetch_depth else []
+                scored.append(engine.fetch(0, scoring_kernel, data_size, scoring_latency, depends_on=gate))
+                if i < num_entries - 1:
+                    reduced.append(engine.task(0, "reduce", reduce_latencies[i], depends_on=[scored[i]]))
+
+            # **Final Reduce**, then Top-K transfer to CPU over the interconnect
+            final_reduce_latency = accelerator.execute_task("reduce", node=nodes[-1], neighbors=self.trace_data.targets(num_entries - 1), num_dimensions=self.query_dimensions)
+            done = engine.task(0, "reduce", final_reduce_latency, depends_on=scored[-1:] + reduced)
+        else:
+            done = None
+        top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
+        done = engine.task(0, "top_k_transfer", top_k_latency, depends_on=[done] if done else [])
+        metadata_latency = self.config['metadata']['compute_latency'] if self.execution_type == 'dense' else 0
+        engine.delay(metadata_latency, depends_on=[done])
+        total_latency = engine.run()
+
+        if num_entries > 0:
+            self.stats.accumulate_system_stat("latency_breakdown", nvme_latencies, "nvme_read")
+            self.stats.accumulate_system_stat("latency_breakdown", scoring_latencies, "scoring")
+            self.stats.update_trace_stats(
+                nodes,
+                scoring_time=scoring_latencies,
+                data_size=data_sizes,
+                num_neighbors=self.trace_data.neighbor_counts,
+                nvme_read=nvme_latencies,
             )
+            self.stats.update_trace_stats(nodes[:-1], reduce_time=reduce_latencies)
+            self.stats.update_trace_stats(nodes[-1:], reduce_time=[final_reduce_latency])
 
-            # **Reduce**: Execute reduce task and compute maximum latency
-            reduce_latency = accelerator.execute_task("reduce", node=entry["node"], neighbors=targets, num_dimensions=self.query_dimensions)
-            max_latency = max(total_scoring_latency, reduce_latency)
+        busy = engine.busy_time(0)
+        self.stats.update_scratchpad_energy(accelerator.accelerator_id, engine.navigators[0].scratchpad_energy)
 
-            self.stats.update_trace_stat(node_id=entry["node"], reduce_time=reduce_latency)
+        if self.execution_type == 'dense':
+            self.stats.update_system_stat("latency_breakdown", metadata_latency, "search")
+        self.stats.update_system_stat("latency_breakdown", top_k_latency, "top_k_transfer")
+        self.stats.update_system_stat("total_latency", total_latency)
+        logger.stats(f"Event-Driven Standalone Mode - Prefetch Depth: {prefetch_depth}, Total Latency: {total_latency}, Busy Time: {busy}")
+
+    def execute_standalone_pipelined(self):
+        """
+        Standalone dense retrieval of query_batches consecutive query batches as one pipeline.
+
+        Each batch replays the trace. The systolic array embeds the batches back to back, so batch
+        b + 1 is embedded while the vector unit scores batch b; a batch starts traversing once it
+        is embedded and the previous batch's final reduce is done.
+
+        Within a batch, hop i's neighbor list is prefetched speculatively: once hop i - 2 is scored
+        the candidate queue is known, and the best candidate behind hop i - 1's node is read while
+        hop i - 1 is fetched and scored. HNSW expands that candidate next unless hop i - 1 finds a
+        closer one, i.e. the guess is right when the trace discovered hop i's node before hop i - 1.
+        Otherwise the read is wasted and hop i is fetched once hop i - 1 is scored. Without
+        speculative_prefetch every hop waits for the previous one to be scored, so a single batch
+        reproduces the analytical latency.
+        """
+        accelerator = self.accelerators[0]
+        nodes = self.trace_data.nodes
+        num_entries = len(nodes)
+        query_batches = self.config['execution_mode'].get('query_batches', 1)
+        speculative = self.config['execution_mode'].get('speculative_prefetch', True)
+        engine = EventEngine(self.config, self.accelerators, self.nvme_read_time_us, logger)
+
+        # Kernel costs are looked up once; their energy and reduce cycles are charged for every batch below
+        costs_before = self.stats.cost_stats()
+        query_size_bytes = self.get_query_vector_size(self.batch_size, self.query_dimensions)
+        embed_latency = accelerator.embed_query(query_size_bytes, 0)
+        top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
+        metadata_latency = self.config['metadata']['compute_latency']
 
-            # Update accelerator stats for reduce latency
-            self.stats.update_accelerator_stat(accelerator.accelerator_id, "scalar", "compute", reduce_latency)
+        if num_entries > 0:
+            data_sizes, nvme_latencies, scoring_latencies = self.dense_entry_latencies(accelerator)
+            reduce_latencies = np.full(num_entries - 1, accelerator.perform_reduce_repeated(2, num_entries - 1))
+            final_reduce_latency = accelerator.execute_task("reduce", node=nodes[-1], neighbors=self.trace_data.targets(num_entries - 1), num_dimensions=self.query_dimensions)
 
-            # Track the latency for the assigned accelerator
-            latencies[assigned_acc].append(max_latency)
-            total_latency += max_latency
-            cnt += 1
+            # Hop i's node was already a candidate before hop i - 1 expanded
+            hits = self.trace_data.discovery_entries() <= np.arange(num_entries) - 2
+            hits[:2] = False
+            speculated = np.arange(num_entries) >= 2 if speculative else np.zeros(num_entries, dtype=bool)
+        else:
+            speculated = np.zeros(0, dtype=bool)
+        self.stats.repeat_costs(costs_before, query_batches - 1)
+
+        wasted_bytes = 0
+        traversed = None
+        for batch in range(query_batches):
+            embedded = engine.task(0, "embedding", embed_latency)
+            start = [embedded] + ([traversed] if traversed else [])
+
+            if num_entries > 0:
+                # **Hops**: fetch (speculatively ahead if possible), score, reduce in the background
+                scored, reduced = [], []
+                for i, (data_size, scoring_latency) in enumerate(zip(data_sizes.tolist(), scoring_latencies.tolist())):
+                    if i == 0:
+                        gate = start
+                    elif speculated[i] and hits[i]:
+                        gate = [scored[i - 2]]
+                    else:
+                        if speculated[i]:
+                            engine.read(0, data_size, depends_on=[scored[i - 2]])
+                            wasted_bytes += data_size
+                        gate = [scored[i - 1]]
+                    scored.append(engine.fetch(0, "scoring", data_size, scoring_latency, depends_on=gate))
+                    if i < num_entries - 1:
+                        reduced.append(engine.task(0, "reduce", reduce_latencies[i], depends_on=[scored[i]]))
+
+                # **Final Reduce** frees the pipeline for the next batch
+                traversed = engine.task(0, "reduce", final_reduce_latency, depends_on=scored[-1:] + reduced)
+            else:
+                traversed = embedded
+
+            # **Top-K** transfer to CPU and metadata lookup overlap the next batch
+            done = engine.task(0, "top_k_transfer", top_k_latency, depends_on=[traversed])
+            engine.delay(metadata_latency, depends_on=[done])
+        total_latency = engine.run()
+
+        if num_entries > 0:
+            for _ in range(query_batches):
+                self.stats.accumulate_system_stat("latency_breakdown", nvme_latencies, "nvme_read")
+                self.stats.accumulate_system_stat("latency_breakdown", scoring_latencies, "scoring")
+                self.stats.update_trace_stats(
+                    nodes,
+                    scoring_time=scoring_latencies,
+                    data_size=data_sizes,
+                    num_neighbors=self.trace_data.neighbor_counts,
+                    nvme_read=nvme_latencies,
+                )
+                self.stats.update_trace_stats(nodes[:-1], reduce_time=reduce_latencies)
+                self.stats.update_trace_stats(nodes[-1:], reduce_time=[final_reduce_latency])
+            # Wasted speculative reads occupy the NVMe device too
+            self.stats.update_system_stat("latency_breakdown", float(np.sum(nvme_latencies[speculated & ~hits])) * query_batches, "nvme_read")
+
+        # includes the scratchpad energy of wasted speculative reads
+        self.stats.update_scratchpad_energy(accelerator.accelerator_id, engine.navigators[0].scratchpad_energy)
+        self.stats.update_system_stat("latency_breakdown", embed_latency * query_batches, "query_embedding")
+        self.stats.update_system_stat("latency_breakdown", metadata_latency * query_batches, "search")
+        self.stats.update_system_stat("latency_breakdown", top_k_latency * query_batches, "top_k_transfer")
+        self.stats.update_system_stat("total_latency", total_latency)
 
-        # Max latency across accelerators
-        max_accel_latency = max(sum(latency_list) for latency_list in latencies.values())
-        self.stats.update_system_stat("latency_breakdown", max_accel_latency, "scoring")
+        overlap = engine.overlap(0)
+        num_speculated = int(np.count_nonzero(speculated))
+        batches_latency = self.stats.system_stats["total_latency"] - costs_before[(None, "total_latency")]
+        self.stats.update_pipeline_stats(
+            query_batches=query_batches,
+            latency_per_batch=batches_latency / query_batches,
+            speculative_reads=num_speculated * query_batches,
+            speculative_hit_rate=float(np.count_nonzero(speculated & hits)) / num_speculated if num_speculated else 0.0,
+            wasted_read_bytes=wasted_bytes,
+            wasted_read_energy=engine.navigators[0].discarded_energy,
+            serial_latency=sum(resource['busy'] for resource in overlap.values()) + metadata_latency * query_batches,
+            **overlap,
+        )
+        logger.stats(f"Pipelined Standalone Mode - Query Batches: {query_batches}, Total Latency: {batches_latency}, "
+                     f"Overlap: { {name: round(resource['overlap_fraction'], 3) for name, resource in overlap.items()} }")
+
+    def execute_distributed_dense(self):
+        """
+        Distributed dense retrieval: each hop is scored by the accelerators that own its neighbors.
+
+        Neighbor j of a hop lives on accelerator partitions[j] % num_accelerators, which reads its
+        share from its own NVMe device and scores it; the hop's node is scored by the coordinator
+        (the trace's assigned accelerator, else 0). Shards run concurrently, so a hop takes as long
+        as its slowest shard, and their candidates are then merged over the interconnect, either
+        gathered at the coordinator or all-gathered to every accelerator
+        (execution_mode.merge). Hops depend on each other, so the total latency is the sum of the
+        per-hop critical paths. Nothing overlaps a merge, and a shard scores no faster than the
+        whole hop (the kernel latency does not depend on the vector count), so this does not get
+        faster than standalone: merges cost (n - 1) link latencies per hop that spans accelerators.
+        """
+        num_accelerators = len(self.accelerators)
+        merge = self.config['execution_mode'].get('merge', 'gather')
+        if merge not in ['gather', 'all_gather']:
+            raise ValueError(f"Unsupported merge '{merge}'. Choose from 'gather' or 'all_gather'.")
+
+        nodes = self.trace_data.nodes
+        num_entries = len(nodes)
+        shard_counts = self.trace_data.neighbor_shards(num_accelerators)
+        # every scored vector contributes a (document id, distance) candidate per query
+        candidate_size = self.batch_size * 2 * self.config['query']['datatype_bytes']
+        scoring_tables = [{} for _ in self.accelerators]
+        shard_sizes = [[] for _ in self.accelerators]
+        busy = np.zeros(num_accelerators)
+        total_latency = 0
+
+        if num_entries > 0:
+            reduce_latency = self.accelerators[0].perform_reduce_repeated(2, num_entries - 1)
+
+        for i, (node, num_neighbors) in enumerate(zip(nodes.tolist(), self.trace_data.neighbor_counts.tolist())):
+            logger.debug("Processing entry %d of %d", i + 1, num_entries)
+            coordinator = (self.trace_data.assigned_accelerator(i) or 0) % num_accelerators
+            counts = shard_counts[i].copy()
+            counts[coordinator] += 1
+
+            # **Scoring**: every shard reads and scores its vectors concurrently
+            critical_latency, critical_nvme, critical_scoring = 0, 0, 0
+            for accelerator_id in np.flatnonzero(counts).tolist():
+                count = int(counts[accelerator_id])
+                accelerator = self.accelerators[accelerator_id]
+                shard_sizes[accelerator_id].append(self.get_doc_vector_size(self.batch_size, self.query_dimensions, count))
+                nvme_latency = self.nvme_read_time_us(shard_sizes[accelerator_id][-1])
+                if count not in scoring_tables[accelerator_id]:
+                    scoring_tables[accelerator_id][count] = accelerator.execute_task("scoring", neighbors=range(count), num_dimensions=self.query_dimensions)
+                scoring_latency = scoring_tables[accelerator_id][count]
+
+                self.stats.update_accelerator_stat(accelerator_id, "vector", "compute", scoring_latency)
+                busy[accelerator_id] += nvme_latency + scoring_latency
+                if nvme_latency + scoring_latency > critical_latency:
+                    critical_latency, critical_nvme, critical_scoring = nvme_latency + scoring_latency, nvme_latency, scoring_latency
+
+            # the critical shard's read and scoring make up the hop's share of the breakdown
+            self.stats.update_system_stat("latency_breakdown", critical_nvme, "nvme_read")
+            self.stats.update_system_stat("latency_breakdown", critical_scoring, "scoring")
+            self.stats.update_trace_stat(
+                node_id=node,
+                scoring_time=critical_scoring,
+                data_size=self.get_doc_vector_size(self.batch_size, self.query_dimensions, num_neighbors + 1),
+                num_neighbors=num_neighbors,
+                nvme_read=critical_nvme,
+            )
+
+            # **Reduce**: every hop but the last overlaps a reduce on the coordinator with its scoring
+            if i < num_entries - 1:
+                critical_latency = max(critical_latency, reduce_latency)
+                self.stats.update_trace_stat(node_id=node, reduce_time=reduce_latency)
+
+            # **Merge**: candidates of the other shards go over the interconnect
+            merge_latency = 0
+            if np.count_nonzero(counts) > 1:
+                if merge == 'gather':
+                    merge_latency = self.interconnect.gather(coordinator, data_size=int(counts.sum()) * candidate_size)
+                else:
+                    merge_latency = self.interconnect.all_gather(data_size=int(counts.max()) * candidate_size)
+
+            total_latency += critical_latency + merge_latency
+
+        # Final reduction on the last hop's coordinator
+        if num_entries > 0:
+            final_reduce_latency = self.accelerators[coordinator].execute_task("reduce", node=nodes[-1], neighbors=self.trace_data.targets(num_entries - 1), num_dimensions=self.query_dimensions)
+            total_latency += final_reduce_latency
+            self.stats.update_trace_stat(node_id=nodes[-1], reduce_time=final_reduce_latency)
+        for accelerator, sizes in zip(self.accelerators, shard_sizes):
+            self.charge_staging_energy(accelerator, sizes)
 
         # **Metadata**: Metadata computation latency at the end of the process
         metadata_latency = self.config['metadata']['compute_latency']
@@ -475,13 +696,106 @@ class EurekaStoreSim:
 
         # **Top-K Transfer**: Final Top-K transfer to CPU and update system latency breakdown
         top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
-        total_latency += top_k_latency + max_accel_latency
+        total_latency += top_k_latency + metadata_latency
         self.stats.update_system_stat("latency_breakdown", top_k_latency, "top_k_transfer")
 
-        # Log and update final latency and energy
-        # logger.stats(f"Distributed Dense Mode - Total Energy: {total_energy}, Max Latency: {total_latency}")
         self.stats.update_system_stat("total_latency", total_latency)
-        self.stats.update_system_stat("total_energy", total_energy)
+        logger.stats(f"Distributed Dense Mode - Merge: {merge}, Total Latency: {total_latency}, "
+                     f"Busy Time per Accelerator: {dict(enumerate(busy.tolist()))}")
+
+    def execute_distributed_dense_event_driven(self):
+        """
+        Distributed dense retrieval on the discrete-event engine.
+
+        Shards are placed and merged as in execute_distributed_dense, but every shard's fetch and
+        scoring, the coordinator's reduces and the merge collectives are tasks competing for the
+        accelerators' NVMe devices and units and the shared interconnect. A hop's shards start
+        once the previous hop is merged; its reduce runs on the coordinator's scalar unit while
+        the next hop fetches. With one accelerator this is the standalone event-driven schedule.
+        """
+        num_accelerators = len(self.accelerators)
+        merge = self.config['execution_mode'].get('merge', 'gather')
+        if merge not in ['gather', 'all_gather']:
+            raise ValueError(f"Unsupported merge '{merge}'. Choose from 'gather' or 'all_gather'.")
+
+        nodes = self.trace_data.nodes
+        num_entries = len(nodes)
+        shard_counts = self.trace_data.neighbor_shards(num_accelerators)
+        candidate_size = self.batch_size * 2 * self.config['query']['datatype_bytes']
+        scoring_tables = [{} for _ in self.accelerators]
+        engine = EventEngine(self.config, self.accelerators, self.nvme_read_time_us, logger)
+
+        merged, coordinator = None, 0
+        if num_entries > 0:
+            reduce_latency = self.accelerators[0].perform_reduce_repeated(2, num_entries - 1)
+            reduced = []
+
+            for i, (node, num_neighbors) in enumerate(zip(nodes.tolist(), self.trace_data.neighbor_counts.tolist())):
+                coordinator = (self.trace_data.assigned_accelerator(i) or 0) % num_accelerators
+                counts = shard_counts[i].copy()
+                counts[coordinator] += 1
+
+                # **Scoring**: every shard reads and scores its vectors once the previous hop is merged
+                scored = []
+                critical_latency, critical_nvme, critical_scoring = 0, 0, 0
+                for accelerator_id in np.flatnonzero(counts).tolist():
+                    count = int(counts[accelerator_id])
+                    data_size = self.get_doc_vector_size(self.batch_size, self.query_dimensions, count)
+                    nvme_latency = self.nvme_read_time_us(data_size)
+                    if count not in scoring_tables[accelerator_id]:
+                        scoring_tables[accelerator_id][count] = self.accelerators[accelerator_id].execute_task("scoring", neighbors=range(count), num_dimensions=self.query_dimensions)
+                    scoring_latency = scoring_tables[accelerator_id][count]
+
+                    self.stats.update_accelerator_stat(accelerator_id, "vector", "compute", scoring_latency)
+                    scored.append(engine.fetch(accelerator_id, "scoring", data_size, scoring_latency, depends_on=[merged] if merged else []))
+                    if nvme_latency + scoring_latency > critical_latency:
+                        critical_latency, critical_nvme, critical_scoring = nvme_latency + scoring_latency, nvme_latency, scoring_latency
+
+                self.stats.update_system_stat("latency_breakdown", critical_nvme, "nvme_read")
+                self.stats.update_system_stat("latency_breakdown", critical_scoring, "scoring")
+                self.stats.update_trace_stat(
+                    node_id=node,
+                    scoring_time=critical_scoring,
+                    data_size=self.get_doc_vector_size(self.batch_size, self.query_dimensions, num_neighbors + 1),
+                    num_neighbors=num_neighbors,
+                    nvme_read=critical_nvme,
+                )
+
+                # **Merge**: the other shards' candidates go over the shared interconnect
+                if len(scored) > 1:
+                    if merge == 'gather':
+                        merge_latency = self.interconnect.gather(coordinator, data_size=int(counts.sum()) * candidate_size)
+                    else:
+                        merge_latency = self.interconnect.all_gather(data_size=int(counts.max()) * candidate_size)
+                    merged = engine.task(coordinator, merge, merge_latency, depends_on=scored)
+                else:
+                    merged = scored[0]
+
+                # **Reduce** on the coordinator in the background
+                if i < num_entries - 1:
+                    reduced.append(engine.task(coordinator, "reduce", reduce_latency, depends_on=[merged]))
+                    self.stats.update_trace_stat(node_id=node, reduce_time=reduce_latency)
+
+            # **Final Reduce** on the last hop's coordinator
+            final_reduce_latency = self.accelerators[coordinator].execute_task("reduce", node=nodes[-1], neighbors=self.trace_data.targets(num_entries - 1), num_dimensions=self.query_dimensions)
+            merged = engine.task(coordinator, "reduce", final_reduce_latency, depends_on=[merged] + reduced)
+            self.stats.update_trace_stat(node_id=nodes[-1], reduce_time=final_reduce_latency)
+
+        # **Top-K Transfer** to CPU, then the metadata lookup
+        top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
+        done = engine.task(coordinator, "top_k_transfer", top_k_latency, depends_on=[merged] if merged else [])
+        metadata_latency = self.config['metadata']['compute_latency']
+        engine.delay(metadata_latency, depends_on=[done])
+        total_latency = engine.run()
+
+        for accelerator_id, navigator in enumerate(engine.navigators):
+            self.stats.update_scratchpad_energy(accelerator_id, navigator.scratchpad_energy)
+        self.stats.update_system_stat("latency_breakdown", metadata_latency, "search")
+        self.stats.update_system_stat("latency_breakdown", top_k_latency, "top_k_transfer")
+        self.stats.update_system_stat("total_latency", total_latency)
+        busy = {accelerator_id: engine.busy_time(accelerator_id) for accelerator_id in range(num_accelerators)}
+        logger.stats(f"Event-Driven Distributed Dense Mode - Merge: {merge}, Total Latency: {total_latency}, "
+                     f"Busy Time per Accelerator: {busy}")
 
     def execute_dimension_split_dense(self):
         """Dimension-split dense retrieval with batch-level subbatching and pipelined latency hiding."""
@@ -489,16 +803,15 @@ class EurekaStoreSim:
         total_energy, total_latency = 0, 0
         subbatch_size = self.calculate_subbatch_size()
         
-        print (f"dims_per_acc: {dims_per_acc}")
-        print (f"subbatch_size: {subbatch_size}")
         all_reduce_size = self.get_query_vector_size(subbatch_size, dims_per_acc)
-        print (f"all_reduce_size: {all_reduce_size}")
+        logger.debug("dims_per_acc: %s, subbatch_size: %s, all_reduce_size: %s", dims_per_acc, subbatch_size, all_reduce_size)
         previous_all_reduce_latency = 0
 
 
-        for entry_idx, entry in enumerate(self.trace_data, start=1):
-            logger.system(f"Processing entry {entry_idx} of {len(self.trace_data)}")
-            targets = [entry["node"]] + entry["neighbors"]
+        nodes = self.trace_data.nodes.tolist()
+        for entry_idx, (node, num_neighbors) in enumerate(zip(nodes, self.trace_data.neighbor_counts.tolist()), start=1):
+            logger.debug("Processing entry %d of %d", entry_idx, len(self.trace_data))
+            targets = self.trace_data.targets(entry_idx - 1)
             data_size = self.get_doc_vector_size(self.batch_size, dims_per_acc, len(targets))
             
             # **Scoring**: Calculate NVMe read time
@@ -518,7 +831,7 @@ class EurekaStoreSim:
                 current_compute_latency = max(current_compute_latency, scoring_latency)
             
                 # **Reduce**: Execute reduce task for subbatch
-                reduced_latency = self.accelerators[0].execute_task("reduce", node=entry["node"], neighbors=targets, num_dimensions=dims_per_acc)
+                reduced_latency = self.accelerators[0].execute_task("reduce", node=node, neighbors=targets, num_dimensions=dims_per_acc)
                 current_compute_latency = max(current_compute_latency, reduced_latency)
                 # **Overlap Latency**: Latency with overlap between subbatch compute and reduce tasks
 
@@ -527,21 +840,24 @@ class EurekaStoreSim:
                 overlapped_latency = max(current_compute_latency, previous_all_reduce_latency)
 
                 total_latency += overlapped_latency
-                print (f"Overlapped Latency: {overlapped_latency}")
-                print (f"previous_all_reduce_latency Latency: {previous_all_reduce_latency}")
+                logger.debug("Overlapped latency: %s, all-reduce latency: %s", overlapped_latency, previous_all_reduce_latency)
                 self.stats.update_system_stat("latency_breakdown", previous_all_reduce_latency, "interconnect")
 
             # Update trace stats for current entry (scoring and reduce times)
             self.stats.update_trace_stat(
-                node_id=entry["node"],
+                node_id=node,
                 scoring_time=scoring_latency,
                 data_size=data_size,
-                num_neighbors=len(entry["neighbors"]),
+                num_neighbors=num_neighbors,
                 nvme_read=nvme_latency,
             )
-            self.stats.update_trace_stat(node_id=entry["node"], reduce_time=reduced_latency)
+            self.stats.update_trace_stat(node_id=node, reduce_time=reduced_latency)
 
 
+        # every accelerator stages its slice of the dimensions of every entry
+        for accelerator in self.accelerators:
+            self.charge_staging_energy(accelerator, self.get_doc_vector_size(self.batch_size, dims_per_acc, self.trace_data.neighbor_counts + 1))
+
         # **Metadata**: Metadata computation latency at the end of the process
         metadata_latency = self.config['metadata']['compute_latency']
         self.stats.update_system_stat("latency_breakdown", metadata_latency, "search")
@@ -565,14 +881,13 @@ class EurekaStoreSim:
         total_energy, total_latency = 0, 0
         cnt = 1
         
-        for entry in self.trace_data:
+        nodes = self.trace_data.nodes.tolist()
+        for i, (node, num_neighbors) in enumerate(zip(nodes, self.trace_data.neighbor_counts.tolist())):
             max_latency = 0
-            logger.system(f"Processing entry {cnt} of {len(self.trace_data)}")
+            logger.debug("Processing entry %d of %d", cnt, len(self.trace_data))
             
-            node = entry["node"]
-            neighbors = entry["neighbors"]
-            num_neighbors = entry["neighbor_count"]
-            targets = [node] + neighbors
+            neighbors = self.trace_data.neighbors(i)
+            targets = self.trace_data.targets(i)
 
             # **Data Size & NVMe Read Time**: Calculate query vector size and NVMe read time
             data_size = len(neighbors) * self.config['query']['datatype_bytes']
@@ -612,9 +927,10 @@ class EurekaStoreSim:
 
         # **Final Reduce Task**: Final reduction on the last node in trace data
         if len(self.trace_data) > 0:
-            final_reduce_latency = accelerator.execute_task("reduce", node=self.trace_data[-1]["node"], neighbors=targets, num_dimensions=self.query_dimensions)
+            final_reduce_latency = accelerator.execute_task("reduce", node=nodes[-1], neighbors=targets, num_dimensions=self.query_dimensions)
             total_latency += final_reduce_latency
-            self.stats.update_trace_stat(node_id=self.trace_data[-1]["node"], reduce_time=final_reduce_latency)
+            self.stats.update_trace_stat(node_id=nodes[-1], reduce_time=final_reduce_latency)
+            self.charge_staging_energy(accelerator, self.trace_data.neighbor_counts * self.config['query']['datatype_bytes'])
 
         # **Final Top-K Transfer**: Final Top-K transfer to CPU and update top_k_transfer latency stat
         top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
@@ -633,14 +949,14 @@ class EurekaStoreSim:
         """Distributed sparse retrieval with parallel scoring across accelerators."""
         total_energy, total_latency = 0, 0
         latencies = {acc.accelerator_id: [] for acc in self.accelerators}
+        data_sizes = {acc.accelerator_id: [] for acc in self.accelerators}
         cnt = 1
 
-        for entry in self.trace_data:
+        for i, node in enumerate(self.trace_data.nodes.tolist()):
             max_latency = 0
-            logger.system(f"Processing entry {cnt} of {len(self.trace_data)}")
-            node = entry["node"]
-            neighbors = entry["neighbors"]
-            assigned_acc = entry["assigned_accelerator"]
+            logger.debug("Processing entry %d of %d", cnt, len(self.trace_data))
+            neighbors = self.trace_data.neighbors(i)
+            assigned_acc = self.trace_data.assigned_accelerator(i)
             accelerator = self.accelerators[assigned_acc]
             data_size = len(neighbors) * self.config['query']['datatype_bytes']
             
@@ -662,9 +978,12 @@ class EurekaStoreSim:
             # **Update Accelerator Stats**: Track latency for the assigned accelerator
             self.stats.update_accelerator_stat(accelerator.accelerator_id, "scalar", "compute", reduce_latency)
             latencies[assigned_acc].append(max_latency)
+            data_sizes[assigned_acc].append(data_size)
 
             total_latency += max_latency
             cnt += 1
+        for accelerator in self.accelerators:
+            self.charge_staging_energy(accelerator, data_sizes[accelerator.accelerator_id])
 
         # **Final Top-K Transfer**: Final Top-K transfer to CPU
         top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
@@ -678,76 +997,275 @@ class EurekaStoreSim:
         self.stats.update_system_stat("total_energy", total_energy)
 
 
-    def execute_dimension_split_sparse(self):
-        """Dimension-split sparse retrieval with batch-level subbatching and pipelined latency hiding."""
-        dims_per_acc = self.query_dimensions // len(self.accelerators)
-        total_energy, total_latency = 0, 0
-        subbatch_size = self.calculate_subbatch_size()
-        all_reduce_size = self.get_query_vector_size(subbatch_size, dims_per_acc)
-        previous_all_reduce_latency = 0
-
-        for entry_idx, entry in enumerate(self.trace_data, start=1):
-            logger.system(f"Processing entry {entry_idx} of {len(self.trace_data)}")
-            node = entry["node"]
-            neighbors = entry["neighbors"]
-            data_size = len(neighbors) * self.config['query']['datatype_bytes']
-
-            # **NVMe Read Time**: Calculate NVMe read time
-            nvme_latency = self.calculate_nvme_read_time(data_size)
-            self.stats.update_system_stat("latency_breakdown", nvme_latency, "nvme_read")
-
-            # **Subbatch Processing**: Process data in sub-batches across dimensions
-            for start in range(0, len(neighbors), subbatch_size):
-                current_subbatch_size = min(subbatch_size, len(neighbors) - start)
-                current_compute_latency = 0
+    def posting_list_shards(self, num_shards, split):
+        """
+        Postings of every posting list that each of num_shards accelerators scores, as an (entries, num_shards) array.
+
+        'document' splits every list by document range, so each accelerator gets an equal share
+        of every list. 'term' keeps lists whole and hands them out longest first to the least
+        loaded accelerator.
+        """
+        counts = self.trace_data.neighbor_counts
+        if split == 'document':
+            shards = np.arange(num_shards)
+            return counts[:, None] // num_shards + (shards < counts[:, None] % num_shards)
+        if split == 'term':
+            lengths = np.zeros((len(counts), num_shards), dtype=np.int64)
+            loads = np.zeros(num_shards, dtype=np.int64)
+            for i in np.argsort(-counts, kind='stable').tolist():
+                shard = int(np.argmin(loads))
+                lengths[i, shard] = counts[i]
+                loads[shard] += counts[i]
+            return lengths
+        raise ValueError(f"Unsupported sparse split '{split}'. Choose from 'document' or 'term'.")
+
+    def posting_subbatch_latencies(self, lengths, subbatch_size):
+        """
+        NVMe read and scoring latency of scoring posting-list pieces of the given lengths in sub-batches.
+
+        A piece of n postings is read and scored as n // subbatch_size full sub-batches plus one
+        for the remainder; the kernel is looked up once per distinct sub-batch size.
+        """
+        full, remainder = np.divmod(lengths, subbatch_size)
+        datatype_bytes = self.config['query']['datatype_bytes']
+
+        distinct = np.unique(np.concatenate(([subbatch_size], remainder[remainder > 0])))
+        scoring_table = np.array([
+            self.accelerators[0].execute_task("posting_list_scoring", neighbors=range(count))
+            for count in distinct.tolist()
+        ], dtype=np.float64)
+        nvme_table = self.nvme_read_time_us(distinct * datatype_bytes)
+
+        full_kernel = np.searchsorted(distinct, subbatch_size)
+        remainder_kernel = np.searchsorted(distinct, remainder)
+        has_remainder = remainder > 0
+        nvme_latencies = full * nvme_table[full_kernel] + np.where(has_remainder, nvme_table[remainder_kernel], 0)
+        scoring_latencies = full * scoring_table[full_kernel] + np.where(has_remainder, scoring_table[remainder_kernel], 0)
+        return nvme_latencies, scoring_latencies
+
+    def posting_piece_reduce_latencies(self, lengths):
+        """
+        Reduce latency of every posting-list piece on the accelerator that scores it, as an (entries, accelerators) array.
+
+        Pieces of the final entry are left to the final reduce and cost 0 here. Each accelerator's
+        scalar stats are charged for its own reduces, computed once per distinct piece length.
+        """
+        reduced = lengths > 0
+        reduced[-1] = False
+        reduce_latencies = np.zeros(lengths.shape)
+        for accelerator_id, accelerator in enumerate(self.accelerators):
+            reduce_lengths, piece_reduce = np.unique(lengths[reduced[:, accelerator_id], accelerator_id], return_inverse=True)
+            repeats = np.bincount(piece_reduce, minlength=len(reduce_lengths))
+            reduce_table = np.array([
+                accelerator.scalar_executor.execute_repeated("addition", length, count, accel_id=accelerator.accelerator_id)[0]
+                for length, count in zip(reduce_lengths.tolist(), repeats.tolist())
+            ], dtype=np.float64)
+            reduce_latencies[reduced[:, accelerator_id], accelerator_id] = reduce_table[piece_reduce]
+        return reduce_latencies
 
-                # **Metadata**: Metadata lookup and latency
-                metadata_latency = self.config['metadata']['compute_latency']
+    def execute_dimension_split_sparse(self):
+        """
+        Split-posting-list sparse retrieval: every query term's posting list is sharded across the accelerators.
+
+        Posting lists are split by document range or by term (execution_mode.sparse_split, see
+        posting_list_shards). Every accelerator reads its postings from its own NVMe device and
+        scores them with the posting-list vector kernel, at most execution_mode.posting_subbatch_size
+        postings at a time (default: a whole piece per kernel call), reducing each piece on its
+        scalar unit while it moves on to the next; its last piece is reduced once scored.
+        Accelerators work independently, so the scoring phase takes as long as the busiest one.
+        Term-split accelerators hold partial scores of the same documents, which are summed by a
+        reduce-scatter; document-split ones own disjoint documents and only gather their top-k.
+        """
+        num_accelerators = len(self.accelerators)
+        split = self.config['execution_mode'].get('sparse_split', 'document')
+        nodes = self.trace_data.nodes
+        num_entries = len(nodes)
+        datatype_bytes = self.config['query']['datatype_bytes']
+        total_latency = 0
+
+        if num_entries > 0:
+            lengths = self.posting_list_shards(num_accelerators, split)
+            subbatch_size = self.config['execution_mode'].get('posting_subbatch_size') or max(int(lengths.max()), 1)
+            nvme_latencies, scoring_latencies = self.posting_subbatch_latencies(lengths, subbatch_size)
+
+            # **Reduce**: every piece is reduced by its accelerator, overlapped with its next piece;
+            # an accelerator's last piece has none to hide behind
+            scored = lengths > 0
+            reduce_latencies = self.posting_piece_reduce_latencies(lengths)
+            last = np.zeros(lengths.shape, dtype=bool)
+            has_pieces = scored.any(axis=0)
+            last[num_entries - 1 - np.argmax(scored[::-1], axis=0)[has_pieces], np.flatnonzero(has_pieces)] = True
+            io_latencies = nvme_latencies + scoring_latencies
+            piece_latencies = np.where(scored, np.where(last, io_latencies + reduce_latencies, np.maximum(io_latencies, reduce_latencies)), 0)
+
+            # **Scoring**: accelerators run concurrently, the busiest one is the critical path
+            busy = np.cumsum(piece_latencies, axis=0)[-1]
+            critical = int(np.argmax(busy))
+            total_latency += busy[critical].item()
+            for accelerator_id, accelerator in enumerate(self.accelerators):
+                self.stats.update_accelerator_stat(accelerator_id, "vector", "compute", float(scoring_latencies[:, accelerator_id].sum()))
+                self.charge_staging_energy(accelerator, lengths[scored[:, accelerator_id], accelerator_id] * datatype_bytes)
+            self.stats.accumulate_system_stat("latency_breakdown", nvme_latencies[scored[:, critical], critical], "nvme_read")
+            self.stats.accumulate_system_stat("latency_breakdown", scoring_latencies[scored[:, critical], critical], "scoring")
+            self.stats.update_trace_stats(
+                nodes,
+                scoring_time=scoring_latencies.max(axis=1),
+                data_size=self.trace_data.neighbor_counts * datatype_bytes,
+                num_neighbors=self.trace_data.neighbor_counts,
+                nvme_read=nvme_latencies.max(axis=1),
+                reduce_time=reduce_latencies.max(axis=1),
+            )
 
-                # **Scoring Task**: Execute scoring task on each accelerator
-                for accelerator in self.accelerators:
-                    scoring_latency = accelerator.execute_task("dimension_split_posting_list", node=node, neighbors=neighbors[start:start+current_subbatch_size])
-                    scoring_latency += metadata_latency
-                    current_compute_latency = max(current_compute_latency, scoring_latency)
+            # **Merge**: sum term-split partial scores, or gather document-split top-k at accelerator 0
+            if num_accelerators > 1:
+                if split == 'term':
+                    reduce_scatter_latency = self.interconnect.reduce_scatter(data_size=int(lengths.sum(axis=0).max()) * datatype_bytes)
+                    self.stats.update_system_stat("latency_breakdown", reduce_scatter_latency, "interconnect")
+                    total_latency += reduce_scatter_latency
+                else:
+                    total_latency += self.interconnect.gather(0, data_size=self.config['topk'] * datatype_bytes * num_accelerators)
 
-                # **All-Reduce**: Perform all-reduce operation across accelerators
-                overlapped_latency = max(current_compute_latency, previous_all_reduce_latency)
-                previous_all_reduce_latency = self.interconnect.all_reduce(data_size=all_reduce_size)
-                total_latency += overlapped_latency
+            # Final reduction on the merged scores
+            final_reduce_latency = self.accelerators[0].execute_task("reduce", node=nodes[-1], neighbors=self.trace_data.targets(num_entries - 1), num_dimensions=self.query_dimensions)
+            total_latency += final_reduce_latency
+            self.stats.update_trace_stats(nodes[-1:], reduce_time=[final_reduce_latency])
 
         # **Final Top-K Transfer**: Final Top-K transfer to CPU
         top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
         total_latency += top_k_latency
         self.stats.update_system_stat("latency_breakdown", top_k_latency, "top_k_transfer")
 
-        # **Energy and Latency Stats**:
-        logger.stats(f"Dimension-Split Sparse Mode - Total Latency: {total_latency}")
+        logger.stats(f"Dimension-Split Sparse Mode - Split: {split}, Total Latency: {total_latency}")
         self.stats.update_system_stat("total_latency", total_latency)
-        self.stats.update_system_stat("total_energy", total_energy)
 
+    def execute_dimension_split_sparse_event_driven(self):
+        """
+        Split-posting-list sparse retrieval on the discrete-event engine.
+
+        Posting lists are sharded as in execute_dimension_split_sparse. Every accelerator fetches
+        its pieces from its own NVMe device in trace order, a piece's sub-batches read and scored
+        as one task, and reduces each piece on its scalar unit once scored; piece k may start
+        fetching once the accelerator's piece k - 1 - prefetch_depth has been scored. The merge
+        collective runs on the shared interconnect once every accelerator has reduced its pieces.
+        """
+        num_accelerators = len(self.accelerators)
+        split = self.config['execution_mode'].get('sparse_split', 'document')
+        prefetch_depth = self.config['execution_mode'].get('prefetch_depth', 0)
+        nodes = self.trace_data.nodes
+        num_entries = len(nodes)
+        datatype_bytes = self.config['query']['datatype_bytes']
+        engine = EventEngine(self.config, self.accelerators, self.nvme_read_time_us, logger)
+
+        done = None
+        if num_entries > 0:
+            lengths = self.posting_list_shards(num_accelerators, split)
+            subbatch_size = self.config['execution_mode'].get('posting_subbatch_size') or max(int(lengths.max()), 1)
+            nvme_latencies, scoring_latencies = self.posting_subbatch_latencies(lengths, subbatch_size)
+            reduce_latencies = self.posting_piece_reduce_latencies(lengths)
+            scored_pieces = lengths > 0
+
+            # **Pieces**: each accelerator fetches, scores and reduces its pieces in trace order
+            finished = []
+            for accelerator_id in range(num_accelerators):
+                scored = []
+                for k, i in enumerate(np.flatnonzero(scored_pieces[:, accelerator_id]).tolist()):
+                    gate = scored[k - 1 - prefetch_depth:k - prefetch_depth] if k > prefetch_depth else []
+                    scored.append(engine.fetch(accelerator_id, "posting_list_scoring", int(lengths[i, accelerator_id]) * datatype_bytes,
+                                               scoring_latencies[i, accelerator_id], depends_on=gate, read_time=nvme_latencies[i, accelerator_id]))
+                    finished.append(scored[-1])
+                    if reduce_latencies[i, accelerator_id] > 0:
+                        finished.append(engine.task(accelerator_id, "reduce", reduce_latencies[i, accelerator_id], depends_on=[scored[-1]]))
+                self.stats.update_accelerator_stat(accelerator_id, "vector", "compute", float(scoring_latencies[:, accelerator_id].sum()))
+
+            critical = int(np.argmax((nvme_latencies + scoring_latencies + reduce_latencies).sum(axis=0)))
+            self.stats.accumulate_system_stat("latency_breakdown", nvme_latencies[scored_pieces[:, critical], critical], "nvme_read")
+            self.stats.accumulate_system_stat("latency_breakdown", scoring_latencies[scored_pieces[:, critical], critical], "scoring")
+            self.stats.update_trace_stats(
+                nodes,
+                scoring_time=scoring_latencies.max(axis=1),
+                data_size=self.trace_data.neighbor_counts * datatype_bytes,
+                num_neighbors=self.trace_data.neighbor_counts,
+                nvme_read=nvme_latencies.max(axis=1),
+                reduce_time=reduce_latencies.max(axis=1),
+            )
 
+            # **Merge** on the shared interconnect: sum term-split partial scores, or gather document-split top-k
+            if num_accelerators > 1:
+                if split == 'term':
+                    merge_kernel = "reduce_scatter"
+                    merge_latency = self.interconnect.reduce_scatter(data_size=int(lengths.sum(axis=0).max()) * datatype_bytes)
+                    self.stats.update_system_stat("latency_breakdown", merge_latency, "interconnect")
+                else:
+                    merge_kernel = "gather"
+                    merge_latency = self.interconnect.gather(0, data_size=self.config['topk'] * datatype_bytes * num_accelerators)
+                finished = [engine.task(0, merge_kernel, merge_latency, depends_on=finished)]
 
+            # **Final Reduce** on the merged scores
+            final_reduce_latency = self.accelerators[0].execute_task("reduce", node=nodes[-1], neighbors=self.trace_data.targets(num_entries - 1), num_dimensions=self.query_dimensions)
+            done = engine.task(0, "reduce", final_reduce_latency, depends_on=finished)
+            self.stats.update_trace_stats(nodes[-1:], reduce_time=[final_reduce_latency])
 
-    def run(self):
+        # **Final Top-K Transfer**: Final Top-K transfer to CPU
+        top_k_latency = self.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
+        engine.task(0, "top_k_transfer", top_k_latency, depends_on=[done] if done else [])
+        total_latency = engine.run()
+
+        for accelerator_id, navigator in enumerate(engine.navigators):
+            self.stats.update_scratchpad_energy(accelerator_id, navigator.scratchpad_energy)
+        self.stats.update_system_stat("latency_breakdown", top_k_latency, "top_k_transfer")
+        self.stats.update_system_stat("total_latency", total_latency)
+        busy = {accelerator_id: engine.busy_time(accelerator_id) for accelerator_id in range(num_accelerators)}
+        logger.stats(f"Event-Driven Dimension-Split Sparse Mode - Split: {split}, Prefetch Depth: {prefetch_depth}, "
+                     f"Total Latency: {total_latency}, Busy Time per Accelerator: {busy}")
+
+    def run(self, summary_file=None, summary_nodes=False, print_nodes=True):
+        """
+        Simulate the trace and print the stats.
+
+        Args:
+            summary_file (str): If set, also write the stats as a JSON summary to this path.
+            summary_nodes (bool): Include per-node rows in the JSON summary.
+            print_nodes (bool): Print the per-node trace stats (one block per trace entry).
+        """
         mode = self.config['execution_mode']['parallelism']
         if mode not in ['standalone', 'distributed', 'dimension_split']:
             raise ValueError("Invalid execution mode. Choose from 'standalone', 'distributed', or 'dimension_split'.")
 
+        engine = self.config['execution_mode'].get('engine', 'analytical')
+        if engine != 'analytical' and (mode, self.execution_type) not in ENGINE_MODES.get(engine, []):
+            raise ValueError(f"Engine '{engine}' does not simulate {mode} {self.execution_type} retrieval; "
+                             f"it supports {ENGINE_MODES.get(engine, [])}.")
+
         if self.execution_type == 'dense':
-            
-            if mode == 'standalone':
+            # the pipelined engine embeds every query batch itself, overlapped with scoring the previous one
+            pipelined = mode == 'standalone' and engine == 'pipelined'
+            if mode in ['standalone', 'distributed'] and not pipelined:
                 accelerator = self.accelerators[0]
                 logger.info("Starting dense retrieval simulation...")
                 query_size_bytes = self.get_query_vector_size(self.batch_size, self.query_dimensions)
                 embed_time_us = accelerator.embed_query(query_size_bytes, 0)
                 self.stats.update_system_stat("latency_breakdown", embed_time_us, "query_embedding")
                 self.stats.update_system_stat("total_latency", embed_time_us)
-                self.interconnect.broadcast(self.accelerators, data_size=query_size_bytes)
+                broadcast_time_us = self.interconnect.broadcast(self.accelerators, data_size=query_size_bytes)
+
+            if mode == 'standalone':
                 logger.info("Executing standalone mode...")
-                self.execute_standalone_dense()
+                if pipelined:
+                    self.execute_standalone_pipelined()
+                elif engine == 'event':
+                    self.execute_standalone_event_driven()
+                elif self.config['execution_mode'].get('vectorized', True):
+                    self.execute_standalone_dense_vectorized()
+                else:
+                    self.execute_standalone_dense()
             elif mode == 'distributed':
+                # every accelerator scores against the embedded query
+                self.stats.update_system_stat("total_latency", broadcast_time_us)
                 logger.info("Executing distributed mode...")
-                self.execute_distributed_dense()
+                if engine == 'event':
+                    self.execute_distributed_dense_event_driven()
+                else:
+                    self.execute_distributed_dense()
             elif mode == 'dimension_split':
                 logger.info("Executing dimension_split mode...")
                 self.execute_dimension_split_dense()
@@ -755,28 +1273,55 @@ class EurekaStoreSim:
             logger.info("Starting sparse retrieval simulation...")
             if mode == 'standalone':
                 logger.info("Executing standalone mode...")
-                self.execute_standalone_sparse()
+                if engine == 'event':
+                    self.execute_standalone_event_driven()
+                else:
+                    self.execute_standalone_sparse()
             elif mode == 'distributed':
                 logger.info("Executing distributed mode...")
                 self.execute_distributed_sparse()
             elif mode == 'dimension_split':
                 logger.info("Executing dimension_split mode...")
-                self.execute_dimension_split_sparse()
+                if engine == 'event':
+                    self.execute_dimension_split_sparse_event_driven()
+                else:
+                    self.execute_dimension_split_sparse()
 
         logger.info("Simulation completed.")
         logger.info("Results.")
 
-        self.stats.print_stats()
+        self.stats.print_stats(include_nodes=print_nodes)
+        if summary_file:
+            metadata = {
+                "benchmark": self.config['benchmark'],
+                "trace_file": self.trace_file,
+                "execution_mode": self.config['execution_mode'],
+                "num_accelerators": len(self.accelerators),
+                "units": {"time": "us", "data_size": "bytes", "bandwidth": "GB/s"},
+            }
+            self.stats.write_summary(summary_file, include_nodes=summary_nodes, metadata=metadata)
+            logger.info(f"Stats summary written to {summary_file}")
 
         # for acc in self.accelerators:
         #     logger.stats(f"Accelerator {acc.accelerator_id} cycles: {acc.stats['cycles']}")
         # logger.stats(f"Total simulation cycles: {self.stats['total_cycles']}")
 
 if __name__ == "__main__":
-    config_file_path = sys.argv[1]
-    trace_file_path = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Simulate a retrieval trace on RAGX accelerators.")
+    parser.add_argument('config', type=str, help="path to the simulator config.")
+    parser.add_argument('trace', type=str, help="path to the trace file.")
+    parser.add_argument('--summary', type=str, default=None, help="write the stats as a JSON summary to this file.")
+    parser.add_argument('--summary_nodes', action="store_true", help="include per-node rows in the JSON summary.")
+    parser.add_argument('--no_print_nodes', action="store_true", help="do not print the per-node trace stats.")
+    parser.add_argument('--log_level', type=str, default='INFO', choices=list(LOG_LEVELS),
+                        help="diagnostic output level; DEBUG traces every trace entry and task.")
+    parser.add_argument('--quiet', action="store_true",
+                        help="only log warnings and errors (same as --log_level WARNING).")
+    args = parser.parse_args()
+    configure_logging(logging.WARNING if args.quiet else LOG_LEVELS[args.log_level])
+
     print ("Units: Times in us, Data size in bytes, Bandwidth in GB")
     configparser = ConfigParser()
-    config = configparser.load_config(config_file_path)
-    sim = EurekaStoreSim(trace_file_path, config)
-    sim.run()
\ No newline at end of file
+    config = configparser.load_config(args.config)
+    sim = EurekaStoreSim(args.trace, config)
+    sim.run(summary_file=args.summary, summary_nodes=args.summary_nodes, print_nodes=not args.no_print_nodes)
\ No newline at end of file
@@ -0,0 +1,49 @@
+import os
+import argparse
+import time
+import numpy as np
+from tracefile.tracefile import load_trace
+from tracefile.placement import (PLACEMENT_STRATEGIES, cross_partition_neighbors, edge_cut, load_hnsw_graph,
+                                 load_trace_graph, plan_placement, write_placed_trace)
+
+# Place documents on accelerators and rewrite the traces' partitions for the distributed modes
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Assign documents to accelerators and rewrite the traces' partitions.")
+    parser.add_argument('traces', type=str, nargs='+', help="paths to trace files (JSON, JSONL or binary).")
+    parser.add_argument('--num_accelerators', type=int, required=True, help="number of accelerators to place documents on.")
+    parser.add_argument('--strategy', type=str, default='graph', choices=PLACEMENT_STRATEGIES,
+                        help="random, locality (breadth-first ranges) or graph (minimize cross-accelerator edges).")
+    parser.add_argument('--index', type=str, default=None,
+                        help="FAISS HNSW index (benchmarks/*/create_hnsw_*.py) to take the graph from; default: the traces' hops.")
+    parser.add_argument('--imbalance', type=float, default=0.03,
+                        help="graph: how far an accelerator may grow beyond the mean number of documents.")
+    parser.add_argument('--iterations', type=int, default=20, help="graph: maximum refinement rounds.")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the random strategy.")
+    parser.add_argument('--output_dir', type=str, default=None,
+                        help="directory for rewritten traces (default: next to each input).")
+    parser.add_argument('--save_placement', type=str, default=None,
+                        help="also save the accelerator of every document as a .npy file.")
+    args = parser.parse_args()
+
+    start = time.time()
+    graph = load_hnsw_graph(args.index) if args.index else load_trace_graph(args.traces)
+    print(f"Graph: {graph.num_docs} documents, {graph.num_edges} edges [{time.time() - start:.2f}s]")
+
+    start = time.time()
+    placement = plan_placement(args.strategy, graph, args.num_accelerators, args.seed, args.imbalance, args.iterations)
+    sizes = np.bincount(placement, minlength=args.num_accelerators)
+    cut = edge_cut(graph, placement)
+    print(f"Placement ({args.strategy}, {args.num_accelerators} accelerators): "
+          f"{cut} of {graph.num_edges} edges cross accelerators ({cut / max(graph.num_edges, 1):.2%}), "
+          f"documents per accelerator {sizes.min()}-{sizes.max()} [{time.time() - start:.2f}s]")
+    if args.save_placement:
+        np.save(args.save_placement, placement)
+
+    for trace_path in args.traces:
+        output_dir = args.output_dir or os.path.dirname(trace_path)
+        stem, extension = os.path.splitext(os.path.basename(trace_path))
+        output_path = os.path.join(output_dir, f"{stem}_{args.strategy}{args.num_accelerators}{extension}")
+
+        write_placed_trace(trace_path, output_path, placement)
+        remote = cross_partition_neighbors(load_trace(trace_path), placement)
+        print(f"Placed {trace_path} -> {output_path} [{remote:.2%} of scored neighbors off their hop's accelerator]")
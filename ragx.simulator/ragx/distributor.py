@@ -1,44 +1,68 @@
+import simpy
+from collections import defaultdict
+
 class Distributor:
     """Distributor handles scheduling and dispatching tasks to backend executors."""
-    def __init__(self, env, config, executors, logger):
+    def __init__(self, env, config, executors, logger, interconnect=None):
         self.env = env
         self.config = config
         self.executors = executors
         self.logger = logger
         self.task_queue = simpy.Store(env)
-        self.processing_tasks = []
-    
+
+        # One functional unit per executor: tasks on the same executor serialize, tasks on
+        # different executors (e.g. scoring on the vector unit and a reduce on the scalar unit) overlap
+        self.units = {name: simpy.Resource(env, capacity=1) for name in executors}
+        # Collectives and host transfers share the interconnect with the other accelerators
+        self.interconnect = interconnect
+        self.busy_time = defaultdict(float)
+        self.intervals = defaultdict(list)  # (start, end) of every task per executor, in us
+        self.env.process(self.process_tasks())
+
     def enqueue_task(self, data_request):
-        """Add a new task to the processing queue."""
+        """Add a new task to the processing queue; its 'done' event fires when it completes."""
+        data_request.setdefault('done', self.env.event())
         self.task_queue.put(data_request)
+        return data_request['done']
 
     def associate_kernel(self, task):
         """Associates a task with the appropriate kernel and dispatches it."""
         kernel = task.get('kernel')
         target_executor = self.select_executor(kernel)
-        
-        if target_executor:
-            self.logger.info(f"Task with kernel '{kernel}' sent to {target_executor.__class__.__name__}")
-            process = self.env.process(target_executor.execute(task))
-            self.processing_tasks.append(process)
-            return process
+
+        if target_executor is None:
+            raise ValueError(f"No executor handles kernel '{kernel}'.")
+        self.logger.debug("Task with kernel '%s' sent to %s", kernel, target_executor)
+        return self.env.process(self.execute(target_executor, task))
 
     def select_executor(self, kernel):
         """Chooses an appropriate backend executor based on the kernel."""
         if kernel == "embedding":
-            return self.executors['systolic']
-        elif kernel in ["vector_add", "dot_product"]:
-            return self.executors['vector']
-        elif kernel in ["reduce", "all_reduce", "accumulate"]:
-            return self.executors['scalar']
+            return 'systolic'
+        elif kernel in ["vector_add", "dot_product", "scoring", "posting_list_scoring"]:
+            return 'vector'
+        elif kernel in ["reduce", "accumulate"]:
+            return 'scalar'
+        elif kernel in ["all_reduce", "reduce_scatter", "all_gather", "broadcast", "gather", "top_k_transfer"]:
+            return 'interconnect'
         return None
 
+    def execute(self, target_executor, task):
+        """Wait for the task's dependencies, then occupy its executor for task['latency'] us."""
+        if task.get('depends_on'):
+            yield self.env.all_of(task['depends_on'])
+
+        unit = self.interconnect if target_executor == 'interconnect' else self.units[target_executor]
+        with unit.request() as request:
+            yield request
+            start = self.env.now
+            yield self.env.timeout(task['latency'])
+        self.busy_time[target_executor] += task['latency']
+        self.intervals[target_executor].append((start, self.env.now))
+        task['done'].succeed()
+
     def process_tasks(self):
         """Process tasks from the queue as they arrive."""
         while True:
             task = yield self.task_queue.get()  # Get the next task
-            process = self.associate_kernel(task)  # Dispatch to appropriate executor
-            
-            if 'depends_on' in task:
-                # If there's a dependency, the navigator must wait for completion
-                task['depends_on'] = process
\ No newline at end of file
+            self.associate_kernel(task)  # Dispatch to appropriate executor
@@ -0,0 +1,113 @@
+import numpy as np
+import simpy
+from ragx.distributor import Distributor
+from ragx.navigator import Navigator
+
+EXECUTORS = ['systolic', 'vector', 'scalar']
+
+
+def merge_intervals(intervals):
+    """Sorted, disjoint (starts, ends) arrays covering the union of (start, end) intervals."""
+    if not intervals:
+        return np.empty(0), np.empty(0)
+    spans = np.array(intervals, dtype=np.float64)
+    spans = spans[np.argsort(spans[:, 0], kind='stable')]
+    starts, ends = spans[:, 0], np.maximum.accumulate(spans[:, 1])
+    opens = np.flatnonzero(np.r_[True, starts[1:] > ends[:-1]])
+    return starts[opens], ends[np.r_[opens[1:] - 1, len(spans) - 1]]
+
+
+def covered_time(starts, ends, times):
+    """Time covered by the disjoint intervals (starts, ends) up to each of `times`."""
+    lengths = ends - starts
+    cumulative = np.r_[0.0, np.cumsum(lengths)]
+    last = np.searchsorted(starts, times, side='right') - 1  # last interval starting at or before t
+    partial = np.minimum(times - starts[np.maximum(last, 0)], lengths[np.maximum(last, 0)]) if len(starts) else 0.0
+    return np.where(last >= 0, cumulative[np.maximum(last, 0)] + partial, 0.0)
+
+
+class EventEngine:
+    """
+    Discrete-event execution engine for RAGX accelerators.
+
+    Every accelerator gets a Navigator (NVMe fetch + scratchpad staging from its own NVMe device)
+    feeding a Distributor (systolic, vector and scalar units). The interconnect is shared by all
+    accelerators, so reads, compute and collectives only overlap when the hardware allows it.
+    Tasks are dicts with a 'kernel', a 'latency' in us and optional 'depends_on' events;
+    fetches additionally carry the 'size' of the data to read and optionally its 'read_time'.
+    """
+
+    def __init__(self, config, accelerators, read_time_us, logger):
+        self.config = config
+        self.logger = logger
+        self.env = simpy.Environment()
+
+        # Outstanding NVMe reads each accelerator's device services concurrently
+        self.nvme_queue_depth = config.get('nvme_queue_depth', config.get('nvme_channels', 1))
+        self.interconnect = simpy.Resource(self.env, capacity=1)
+
+        self.distributors, self.navigators = [], []
+        for accelerator in accelerators:
+            nvme = simpy.Resource(self.env, capacity=self.nvme_queue_depth)
+            distributor = Distributor(self.env, config, EXECUTORS, logger, self.interconnect)
+            navigator = Navigator(self.env, accelerator.memory_unit, distributor, config, logger, nvme, read_time_us)
+            self.distributors.append(distributor)
+            self.navigators.append(navigator)
+
+    def fetch(self, accelerator_id, kernel, size, latency, depends_on=(), read_time=None):
+        """
+        Read `size` bytes from NVMe, then run `kernel` on the fetched data; returns its done event.
+
+        read_time overrides the device's read time for `size` bytes, e.g. for data read in pieces.
+        """
+        request = {'kernel': kernel, 'size': size, 'latency': latency, 'depends_on': list(depends_on)}
+        if read_time is not None:
+            request['read_time'] = read_time
+        return self.navigators[accelerator_id].submit(request)
+
+    def task(self, accelerator_id, kernel, latency, depends_on=()):
+        """Run `kernel` on already resident data; returns its done event."""
+        task = {'kernel': kernel, 'latency': latency, 'depends_on': list(depends_on)}
+        return self.distributors[accelerator_id].enqueue_task(task)
+
+    def read(self, accelerator_id, size, depends_on=()):
+        """Read `size` bytes from NVMe without running a kernel on them; returns its done event."""
+        request = {'kernel': None, 'size': size, 'depends_on': list(depends_on)}
+        return self.navigators[accelerator_id].submit(request)
+
+    def delay(self, latency, depends_on=()):
+        """An uncontended delay (e.g. host-side work) after `depends_on`; returns its done event."""
+        def wait():
+            if depends_on:
+                yield self.env.all_of(list(depends_on))
+            yield self.env.timeout(latency)
+        return self.env.process(wait())
+
+    def run(self, until=None):
+        """Run until every submitted task finished (or `until`) and return the elapsed time in us."""
+        start = self.env.now
+        self.env.run(until=until)
+        return self.env.now - start
+
+    def busy_time(self, accelerator_id):
+        """Busy time in us of the accelerator's NVMe fetches and functional units."""
+        busy = dict(self.distributors[accelerator_id].busy_time)
+        busy['nvme'] = self.navigators[accelerator_id].busy_time
+        return busy
+
+    def overlap(self, accelerator_id):
+        """
+        Per resource of the accelerator: the time in us it was busy, and how much of that time
+        another resource (NVMe, a functional unit or the interconnect) was busy as well.
+        """
+        intervals = {name: spans for name, spans in self.distributors[accelerator_id].intervals.items() if spans}
+        intervals['nvme'] = self.navigators[accelerator_id].intervals
+
+        overlap = {}
+        for name, spans in intervals.items():
+            starts, ends = merge_intervals(spans)
+            other_starts, other_ends = merge_intervals([span for other, other_spans in intervals.items() if other != name for span in other_spans])
+            busy = float(np.sum(ends - starts))
+            overlapped = float(np.sum(covered_time(other_starts, other_ends, ends) - covered_time(other_starts, other_ends, starts)))
+            overlap[name] = {'busy': busy, 'overlapped': overlapped, 'overlap_fraction': overlapped / busy if busy else 0.0}
+        return overlap
@@ -1,4 +1,13 @@
 import os
+import sys
 
 currPath = os.path.dirname(os.path.abspath(__file__))
 os.environ['PYTHONPATH'] = currPath  # Set the PYTHONPATH environment variable
+
+# GeneSys modules import each other by bare name (genesysCompute, systolic_sim, ...),
+# so expose the same search path in-process as the standalone genesys.py script sees.
+for _path in (currPath, os.path.join(currPath, 'genesys_sim')):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+from genesys import simulate
@@ -6,6 +6,7 @@ from genesysCompute import *
 from genesysDecoder import *
 from genesysDecoderGEMM import *
 from genesysStats import *
+from genesysLayerCache import GenesysLayerCache, layerHash
 from systolic_sim.utils import *
 from pathlib import Path
 import os
@@ -38,8 +39,6 @@ class GeneSys:
             raise ValueError(f"Invalid Layer\n")
 
 
-results = []
-
 def getLayerType(_testPath):
     layer = {} 
     _instrPath = findFile(_testPath, '*string_final.txt')
@@ -80,8 +79,66 @@ def print_stats(x):
     #       {x['Arch']['arrayN']:4} | {tot_cycles:4} | {x['Genesys']['totTime']:4} | {compute_2_total_cycles:4} ")
     print('{:30s} {:15s} {:8s} {:10s} {:15s} {:15s} {:25s}'.format(Layer_Name, Layer_Type, str(Arch), str(Freq), str(Total_Cycles), str(Total_Time), str(Compute2TotalCycles)))
   
-def run_tests(configPath, testPath, mode):
-    global results
+def simulate_layer(configPath, layerPath, layerType, mode):
+    """Simulate one layer directory and return its genesys_stats."""
+    gStats = Genesys_Stats()
+    if isGemmLayer(layerPath) == True:
+        decoder = GenesysDecoderGEMM(configPath, layerPath, gStats, layerType)
+    else:
+        decoder = GenesysDecoder(configPath, layerPath, gStats, layerType)
+    decoder.cycle()
+    genesys_obj = GeneSys()
+    genesys_obj.run(decoder, gStats, layerPath, layerType, mode)
+    return gStats.genesys_stats
+
+def simulate_layers(configPath, layers, mode, processes=None, layerCache=None):
+    """
+    Simulate (layerPath, layerType) pairs, on a process pool when processes allows more than one.
+
+    Layers are independent, so each runs in its own worker; results come back in the order of
+    layers whatever order the workers finish in. processes=None uses every CPU. Inside a daemonic
+    pool worker (run_multi_tests), layers run serially as those cannot start processes.
+    With a layerCache file, layers whose content was simulated before are read from it and only
+    the others are simulated (see GenesysLayerCache).
+    """
+    results = [None] * len(layers)
+    cache = GenesysLayerCache(layerCache) if layerCache else None
+    keys = [layerHash(configPath, layerPath, layerType, mode) for layerPath, layerType in layers] if cache else None
+    missing = []
+    # layers identical to an earlier missing layer of this run are read back once it is cached
+    duplicates = []
+    missingKeys = set()
+    for i, (layerPath, layerType) in enumerate(layers):
+        results[i] = cache.get(keys[i], layerPath) if cache else None
+        if results[i] is not None:
+            continue
+        if cache and keys[i] in missingKeys:
+            duplicates.append(i)
+        else:
+            missing.append(i)
+            if cache:
+                missingKeys.add(keys[i])
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(missing))
+    args = [(configPath, layers[i][0], layers[i][1], mode) for i in missing]
+    if processes <= 1 or mp.current_process().daemon:
+        simulated = [simulate_layer(*layerArgs) for layerArgs in args]
+    else:
+        with mp.Pool(processes) as pool:
+            simulated = pool.starmap(simulate_layer, args, chunksize=1)
+
+    for i, stats in zip(missing, simulated):
+        results[i] = stats
+        if cache:
+            cache.put(keys[i], stats)
+    for i in duplicates:
+        results[i] = cache.get(keys[i], layers[i][0])
+    return results
+
+def run_tests(configPath, testPath, mode, processes=None, layerCache=None):
+    layers = []
     x = ''
     #print (f"Layer_Name{x:30s} |  Layer_Type{x:4s} | Arch{x:4s} | Total_Cycles{x:4s} | Total_Time{x:4s} | Compute2TotalCycles{x:4s} ")
     #print('\n{:30s} {:15s} {:8s} {:10s} {:15s} {:15s} {:25s}'.format('Layer_Name', 'Layer_Type', 'Arch', 'Freq(Mhz)', 'Total_Cycles', 'Total_Time(us)', 'Compute2TotalCycles'))
@@ -104,17 +161,8 @@ def run_tests(configPath, testPath, mode):
                     extract_simd_instr(_testPath)
                 # print (f'Test Name: {d}   |   Layer Type: {layerType}')
                 print (f'\n ***** {cnt}/{total_tests} - Test Name: {d} ******, Layer Type = {layerType}')
-                gStats = Genesys_Stats()
-                isGemm = isGemmLayer(_testPath)
-                # print("genesys.py", isGemm)
-                if isGemm == True:
-                    decoder = GenesysDecoderGEMM(configPath, _testPath, gStats, layerType)
-                else:
-                    decoder = GenesysDecoder(configPath, _testPath, gStats, layerType)
-                decoder.cycle()
-                genesys_obj = GeneSys()
-                genesys_obj.run(decoder, gStats, _testPath, layerType, mode)
-                results.append(gStats.genesys_stats)
+                layers.append((_testPath, layerType))
+    return simulate_layers(configPath, layers, mode, processes, layerCache)
 
 def isGemmLayer(_testpath):
     _fPath = findFile(_testpath, '*json.json')
@@ -250,19 +298,50 @@ def extract_csv_stats(results):
         csv_stats.append(row)
     return csv_stats
 
-def main(configPath, testPath, logFile=None, mode='perf'):
-    global results
-
+def main(configPath, testPath, logFile=None, mode='perf', processes=None, layerCache=None):
     if not logFile:
         logFile = f"{CALLPATH}/test-results/{Path(testPath).name}.csv"
     logDir = Path(logFile).parent
     if not logDir.exists():
         logDir.mkdir(parents=True, exist_ok=True)
 
-    run_tests(configPath, testPath, mode)
+    results = run_tests(configPath, testPath, mode, processes, layerCache)
     generateCSV(results, logFile)
 
 
+def sum_csv_stats(csv_stats):
+    """Sum every numeric column of extract_csv_stats rows by metric name.
+
+    Mirrors reading the generateCSV output back: the first two columns are
+    skipped and values that do not parse as a float (True, None, ...) are ignored.
+    """
+    sums = defaultdict(float)
+    if not csv_stats:
+        return {}
+    headers = csv_stats[1]
+    for row in csv_stats[2:]:
+        for i in range(2, len(row)):
+            try:
+                sums[headers[i]] += float(str(row[i]))
+            except ValueError:
+                continue
+    return dict(sums)
+
+
+def simulate(configPath, testPath, mode='perf', processes=None, layerCache=None):
+    """Simulate every layer of a compiled kernel in-process and return the summed stats.
+
+    Equivalent to running this script on testPath and summing the resulting
+    CSV, without the interpreter startup or the disk round-trip. Layers run on
+    up to processes worker processes, reusing layers found in the layerCache
+    file (see simulate_layers).
+    """
+    results = run_tests(configPath, testPath, mode, processes, layerCache)
+    if len(results) == 0:
+        return {}
+    return sum_csv_stats(extract_csv_stats(results))
+
+
 def run_single_test(config, mode, test_info):
     cnt = 0
     results = []
@@ -276,16 +355,7 @@ def run_single_test(config, mode, test_info):
         layer_type = getLayerType(layer_path)
         if 'fused' in layer_type:
             extract_simd_instr(layer_path)
-        gen_stats = Genesys_Stats()
-
-        if isGemmLayer(layer_path) == True:
-            decoder = GenesysDecoderGEMM(config, layer_path, gen_stats, layer_type)
-        else:
-            decoder = GenesysDecoder(config, layer_path, gen_stats, layer_type)
-        decoder.cycle()
-        genesys_obj = GeneSys()
-        genesys_obj.run(decoder, gen_stats, layer_path, layer_type, mode)
-        results.append(gen_stats.genesys_stats)
+        results.append(simulate_layer(config, layer_path, layer_type, mode))
 
     if len(results) > 1:
         return extract_csv_stats(results)
@@ -347,6 +417,8 @@ if __name__ == "__main__":
         parser.add_argument('--mode', type=str, help="Simulation mode.", default="perf")
         parser.add_argument('--log_path', type=str, help="Logfile name.", default=None)
         parser.add_argument('--multi_test', help="Run multiple tests or a single.", action="store_true")
+        parser.add_argument('--processes', type=int, help="Worker processes for the layers of a single test (default: all CPUs).", default=None)
+        parser.add_argument('--layer_cache', type=str, help="SQLite file of per-layer results to reuse and extend.", default=None)
         # config_path = sys.argv[1]
         # test_path = sys.argv[2]
         # mode = sys.argv[3] if len(sys.argv) >= 5 else 'perf'
@@ -364,7 +436,7 @@ if __name__ == "__main__":
         if run_multi:
             run_multi_tests(test_path, config_path, mode, debug_mode=False)
         else:
-            main(config_path, test_path, logFile=log_path, mode=mode)
+            main(config_path, test_path, logFile=log_path, mode=mode, processes=args.processes, layerCache=args.layer_cache)
     else:
         config_path = f"{CWD}/../configs/"
         test_path = f"{CWD}/../testdir/testbench_dir/"
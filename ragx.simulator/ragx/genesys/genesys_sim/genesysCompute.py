@@ -1,5 +1,7 @@
 import os
+import copy
 import math
+import numpy as np
 from genesysDecoder import *
 from systolic_sim.utils import *
 from systolic_sim.systolic_sim import *
@@ -7,7 +9,11 @@ from sram.cacti_sweep import CactiSweep
 from simd_sim.simulator.pipeline import *
 from simd_sim.simulator.config_parser import *
 
-class genesysCompute:
+# genesysCompute totals that the tile loop produces
+GENESYS_TILE_LOOP_STATS = ['totCycles', 'totLoadCycles', 'totSysComputeCycles', 'totSimdComputeCycles',
+                           'totStoreCycles', 'totSIMDCycles', 'perTileCycles']
+
+class genesysCompute(LazyPerTileCycles):
     def __init__(self, decoder, stats, testDir) -> None:
         self.decoder = decoder
         self.gStats = stats
@@ -44,7 +50,7 @@ class genesysCompute:
         sysSim = systolic_sim(self.decoder.configPath, self.decoder.testPath, \
             ddrBandwidth = self.decoder.infBandwidth, fused = fused,layerType = self.decoder.layerType, isGemmlayer = self.decoder.isGemmlayer)
         sysSim.cycle()
-        self.systolicResult = sysSim.getStats()
+        self.systolicResult = sysSim.getStats(perTileCycles = False)
         self.sysComputeCycles = self.systolicResult[0][2]
         self.sysLoadCycles = self.systolicResult[0][3]
         self.sysStoreCycles = self.systolicResult[0][4]
@@ -179,7 +185,7 @@ class genesysCompute:
         sysSim = systolic_sim(self.decoder.configPath, self.decoder.testPath, ddrBandwidth = self.decoder.infBandwidth, \
             fused = fused, layerType = self.decoder.layerType, isGemmlayer = self.decoder.isGemmlayer)
         sysSim.cycle()
-        self.systolicResult = sysSim.getStats()
+        self.systolicResult = sysSim.getStats(perTileCycles = False)
         self.sysComputeCycles = self.systolicResult[0][2]
         self.sysLoadCycles = self.systolicResult[0][3]
         self.weightLoadCycles = self.systolicResult[0][10]
@@ -259,6 +265,11 @@ class genesysCompute:
         # print ("tiles = ", self.decoder.numComputeTiles)
 
     def cycleConv(self):
+        if self.decoder.tileLoopMode == 'loop':
+            return self.cycleConvLoop()
+        self.cycleClosedForm(convTileIndices(self.decoder.tileDims), 0, genesysCompute.cycleConvLoop)
+
+    def cycleConvLoop(self):
         _iterCount = 0
         _prevArr1DIndex = 0
         self.computeTile(0,_prevArr1DIndex, -1)
@@ -280,6 +291,23 @@ class genesysCompute:
         self.totCycles += self.decoder.decoderCycles
         
     def cycleGemm(self):
+        if self.decoder.tileLoopMode == 'loop':
+            return self.cycleGemmLoop()
+        self.cycleClosedForm(gemmTileIndices(self.decoder.tileDims), self.decoder.numComputeTiles - 1,
+                             genesysCompute.cycleGemmLoop)
+
+    def cycleClosedForm(self, indices, drainIndex, loop):
+        reference = None
+        if self.decoder.tileLoopMode == 'validate':
+            reference = copy.copy(self)
+            reference.perTileCycles = list(self.perTileCycles)
+        self.cycleTiles(indices, drainIndex)
+        self.totCycles += self.decoder.decoderCycles
+        if reference is not None:
+            loop(reference)
+            validateTileLoop(self, reference, GENESYS_TILE_LOOP_STATS)
+
+    def cycleGemmLoop(self):
         _iterCount = 0
         _prevArr1DIndex = 0
         self.computeTile(0,_prevArr1DIndex, -1)
@@ -300,6 +328,38 @@ class genesysCompute:
         #One time addition on decoder overhead
         self.totCycles += self.decoder.decoderCycles
 
+    def cycleTiles(self, indices, drainIndex):
+        """
+        Closed-form equivalent of the compute-tile loop, for the tiles' 1D indices in loop order.
+
+        A tile's cost depends only on its position in the loop (first, second to last, draining)
+        and on whether getSIMDCycles still charges it a SIMD load, so tiles are grouped by those
+        two, each group is costed once with tileCycles, and the totals are group costs times
+        group sizes. The initial load goes through computeTile as in the loop.
+        """
+        numTiles = self.decoder.numComputeTiles
+        self.computeTile(0, 0, -1)
+
+        # The final drain (iteration numTiles) is called with drainIndex
+        indices = np.append(np.asarray(indices, dtype=int), drainIndex)
+        prevIndices = np.concatenate(([0], indices[:-1]))
+        iters = np.arange(len(indices))
+        iters[-1] = numTiles
+        # 0: first, 1: second to last, 2: draining, 3: any other tile, in tileCycles' branch order
+        position = np.where(iters == 0, 0, np.where(iters == numTiles - 1, 1, np.where(iters == numTiles, 2, 3)))
+        simdLoad = indices < max(self.decoder.numSIMDLoadTiles['vmem1'], self.decoder.numSIMDLoadTiles['vmem2'])
+        _, firstTiles, tileClasses, counts = np.unique(position * 2 + simdLoad, return_index=True,
+                                                       return_inverse=True, return_counts=True)
+        classCycles = [self.tileCycles(int(indices[i]), int(prevIndices[i]), int(iters[i]), verbose=False)
+                       for i in firstTiles]
+
+        self.deferPerTileCycles([c[0] for c in classCycles], tileClasses)
+        self.totCycles = repeatedSum(self.totCycles, [math.ceil(c[0]) for c in classCycles], counts, tileClasses)
+        for col, total in enumerate(['totLoadCycles', 'totSysComputeCycles', 'totSimdComputeCycles',
+                                     'totStoreCycles', 'totSIMDCycles'], 1):
+            setattr(self, total, repeatedSum(getattr(self, total), [c[col] for c in classCycles], counts, tileClasses))
+        print ("Closed-form tile cycles: {} tiles in {} classes, total ===== {}".format(len(indices), len(counts), self.totCycles))
+
     def cycle(self):
         if self.decoder.isGemmlayer:
             self.cycleGemm()
@@ -320,7 +380,8 @@ class genesysCompute:
         return _simdCycles
 
 
-    def computeTile(self, _arr1DIndex, _prevArr1DIndex, _iterCount):
+    def tileCycles(self, _arr1DIndex, _prevArr1DIndex, _iterCount, verbose=True):
+        """Cycles one tile adds: (total, load, systolic compute, SIMD compute, store, SIMD) cycles."""
         _computeCycles = 0
         _loadCycles = 0
         _sysComputeCycles = 0
@@ -334,7 +395,7 @@ class genesysCompute:
             # rohan: todo fix with a better memory model
             _totalCyclesThisIter = _ibufLoadCycles + _wbufLoadCycles
             _loadCycles = _ibufLoadCycles + _wbufLoadCycles
-            print ("Here 1 _totalCyclesThisIter", _totalCyclesThisIter, _ibufLoadCycles, _wbufLoadCycles, self.sysLoadCycles)
+            if verbose: print ("Here 1 _totalCyclesThisIter", _totalCyclesThisIter, _ibufLoadCycles, _wbufLoadCycles, self.sysLoadCycles)
         elif _iterCount == 0:
             _ibufLoadCycles = self.sysLoadCycles #if self.decoder.ibufReuse[_arr1DIndex+1] == 0 else 0 
             _wbufLoadCycles = self.weightLoadCycles #if self.decoder.wbufReuse[_arr1DIndex+1] == 0 else 0 
@@ -342,7 +403,7 @@ class genesysCompute:
             _totalCyclesThisIter = max(_computeCycles, _ibufLoadCycles + _wbufLoadCycles)
             _loadCycles = _ibufLoadCycles + _wbufLoadCycles
             _sysComputeCycles = _computeCycles
-            print ("Here 2 _totalCyclesThisIter", _totalCyclesThisIter, "load cycle = ", _ibufLoadCycles, _wbufLoadCycles,  'compute = ', _computeCycles)
+            if verbose: print ("Here 2 _totalCyclesThisIter", _totalCyclesThisIter, "load cycle = ", _ibufLoadCycles, _wbufLoadCycles,  'compute = ', _computeCycles)
         elif _iterCount == self.decoder.numComputeTiles - 1:
             _computeCycles = self.sysComputeCycles
             # todo: add reuse, if any
@@ -355,12 +416,12 @@ class genesysCompute:
             _storeCycles = self.simdStoreCycles
             _totSIMDcycles = _simdStoreCycles
 
-            print ("Here 3 _totalCyclesThisIter", _totalCyclesThisIter, "_simdStoreCycles", _simdStoreCycles, "_sysComputeCycles", _sysComputeCycles )
+            if verbose: print ("Here 3 _totalCyclesThisIter", _totalCyclesThisIter, "_simdStoreCycles", _simdStoreCycles, "_sysComputeCycles", _sysComputeCycles )
         elif _iterCount == self.decoder.numComputeTiles:
             _simdStoreCycles = self.getSIMDCycles(_arr1DIndex)
             #print ("_simdStoreCycles = ", _simdStoreCycles)
             _totalCyclesThisIter = _simdStoreCycles
-            print ("Here 4 _totalCyclesThisIter", _totalCyclesThisIter)
+            if verbose: print ("Here 4 _totalCyclesThisIter", _totalCyclesThisIter)
             _simdComputeCycles = self.simdComputeCycles
             _storeCycles = self.simdStoreCycles
             _totSIMDcycles = _simdStoreCycles
@@ -377,8 +438,13 @@ class genesysCompute:
             _simdComputeCycles = self.simdComputeCycles
             _storeCycles = self.simdStoreCycles
             _totSIMDcycles = _simdStoreCycles
-            print ("Here 5 _totalCyclesThisIter", _totalCyclesThisIter, "_simdStoreCycles", _simdStoreCycles, "_wbufLoadCycles",_wbufLoadCycles , "_syscomputeCycles", _computeCycles, "simd compute ", _simdComputeCycles)
+            if verbose: print ("Here 5 _totalCyclesThisIter", _totalCyclesThisIter, "_simdStoreCycles", _simdStoreCycles, "_wbufLoadCycles",_wbufLoadCycles , "_syscomputeCycles", _computeCycles, "simd compute ", _simdComputeCycles)
         
+        return _totalCyclesThisIter, _loadCycles, _sysComputeCycles, _simdComputeCycles, _storeCycles, _totSIMDcycles
+
+    def computeTile(self, _arr1DIndex, _prevArr1DIndex, _iterCount):
+        _totalCyclesThisIter, _loadCycles, _sysComputeCycles, _simdComputeCycles, _storeCycles, _totSIMDcycles = \
+            self.tileCycles(_arr1DIndex, _prevArr1DIndex, _iterCount)
         self.perTileCycles.append(_totalCyclesThisIter)
         self.totCycles += math.ceil(_totalCyclesThisIter)
         print ("tile cycles ===== ", math.ceil(_totalCyclesThisIter))
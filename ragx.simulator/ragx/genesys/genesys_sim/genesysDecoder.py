@@ -167,6 +167,8 @@ class GenesysDecoder():
             _data = json.load(f)
             self.infLatency = _data["infLatency"]
             self.freq = _data['frequency']
+            # closed-form (default), loop (per-tile reference) or validate (both, checked equal)
+            self.tileLoopMode = _data.get('tileLoopMode', 'closed-form')
             self.infBandwidth = _data["IBUFinfBandwidth"]
             self.infFrequency = _data["ddr_frequency Mhz"]
             self.IBUFinfBandwidth = _data["IBUFinfBandwidth"] 
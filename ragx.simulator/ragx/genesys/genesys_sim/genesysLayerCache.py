@@ -0,0 +1,77 @@
+import glob
+import hashlib
+import os
+import pickle
+import sqlite3
+from contextlib import closing
+
+# layer files that determine a layer's simulation, relative to the layer directory
+LAYER_HASH_PATTERNS = ['*_json.json', '*_binary.txt', '../*arch_cfg.json']
+
+def layerHash(configPath, layerPath, layerType, mode):
+    """
+    Content hash of everything a layer's genesys_stats depend on, but its directory name.
+
+    Covers the layer's *_json.json and *_binary.txt, the kernel's arch config and every file in
+    configPath (systolic/simd configs), plus the layer type and simulation mode. The directory
+    name only ends up in Compiler/layerName, which GenesysLayerCache.get fills in per layer.
+    """
+    digest = hashlib.sha1()
+    for pattern in LAYER_HASH_PATTERNS:
+        for filePath in sorted(glob.glob(os.path.join(layerPath, pattern))):
+            digest.update(os.path.basename(filePath).encode())
+            with open(filePath, 'rb') as f:
+                digest.update(f.read())
+    for fileName in sorted(os.listdir(configPath)):
+        filePath = os.path.join(configPath, fileName)
+        if os.path.isfile(filePath):
+            digest.update(fileName.encode())
+            with open(filePath, 'rb') as f:
+                digest.update(f.read())
+    digest.update(f"{layerType}:{mode}".encode())
+    return digest.hexdigest()
+
+class GenesysLayerCache:
+    """
+    genesys_stats of single layers in SQLite, keyed by layerHash.
+
+    Identical layers of different kernels (benchmarks, batch sizes, parallelism modes) share an
+    entry, so a kernel run only simulates the layers not seen before. Stats are pickled, which
+    keeps their numpy values and defaultdicts as simulated; several processes may share the file.
+    """
+    def __init__(self, cacheFile, timeout=60):
+        self.cacheFile = cacheFile
+        self.timeout = timeout
+        self.entries = {}
+
+        cacheDir = os.path.dirname(cacheFile)
+        if cacheDir:
+            os.makedirs(cacheDir, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS layers (layer_hash TEXT PRIMARY KEY, stats BLOB NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.cacheFile, timeout=self.timeout)
+
+    def get(self, key, layerPath):
+        """Return a fresh copy of the stats cached under key, named after layerPath, or None."""
+        if key not in self.entries:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute("SELECT stats FROM layers WHERE layer_hash = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.entries[key] = row[0]
+
+        stats = pickle.loads(self.entries[key])
+        # named the way GenesysDecoder.layerName names it
+        stats['Compiler']['layerName'] = layerPath.split('/')[-1]
+        return stats
+
+    def put(self, key, stats):
+        """Store stats under key; the first writer wins if several processes race."""
+        blob = pickle.dumps(stats)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR IGNORE INTO layers VALUES (?, ?)", (key, blob))
+        self.entries.setdefault(key, blob)
@@ -1,6 +1,10 @@
 from collections import defaultdict
 from systolic_sim.utils import *
 
+def not_available():
+    return 'NA'
+
 class Genesys_Stats:
     def __init__(self) -> None:
-        self.genesys_stats = defaultdict(lambda: 'NA')
\ No newline at end of file
+        # a module-level default factory keeps genesys_stats picklable for worker processes
+        self.genesys_stats = defaultdict(not_available)
\ No newline at end of file
@@ -2,6 +2,52 @@ from simd_sim.simulator.stage import Stage, read_data, execute, write_data
 import copy
 
 
+def should_skip_inst(inst_reg):
+    """True if an ALU lane lets inst_reg pass without queueing it for execution."""
+    if inst_reg.is_nop():
+        return True
+
+    opcode = inst_reg.opcode
+    if opcode == 4 or opcode == 5 or opcode == 6 or opcode == 7 or opcode == 10 or opcode == 11:
+        return True
+
+    if opcode == 8:
+        if inst_reg.function < 3 or inst_reg.first_permute:
+            return True
+
+    return False
+
+
+def required_alu_cycles(opcode, function):
+    if opcode == 1:
+        if function == 2:
+            return 4
+
+    return 1
+
+
+def retire_inst(inst, execution_idx, banked_memory, dest_bank_write_address, statistics):
+    """Execute a queued instruction whose cycles have elapsed on lane execution_idx."""
+    if inst.opcode != 13 and inst.opcode != 14:
+        bank_shuffling = (inst.src2_index_id == 1)
+        if inst.opcode == 8 and inst.function == 3 and bank_shuffling and not inst.first_permute:
+            # Update the write address at current bank
+            dest_bank_write_address[execution_idx] = inst.addr_dst
+            read_data(inst, execution_idx, banked_memory, statistics)
+            execute(inst, execution_idx, banked_memory, statistics)
+            # read from a different bank
+            actual_write_address = dest_bank_write_address[inst.dest_bank]
+            inst.addr_dst = actual_write_address
+            write_data(inst, inst.dest_bank, banked_memory, statistics)
+        else:
+            read_data(inst, execution_idx, banked_memory, statistics)
+            execute(inst, execution_idx, banked_memory, statistics)
+            write_data(inst, execution_idx, banked_memory, statistics)
+
+        if inst.first_permute:
+            inst.first_permute = False
+
+
 class ALU(Stage):
     def __init__(self, simd_lane_cnt, execution_idx, banked_memory, dest_bank_write_address, pipeline=None):
         super(ALU, self).__init__(simd_lane_cnt)
@@ -56,8 +102,7 @@ class ALU(Stage):
             if not self._should_skip():
                 # inst_reg = copy.deepcopy(self.input_inst_reg)
                 inst_reg = self.input_inst_reg.copy_instr()
-                inst_reg.remain_cycle = self.__calculate_remain_cycle(inst_reg.opcode,
-                                                                      inst_reg.function)
+                inst_reg.remain_cycle = required_alu_cycles(inst_reg.opcode, inst_reg.function)
                 self.inst_queue.append(inst_reg)
 
     def _handle(self):
@@ -69,45 +114,10 @@ class ALU(Stage):
                 self.inst_queue[i].remain_cycle -= 1
 
             if self.inst_queue[0].remain_cycle == 0:
-                inst = self.inst_queue.pop(0)
-                if inst.opcode != 13 and inst.opcode != 14:
-                    bank_shuffling = (inst.src2_index_id == 1)
-                    if inst.opcode == 8 and inst.function == 3 and bank_shuffling and not inst.first_permute:
-                        # Update the write address at current bank
-                        self.dest_bank_write_address[self.execution_idx] = inst.addr_dst
-                        read_data(inst, self.execution_idx, self.banked_memory, self.statistics)
-                        execute(inst, self.execution_idx, self.banked_memory, self.statistics)
-                        # read from a different bank
-                        actual_write_address = self.dest_bank_write_address[inst.dest_bank]
-                        inst.addr_dst = actual_write_address
-                        write_data(inst, inst.dest_bank, self.banked_memory, self.statistics)
-                    else:
-                        read_data(inst, self.execution_idx, self.banked_memory, self.statistics)
-                        execute(inst, self.execution_idx, self.banked_memory, self.statistics)
-                        write_data(inst, self.execution_idx, self.banked_memory, self.statistics)
-                        
-                    if inst.first_permute:
-                        inst.first_permute = False
+                retire_inst(self.inst_queue.pop(0), self.execution_idx, self.banked_memory,
+                            self.dest_bank_write_address, self.statistics)
 
         return self.input_inst_reg
 
     def _should_skip(self):
-        if self.input_inst_reg.is_nop():
-            return True
-
-        opcode = self.input_inst_reg.opcode
-        if opcode == 4 or opcode == 5 or opcode == 6 or opcode == 7 or opcode == 10 or opcode == 11:
-            return True
-
-        if opcode == 8:
-            if self.input_inst_reg.function < 3 or self.input_inst_reg.first_permute:                 
-                return True
-
-        return False
-
-    def __calculate_remain_cycle(self, opcode, function):
-        if opcode == 1:
-            if function == 2:
-                return 4
-
-        return 1
+        return should_skip_inst(self.input_inst_reg)
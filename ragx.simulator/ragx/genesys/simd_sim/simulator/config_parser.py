@@ -2,7 +2,9 @@ import re
 import json
 import os
 import copy
+import numpy as np
 from systolic_sim.utils import *
+from simd_sim.simulator.instruction import decode_instructions
 
 
 class ConfigParser:
@@ -22,6 +24,8 @@ class ConfigParser:
             config["layer-example-path"] = json_data["layer-example-path"]
             config["layer-example-name"] = os.path.basename(json_data["layer-example-path"])
             config["fast-run"] = json_data["fast-run"]
+            config["alu-engine"] = json_data.get("alu-engine", "reference")
+            config["steady-state-window"] = json_data.get("steady-state-window", 0)
             config["ld-init-delay-cycles"] = json_data["ld-init-delay-cycles"]
             config["ld-scale-of-delay"] = json_data["ld-scale-of-delay"]
             config["st-init-delay-cycles"] = json_data["st-init-delay-cycles"]
@@ -59,14 +63,9 @@ class ConfigParser:
         #with open(f"{layer_example_path}/{layer_example_name}{extn}", "r") as f:
         _filePath = findFile(layer_example_path,extn)
         with open(_filePath, "r") as f:
-            curr_opcode = 10
-            cnt_state_change = 0
-            for line in f.readlines():
-                line = line.rstrip()
-                opcode = int(line[0:4], 2)
-                if opcode != curr_opcode:
-                    curr_opcode = opcode
-                    cnt_state_change += 1
+            opcodes = decode_instructions([int(line, 2) for line in f if line.strip()])["opcode"]
+            # the count starts from opcode 10, so a leading opcode other than 10 is a change too
+            cnt_state_change = int(np.count_nonzero(np.diff(opcodes, prepend=10)))
             # print(f"cnt_state_change: {cnt_state_change}")
             config["state-change-cnt"] = cnt_state_change
 
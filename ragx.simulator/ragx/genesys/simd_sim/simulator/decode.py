@@ -439,7 +439,8 @@ class Decode(Stage):
                 
                 self.pipeline.start_alu_loop(instruction_cnt=1,
                                          iteration_cnt= total_iteration,
-                                         is_nested=True)
+                                         is_nested=True,
+                                         is_permutation=True)
                 
                 self.cycle_required = total_iteration
 
@@ -1,6 +1,47 @@
 
 
+import numpy as np
+
+
+# bit fields of a 32-bit SIMD instruction: name -> (shift, width)
+INSTRUCTION_FIELDS = {
+    "opcode": (28, 4),
+    "function": (24, 4),
+    "dst_ns_id": (21, 3),
+    "dst_index_id": (16, 5),
+    "src1_ns_id": (13, 3),
+    "src1_index_id": (8, 5),
+    "src2_ns_id": (5, 3),
+    "src2_index_id": (0, 5),
+    "immediate": (0, 16),
+    "op_spec": (22, 6),
+}
+
+# one record per instruction: the raw word followed by its decoded fields
+INSTRUCTION_DTYPE = np.dtype([("instruction", np.int64)] + [(name, np.int64) for name in INSTRUCTION_FIELDS])
+
+
+def decode_instructions(instructions):
+    """
+    Decode a whole instruction stream at once.
+    :param instructions:
+    Decimal instruction words
+    :return:
+    A structured array (INSTRUCTION_DTYPE) with one record per instruction
+    """
+    words = np.asarray(instructions, dtype=np.int64)
+    decoded = np.zeros(len(words), dtype=INSTRUCTION_DTYPE)
+    decoded["instruction"] = words
+    for name, (shift, width) in INSTRUCTION_FIELDS.items():
+        decoded[name] = (words >> shift) & ((1 << width) - 1)
+    return decoded
+
+
 class InstructionRegister:
+    __slots__ = ("instruction", "opcode", "function", "dst_ns_id", "dst_index_id", "src1_ns_id", "src1_index_id",
+                 "src2_ns_id", "src2_index_id", "immediate", "dest_bank", "first_permute", "op_spec",
+                 "addr_src1", "addr_src2", "addr_dst", "alu_src1", "alu_src2", "alu_dst", "pc_idx", "remain_cycle")
+
     def __init__(self, instruction=None,
                  opcode=0,
                  function=15,
@@ -62,45 +103,67 @@ class InstructionRegister:
 
         return False
 
+    @classmethod
+    def from_record(cls, record, pc_idx=None):
+        """
+        Build a register from a decode_instructions record (as a tuple), without parsing the word again.
+        """
+        inst = cls.__new__(cls)
+        (inst.instruction, inst.opcode, inst.function, inst.dst_ns_id, inst.dst_index_id,
+         inst.src1_ns_id, inst.src1_index_id, inst.src2_ns_id, inst.src2_index_id,
+         inst.immediate, inst.op_spec) = record
+        inst.dest_bank = None
+        inst.first_permute = False
+        inst.addr_src1 = None
+        inst.addr_src2 = None
+        inst.addr_dst = None
+        inst.alu_src1 = None
+        inst.alu_src2 = None
+        inst.alu_dst = None
+        inst.pc_idx = pc_idx
+        inst.remain_cycle = None
+        return inst
+
     def __parse(self, instruction):
-        self.opcode = int(instruction[0:4], 2)            # 4  bits
-        self.function = int(instruction[4:8], 2)          # 4  bits
-        self.dst_ns_id = int(instruction[8:11], 2)        # 3  bits
-        self.dst_index_id = int(instruction[11:16], 2)    # 5  bits
-        self.src1_ns_id = int(instruction[16:19], 2)      # 3  bits
-        self.src1_index_id = int(instruction[19:24], 2)   # 5  bits
-        self.src2_ns_id = int(instruction[24:27], 2)      # 3  bits
-        self.src2_index_id = int(instruction[27:32], 2)   # 5  bits
-        self.immediate = int(instruction[16:32], 2)       # 16 bits
-        self.op_spec = int(instruction[4:10], 2)          # 6  bits
+        # accept the binary string form as well as the decimal word
+        if isinstance(instruction, str):
+            instruction = int(instruction, 2)
+        self.instruction = instruction
+        self.opcode = instruction >> 28                 # 4  bits
+        self.function = (instruction >> 24) & 0xF       # 4  bits
+        self.dst_ns_id = (instruction >> 21) & 0x7      # 3  bits
+        self.dst_index_id = (instruction >> 16) & 0x1F  # 5  bits
+        self.src1_ns_id = (instruction >> 13) & 0x7     # 3  bits
+        self.src1_index_id = (instruction >> 8) & 0x1F  # 5  bits
+        self.src2_ns_id = (instruction >> 5) & 0x7      # 3  bits
+        self.src2_index_id = instruction & 0x1F         # 5  bits
+        self.immediate = instruction & 0xFFFF           # 16 bits
+        self.op_spec = (instruction >> 22) & 0x3F       # 6  bits
 
     def copy_instr(self):
-
-        return InstructionRegister(
-            instruction=self.instruction,
-            opcode=self.opcode,
-            function=self.function,
-            dst_ns_id=self.dst_ns_id,
-            dst_index_id=self.dst_index_id,
-            src1_ns_id=self.src1_ns_id,
-            src1_index_id=self.src1_index_id,
-            src2_ns_id=self.src2_ns_id,
-            src2_index_id=self.src2_index_id,
-            immediate=self.immediate,
-            dest_bank=self.dest_bank,
-            first_permute=self.first_permute,
-            op_spec=self.op_spec,
-            addr_src1=self.addr_src1,
-            addr_src2=self.addr_src2,
-            addr_dst=self.addr_dst,
-            alu_src1=self.alu_src1,
-            alu_src2=self.alu_src2,
-            alu_dst=self.alu_dst,
-            pc_idx=self.pc_idx,
-            remain_cycle=self.remain_cycle,
-            parse_instr=False
-        )
-
+        inst = InstructionRegister.__new__(InstructionRegister)
+        inst.instruction = self.instruction
+        inst.opcode = self.opcode
+        inst.function = self.function
+        inst.dst_ns_id = self.dst_ns_id
+        inst.dst_index_id = self.dst_index_id
+        inst.src1_ns_id = self.src1_ns_id
+        inst.src1_index_id = self.src1_index_id
+        inst.src2_ns_id = self.src2_ns_id
+        inst.src2_index_id = self.src2_index_id
+        inst.immediate = self.immediate
+        inst.dest_bank = self.dest_bank
+        inst.first_permute = self.first_permute
+        inst.op_spec = self.op_spec
+        inst.addr_src1 = self.addr_src1
+        inst.addr_src2 = self.addr_src2
+        inst.addr_dst = self.addr_dst
+        inst.alu_src1 = self.alu_src1
+        inst.alu_src2 = self.alu_src2
+        inst.alu_dst = self.alu_dst
+        inst.pc_idx = self.pc_idx
+        inst.remain_cycle = self.remain_cycle
+        return inst
 
 if __name__ == "__main__":
     ir = InstructionRegister(instruction=274743296)
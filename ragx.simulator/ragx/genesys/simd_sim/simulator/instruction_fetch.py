@@ -27,13 +27,23 @@ class InstructionFetch(Stage):
         # delegators, but access data directly for now
         self.decode = None
         self.address_generation = None
+        self.steady_state = None
 
     def _handle(self):
         return self.input_inst_reg
 
-    def feed_inst(self, instruction):
-        if instruction is not None:
-            self._feed_inst_reg(InstructionRegister(instruction))
+    def load_program(self, decoded):
+        """
+        :param decoded:
+        The decode_instructions records of the program, which are fetched by pc
+        """
+        # tuples of Python ints, so a fetch builds its register without touching numpy
+        self.inst_list = decoded.tolist()
+        self.pc_end = len(self.inst_list)
+
+    def feed_inst(self, record):
+        if record is not None:
+            self._feed_inst_reg(InstructionRegister.from_record(record, pc_idx=self.pc))
 
     def iter_loop_inst(self):
         overhead_cycle = 0
@@ -48,6 +58,8 @@ class InstructionFetch(Stage):
 
                 if self.left_redo_loop == 0:
                     self.is_looping = False
+                elif self.steady_state is not None:
+                    self.steady_state.end_iteration()
 
         return overhead_cycle
 
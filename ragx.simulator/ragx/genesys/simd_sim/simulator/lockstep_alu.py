@@ -0,0 +1,174 @@
+from collections import deque
+import numpy as np
+from simd_sim.simulator.stage import Stage, new_statistics
+from simd_sim.simulator.alu import should_skip_inst, required_alu_cycles, retire_inst
+
+
+class LockStepALU(Stage):
+    """
+    All SIMD lanes' ALU stages advanced together, in place of simd_lane_cnt chained ALU stages.
+
+    The chained ALUs never stall, so they behave as a shift register: lane k holds at cycle t the
+    instruction lane 0 was fed at cycle t-k. Every lane reads an instruction's fields when it is
+    fed, and AddressGeneration can still rewrite them (permutations re-feed the same instruction),
+    so lanes hold slots of in-flight instructions and each slot tracks the instruction's current
+    state id. Per-lane ALU queues are numpy arrays of state ids and remaining cycles, and retired
+    instructions are counted per (state, lane); statistics turns those counts into the reference
+    per-lane memory accesses. ALU data values are not tracked, as the reference never writes
+    them back.
+    """
+    def __init__(self, simd_lane_cnt, banked_memory, dest_bank_write_address, pipeline=None):
+        super(LockStepALU, self).__init__(simd_lane_cnt)
+        self.name = "LockStepALU"
+        self.banked_memory = banked_memory
+        self.dest_bank_write_address = dest_bank_write_address
+        self.pipeline = pipeline
+
+        # lane inputs, lane 0 first
+        self.lane_inst_regs = deque([None] * simd_lane_cnt, maxlen=simd_lane_cnt)
+        self.lane_slots = np.full(simd_lane_cnt, -1, dtype=np.int64)
+
+        # slots of in-flight instructions; a slot is reused once its instruction left every lane
+        slot_cnt = 2 * simd_lane_cnt + 1
+        self.slot_states = np.zeros(slot_cnt, dtype=np.int64)
+        self.slot_inst_regs = [None] * slot_cnt
+        self.slot_fed_cycles = np.full(slot_cnt, -slot_cnt, dtype=np.int64)
+        self.slot_by_inst = {}
+        self.next_slot = 0
+        self.feed_cnt = 0
+
+        # instruction states, as far as the ALU can tell them apart
+        self.state_ids = {}
+        self.state_inst_regs = []
+        self.state_skip = np.zeros(0, dtype=bool)
+        self.state_cycles = np.zeros(0, dtype=np.int64)
+
+        # per-lane ALU queues
+        self.queue_states = np.zeros((simd_lane_cnt, 1), dtype=np.int64)
+        self.queue_cycles = np.zeros((simd_lane_cnt, 1), dtype=np.int64)
+        self.queue_lens = np.zeros(simd_lane_cnt, dtype=np.int64)
+        self.queued_cnt = 0
+
+        self.retired = np.zeros((0, simd_lane_cnt), dtype=np.int64)
+
+    @property
+    def statistics(self):
+        if self.retired.any():
+            self.__add_retired_statistics()
+        return self._statistics
+
+    @statistics.setter
+    def statistics(self, value):
+        self._statistics = value
+
+    def cycle(self):
+        last_inst_reg = self.lane_inst_regs[-1]
+        if self.pipeline is not None and last_inst_reg is not None:
+            self.pipeline.add_to_profiler(last_inst_reg)
+
+        if self.queued_cnt > 0:
+            self.__retire()
+
+    def pull_inst_reg(self, prev_stage):
+        is_stalled = True
+        inst_reg = None
+        if prev_stage.is_idle():
+            inst_reg = prev_stage.output_inst_reg
+            prev_stage.output_inst_reg = None
+            is_stalled = False
+
+        self.input_inst_reg = inst_reg
+        self.lane_inst_regs.appendleft(inst_reg)
+        self.lane_slots[1:] = self.lane_slots[:-1]
+        self.lane_slots[0] = -1 if inst_reg is None else self.__slot(inst_reg)
+        self.feed_cnt += 1
+
+        lanes = np.flatnonzero(self.lane_slots >= 0)
+        if len(lanes) > 0:
+            states = self.slot_states[self.lane_slots[lanes]]
+            queued = ~self.state_skip[states]
+            if queued.any():
+                self.__enqueue(lanes[queued], states[queued])
+
+        return is_stalled
+
+    def is_idle(self):
+        return True
+
+    def _is_finish(self):
+        return self.queued_cnt == 0 and not (self.lane_slots >= 0).any()
+
+    def __slot(self, inst_reg):
+        slot = self.slot_by_inst.get(id(inst_reg))
+        if slot is None or self.slot_inst_regs[slot] is not inst_reg:
+            slot = self.next_slot
+            if self.feed_cnt - self.slot_fed_cycles[slot] < self.simd_lane_cnt:
+                slot = int(np.argmin(self.slot_fed_cycles))
+            self.next_slot = (slot + 1) % len(self.slot_inst_regs)
+
+            prev_inst_reg = self.slot_inst_regs[slot]
+            if prev_inst_reg is not None:
+                del self.slot_by_inst[id(prev_inst_reg)]
+            self.slot_inst_regs[slot] = inst_reg
+            self.slot_by_inst[id(inst_reg)] = slot
+
+        # the state after this cycle's AddressGeneration, which every lane holding it sees from now on
+        self.slot_states[slot] = self.__state(inst_reg)
+        self.slot_fed_cycles[slot] = self.feed_cnt
+        return slot
+
+    def __state(self, inst_reg):
+        bank_shuffling = inst_reg.opcode == 8 and inst_reg.function == 3 and inst_reg.src2_index_id == 1
+        key = (inst_reg.opcode, inst_reg.function, inst_reg.dst_ns_id, inst_reg.src1_ns_id, inst_reg.src2_ns_id,
+               inst_reg.src2_index_id == 1, inst_reg.first_permute, inst_reg.dest_bank if bank_shuffling else None)
+        state = self.state_ids.get(key)
+        if state is None:
+            state = len(self.state_inst_regs)
+            self.state_ids[key] = state
+            self.state_inst_regs.append(inst_reg.copy_instr())
+            self.state_skip = np.append(self.state_skip, should_skip_inst(inst_reg))
+            self.state_cycles = np.append(self.state_cycles, required_alu_cycles(inst_reg.opcode, inst_reg.function))
+            self.retired = np.vstack([self.retired, np.zeros((1, self.simd_lane_cnt), dtype=np.int64)])
+        return state
+
+    def __enqueue(self, lanes, states):
+        positions = self.queue_lens[lanes]
+        if positions.max() >= self.queue_states.shape[1]:
+            self.queue_states = np.hstack([self.queue_states, np.zeros_like(self.queue_states)])
+            self.queue_cycles = np.hstack([self.queue_cycles, np.zeros_like(self.queue_cycles)])
+
+        self.queue_states[lanes, positions] = states
+        self.queue_cycles[lanes, positions] = self.state_cycles[states]
+        self.queue_lens[lanes] += 1
+        self.queued_cnt += len(lanes)
+
+    def __retire(self):
+        # every queued instruction counts down; slots past a lane's queue length are ignored
+        self.queue_cycles -= 1
+        lanes = np.flatnonzero((self.queue_lens > 0) & (self.queue_cycles[:, 0] == 0))
+        if len(lanes) == 0:
+            return
+
+        states = self.queue_states[lanes, 0]
+        # a lane retires at most one instruction per cycle, so (state, lane) pairs are unique
+        self.retired[states, lanes] += 1
+        if self.queue_states.shape[1] > 1:
+            self.queue_states[lanes, :-1] = self.queue_states[lanes, 1:]
+            self.queue_cycles[lanes, :-1] = self.queue_cycles[lanes, 1:]
+        self.queue_lens[lanes] -= 1
+        self.queued_cnt -= len(lanes)
+
+    def __add_retired_statistics(self):
+        memory_access = self._statistics["memory-access"]
+        for state, lane in zip(*np.nonzero(self.retired)):
+            # retire one copy through the reference ALU and scale its accesses
+            access = new_statistics(self.simd_lane_cnt)
+            retire_inst(self.state_inst_regs[state].copy_instr(), int(lane), self.banked_memory,
+                        list(self.dest_bank_write_address), access)
+            retired_cnt = int(self.retired[state, lane])
+            for ns, lanes in access["memory-access"].items():
+                for idx, counters in lanes.items():
+                    for name, value in counters.items():
+                        if value != 0:
+                            memory_access[ns][idx][name] += value * retired_cnt
+        self.retired[:] = 0
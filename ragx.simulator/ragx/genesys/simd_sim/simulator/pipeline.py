@@ -1,23 +1,16 @@
 import copy
 import time
 import numpy as np
+from simd_sim.simulator.instruction import decode_instructions
 from simd_sim.simulator.instruction_fetch import InstructionFetch
 from simd_sim.simulator.decode import Decode
 from simd_sim.simulator.address_generation import AddressGeneration
 from simd_sim.simulator.alu import ALU
+from simd_sim.simulator.lockstep_alu import LockStepALU
 from tqdm import tqdm
 from simd_sim.simulator.config_parser import ConfigParser
 from simd_sim.simulator.single_base_loop_profiler import SingleBaseLoopProfiler
-
-
-def int_to_bin_str(inst):
-    """
-    :param inst:
-    A decimal number
-    :return:
-    A converted binary string
-    """
-    return f"{inst:032b}"
+from simd_sim.simulator.steady_state import SteadyStateDetector
 
 
 class Pipeline:
@@ -59,18 +52,32 @@ class Pipeline:
 
         self.instruction_fetch.address_generation = self.address_generation
 
-        for idx in range(self.simd_lane_cnt):
-            self.stages.append(ALU(self.simd_lane_cnt,
-                                   execution_idx=idx,
-                                   banked_memory=self.banked_memory,
-                                   dest_bank_write_address = self.dest_bank_write_address,
-                                   pipeline=self if idx == self.simd_lane_cnt-1 else None))
-
-        self.stage_cnt = len(self.stages)
+        # reference: one ALU stage per SIMD lane; lock-step: all lanes in a single numpy-backed stage
+        if config["alu-engine"] == "lock-step":
+            self.stages.append(LockStepALU(self.simd_lane_cnt,
+                                           banked_memory=self.banked_memory,
+                                           dest_bank_write_address=self.dest_bank_write_address,
+                                           pipeline=self))
+        elif config["alu-engine"] == "reference":
+            for idx in range(self.simd_lane_cnt):
+                self.stages.append(ALU(self.simd_lane_cnt,
+                                       execution_idx=idx,
+                                       banked_memory=self.banked_memory,
+                                       dest_bank_write_address = self.dest_bank_write_address,
+                                       pipeline=self if idx == self.simd_lane_cnt-1 else None))
+        else:
+            raise ValueError(f"invalid alu-engine: {config['alu-engine']}")
+
+        # pipeline depth in stages, counting one ALU per lane whichever engine models them
+        self.stage_cnt = 3 + self.simd_lane_cnt
 
         self.profiler = SingleBaseLoopProfiler(config=self.config)
         self.profiler.stage_cnt = self.stage_cnt
 
+        # extrapolates ALU loops once their iterations repeat; a window of 0 simulates every iteration
+        self.steady_state = SteadyStateDetector(config["steady-state-window"], pipeline=self)
+        self.instruction_fetch.steady_state = self.steady_state
+
     def run(self, inst_file_path):
         """
         Read instructions from a file path, and execute a pipeline cycle by cycle.
@@ -79,17 +86,12 @@ class Pipeline:
         :return:
         A summary dictionary consisting of simulated statistics
         """
-        inst_list = []
-
         with open(inst_file_path, 'r') as file:
-            for line in file:
-                inst_int = int(line.strip())
-                inst_bin_str = int_to_bin_str(inst_int)
-                inst_list.append(inst_bin_str)
+            inst_list = [int(line) for line in file if line.strip()]
 
+        # decode every instruction once; fetch then only indexes the decoded records by pc
         if len(inst_list) != 0:
-            self.stages[0].inst_list = inst_list
-            self.stages[0].pc_end = len(inst_list)
+            self.stages[0].load_program(decode_instructions(inst_list))
 
             inst = self.stages[0].inst_list[self.stages[0].pc]
             self.stages[0].feed_inst(inst)
@@ -103,7 +105,10 @@ class Pipeline:
 
         return self.__summary()
 
-    def start_alu_loop(self, instruction_cnt, iteration_cnt, is_nested):
+    def start_alu_loop(self, instruction_cnt, iteration_cnt, is_nested, is_permutation=False):
+        # permutations iterate inside decode, so only ALU loops can be extrapolated
+        self.steady_state.start_loop(can_extrapolate=not is_permutation)
+
         # instruction fetch
         self.instruction_fetch.start_loop(instruction_cnt=instruction_cnt,
                                           left_iteration_cnt=iteration_cnt-1,
@@ -259,13 +264,14 @@ class Pipeline:
                     "imm_write": 0
                 }
             },
-            "perTileSoftmax": stats[7]
-            
+            "perTileSoftmax": stats[7],
+            "steady-state": self.steady_state.summary()
         }
 
         mem_acc = summary["memory-access"]
 
-        for stage in self.stages:
+        # the detector holds the accesses of the iterations it skipped
+        for stage in self.stages + [self.steady_state]:
             stage_mem_acc = stage.statistics["memory-access"]
             for i in range(self.simd_lane_cnt):
                 mem_acc["obuf"][i]["read"] += stage_mem_acc["obuf"][i]["read"]
@@ -293,7 +299,7 @@ class Pipeline:
     def __handle_stall(self):
         is_stalled = False
 
-        for i in range(self.stage_cnt - 1, -1, -1):
+        for i in range(len(self.stages) - 1, -1, -1):
             ir = self.stages[i].input_inst_reg
             if ir is not None and ir.is_nop():
                 is_stalled = False
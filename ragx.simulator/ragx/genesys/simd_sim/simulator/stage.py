@@ -280,6 +280,27 @@ def execute(inst_reg, bank_idx, banked_memory, statistics):
         #raise ValueError(f"not implemented instruciton: opcode({opcode}), function({function})")
         pass
 
+def new_statistics(simd_lane_cnt):
+    """Zeroed per-stage statistics: cycles and per-lane memory accesses."""
+    statistics = {}
+    statistics['cycles'] = 0
+    statistics['memory-access'] = {}
+    statistics['memory-access']['obuf'] = {}
+    statistics['memory-access']['ibuf'] = {}
+    statistics['memory-access']['vmem1'] = {}
+    statistics['memory-access']['vmem2'] = {}
+    statistics['memory-access']['imm'] = {}
+    statistics['memory-access']['imm'][0] = {"read": 0, "write": 0}
+
+    for i in range (simd_lane_cnt):
+        statistics['memory-access']['obuf'][i] = {"read": 0}
+        statistics['memory-access']['ibuf'][i] = {"write": 0}
+        statistics['memory-access']['vmem1'][i] = {"computeRead": 0, "computeWrite": 0, "ldWrite": 0, "stRead": 0}
+        statistics['memory-access']['vmem2'][i] = {"computeRead": 0, "computeWrite": 0, "ldWrite": 0, "stRead": 0}
+
+    return statistics
+
+
 class Stage:
     def __init__(self, simd_lane_cnt):
         self.input_inst_reg = None
@@ -311,21 +332,7 @@ class Stage:
             }
         }
         '''
-        self.statistics = {}
-        self.statistics['cycles'] = 0
-        self.statistics['memory-access'] = {}
-        self.statistics['memory-access']['obuf'] = {}
-        self.statistics['memory-access']['ibuf'] = {}
-        self.statistics['memory-access']['vmem1'] = {}
-        self.statistics['memory-access']['vmem2'] = {}
-        self.statistics['memory-access']['imm'] = {}
-        self.statistics['memory-access']['imm'][0] = {"read": 0, "write": 0}
-
-        for i in range (simd_lane_cnt):
-            self.statistics['memory-access']['obuf'][i] = {"read": 0}
-            self.statistics['memory-access']['ibuf'][i] = {"write": 0}
-            self.statistics['memory-access']['vmem1'][i] = {"computeRead": 0, "computeWrite": 0, "ldWrite": 0, "stRead": 0}
-            self.statistics['memory-access']['vmem2'][i] = {"computeRead": 0, "computeWrite": 0, "ldWrite": 0, "stRead": 0}
+        self.statistics = new_statistics(simd_lane_cnt)
 
     def cycle(self):
         """
@@ -0,0 +1,136 @@
+import numpy as np
+from simd_sim.simulator.stage import new_statistics
+
+
+class SteadyStateDetector:
+    """
+    Extrapolates ALU loops once they reach a steady state.
+
+    Every iteration of an ALU loop (nested loops are flattened into one by Decode) is simulated
+    cycle by cycle until the per-iteration cycle delta has repeated for a window of K iterations
+    and two consecutive windows made the same memory accesses. The remaining iterations, but the
+    last, are then skipped: the pipeline clock, loop counters and memory accesses advance by whole
+    windows. The last iteration is simulated so the loop exits as before.
+
+    The error bound charges every skipped iteration with the spread of the per-iteration cycle
+    deltas observed in its loop after the first iteration; it is 0 for loops whose iterations
+    all took the same number of cycles.
+    """
+    def __init__(self, window, pipeline):
+        self.window = window
+        self.pipeline = pipeline
+        self.simd_lane_cnt = pipeline.simd_lane_cnt
+
+        # accesses of the skipped iterations, summed into the pipeline summary like a stage's
+        self.statistics = new_statistics(self.simd_lane_cnt)
+        self.access_keys = [(ns, lane, name)
+                            for ns, lanes in self.statistics["memory-access"].items()
+                            for lane, counters in lanes.items()
+                            for name in counters]
+
+        self.extrapolated_iterations = 0
+        self.extrapolated_cycles = 0
+        self.error_bound_cycles = 0
+
+        self.start_loop(can_extrapolate=False)
+
+    def start_loop(self, can_extrapolate):
+        self.can_extrapolate = can_extrapolate and self.window > 0
+        self.prev_cycle = None
+        self.delta = None
+        self.repeat_cnt = 0
+        self.min_delta = None
+        self.max_delta = None
+        self.is_first_delta = True
+        self.snapshots = []
+
+    def end_iteration(self):
+        """
+        Called by InstructionFetch whenever it jumps back to the loop start with iterations left.
+        """
+        if not self.can_extrapolate:
+            return
+
+        cycle = self.pipeline.global_cycle
+        if self.prev_cycle is not None:
+            delta = cycle - self.prev_cycle
+            if delta == self.delta:
+                self.repeat_cnt += 1
+            else:
+                self.delta = delta
+                self.repeat_cnt = 1
+                self.snapshots = []
+
+            # the first iteration also fills the pipeline, so it does not count towards the spread
+            if self.is_first_delta:
+                self.is_first_delta = False
+            else:
+                self.min_delta = delta if self.min_delta is None else min(self.min_delta, delta)
+                self.max_delta = delta if self.max_delta is None else max(self.max_delta, delta)
+        self.prev_cycle = cycle
+
+        # until the last lane holds a loop instruction, earlier instructions are still being profiled
+        if not self.__has_reached_last_lane():
+            self.snapshots = []
+            return
+
+        if self.repeat_cnt > 0 and self.repeat_cnt % self.window == 0:
+            self.snapshots.append(self.__access_counts())
+            if len(self.snapshots) >= 3:
+                prev_window = self.snapshots[-2] - self.snapshots[-3]
+                window = self.snapshots[-1] - self.snapshots[-2]
+                if np.array_equal(prev_window, window):
+                    self.__skip(window)
+                self.snapshots = self.snapshots[-2:]
+
+    def summary(self):
+        return {
+            "window": self.window,
+            "extrapolated-iterations": self.extrapolated_iterations,
+            "extrapolated-cycles": self.extrapolated_cycles,
+            "error-bound-cycles": self.error_bound_cycles,
+        }
+
+    def __has_reached_last_lane(self):
+        last_inst_reg = self.pipeline.profiler.prev_reg
+        if last_inst_reg is None or last_inst_reg.pc_idx is None:
+            return False
+        instruction_fetch = self.pipeline.instruction_fetch
+        loop_start = instruction_fetch.pc_loop_start
+        return loop_start <= last_inst_reg.pc_idx < loop_start + instruction_fetch.inst_cnt_per_loop
+
+    def __access_counts(self):
+        # memory accesses so far summed over stages, in access_keys order
+        counts = np.zeros(len(self.access_keys), dtype=np.int64)
+        for stage in self.pipeline.stages:
+            memory_access = stage.statistics["memory-access"]
+            counts += np.fromiter((memory_access[ns][lane][name] for ns, lane, name in self.access_keys),
+                                  dtype=np.int64, count=len(self.access_keys))
+        return counts
+
+    def __skip(self, window_access_counts):
+        instruction_fetch = self.pipeline.instruction_fetch
+
+        # keep the last iteration, so the loop exits through the cycle-accurate path
+        window_cnt = (instruction_fetch.left_redo_loop - 1) // self.window
+        if window_cnt <= 0:
+            return
+
+        iteration_cnt = window_cnt * self.window
+        cycles = iteration_cnt * self.delta
+
+        instruction_fetch.left_redo_loop -= iteration_cnt
+        # the (at most two) instructions between fetch and address generation get the addresses of
+        # the iterations after the skip, which changes neither cycles nor access counts
+        self.pipeline.address_generation.iteration_cnt += iteration_cnt * instruction_fetch.inst_cnt_per_loop
+        self.pipeline.global_cycle += cycles
+        self.prev_cycle += cycles
+
+        memory_access = self.statistics["memory-access"]
+        for (ns, lane, name), count in zip(self.access_keys, window_access_counts.tolist()):
+            if count != 0:
+                memory_access[ns][lane][name] += count * window_cnt
+
+        self.extrapolated_iterations += iteration_cnt
+        self.extrapolated_cycles += cycles
+        self.error_bound_cycles += iteration_cnt * (self.max_delta - self.min_delta)
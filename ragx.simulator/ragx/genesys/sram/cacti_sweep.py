@@ -1,8 +1,45 @@
 import subprocess
+import tempfile
+import fcntl
+import shutil
 import pandas
 import os
 import re
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+# Inputs the table is indexed on; a lookup that leaves one out gets the default config's value
+INDEX_COLUMNS = ('size (bytes)', 'block size (bytes)', 'read-write port', 'technology (u)')
+
+
+# Upper bound on the CACTI processes one simulator process runs at a time
+CACTI_JOBS = int(os.environ.get('CACTI_JOBS', os.cpu_count() or 1))
+_cacti_pool = None
+
+
+def _get_cacti_pool():
+    global _cacti_pool
+    if _cacti_pool is None:
+        _cacti_pool = ThreadPoolExecutor(max_workers=CACTI_JOBS, thread_name_prefix='cacti')
+    return _cacti_pool
+
+
+def _reset_cacti_pool():
+    # A forked child (e.g. a multiprocessing.Pool worker) does not inherit the pool's threads
+    global _cacti_pool
+    _cacti_pool = None
+
+
+os.register_at_fork(after_in_child=_reset_cacti_pool)
+
+
+def _normalize(value):
+    """Make a config value compare equal however it was written (4, 4.0, '4' or read back from the CSV)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
 
 class CactiSweep(object):
     def __init__(self, bin_file='./cacti/cacti', csv_file='cacti_sweep.csv', default_json='./default.json', default_dict=None):
@@ -10,7 +47,6 @@ class CactiSweep(object):
         self.bin_file = os.path.abspath(bin_file)
         self.csv_file = os.path.abspath(os.path.join(os.path.dirname(__file__), csv_file))
         self.default_dict = json.load(open(default_json))
-        self.cfg_file = os.path.join(os.path.dirname(bin_file), 'sweep.cfg')
         if default_dict is not None:
             self.default_dict.update(default_dict)
         if os.path.isfile(self.csv_file):
@@ -29,10 +65,51 @@ class CactiSweep(object):
             cols = self.default_dict.keys()
             cols.extend(output_dict.keys())
             self._df = pandas.DataFrame(columns=cols)
+        self._df = self._df.drop_duplicates(ignore_index=True)
+        self._build_index()
+
+    def update_csv(self, rows=()):
+        """
+        Merge this table and any new rows into the shared CSV.
+
+        Several simulations may share the CSV, so the merge holds an exclusive lock on
+        <csv>.lock, starts from the rows on disk (picking up what other processes added since
+        this table was loaded) and replaces the file atomically.
+        """
+        with open(self.csv_file + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            frames = [self._df, pandas.DataFrame(list(rows))]
+            if os.path.isfile(self.csv_file):
+                frames.insert(0, pandas.read_csv(self.csv_file))
+            self._df = self._dedupe(pandas.concat([frame for frame in frames if len(frame)] or [self._df],
+                                                  ignore_index=True))
+            self._build_index()
+            tmp_file = '{}.{}.tmp'.format(self.csv_file, os.getpid())
+            self._df.to_csv(tmp_file, index=False)
+            os.replace(tmp_file, self.csv_file)
+
+    def _dedupe(self, df):
+        """Drop repeated rows, including rows for the same config that differ only in how values are written."""
+        df = df.drop_duplicates(ignore_index=True)
+        if not set(INDEX_COLUMNS) <= set(df.columns):
+            return df
+        keys = pandas.Series([tuple(_normalize(value) for value in values)
+                              for values in zip(*(df[col] for col in INDEX_COLUMNS))], dtype=object)
+        return df[~keys.duplicated().values].reset_index(drop=True)
 
-    def update_csv(self):
-        self._df = self._df.drop_duplicates()
-        self._df.to_csv(self.csv_file, index=False)
+    def _index_key(self, index_dict):
+        """Index key of a lookup, or None if it filters on columns outside INDEX_COLUMNS."""
+        if not set(index_dict) <= set(INDEX_COLUMNS):
+            return None
+        return tuple(_normalize(index_dict.get(col, self.default_dict.get(col))) for col in INDEX_COLUMNS)
+
+    def _build_index(self):
+        """Map the index key of every row to its position; the first of several matching rows wins."""
+        self._index = {}
+        if not set(INDEX_COLUMNS) <= set(self._df.columns):
+            return
+        for position, values in enumerate(zip(*(self._df[col] for col in INDEX_COLUMNS))):
+            self._index.setdefault(tuple(_normalize(value) for value in values), position)
 
     def _create_cfg(self, cfg_dict, filename):
         with open(filename, 'w') as f:
@@ -64,27 +141,40 @@ class CactiSweep(object):
                     o = o.replace(')', '\)')
                     o = o.replace('^', '\^')
                     regex = r"{}\s*:\s*([\d\.]*)".format(o)
-                    m = re.match(regex, line)
+                    m = re.match(regex, line.decode("utf-8"))
                     if m:
                         parsed_results[key] = m.groups()[0]
         return parsed_results
 
-    def _run_cacti(self, index_dict):
+    def _run_cacti(self, index_dict, cfg_file):
         """
         Get data from cacti
         """
         cfg_dict = self.default_dict.copy()
         cfg_dict.update(index_dict)
-        self._create_cfg(cfg_dict, self.cfg_file)
-        args = ('./'+os.path.basename(self.bin_file), "-infile", os.path.basename(self.cfg_file))
+        self._create_cfg(cfg_dict, cfg_file)
+        # CACTI reads its technology files relative to its own directory
+        args = ('./'+os.path.basename(self.bin_file), "-infile", os.path.abspath(cfg_file))
         popen = subprocess.Popen(args, stdout=subprocess.PIPE, cwd=os.path.dirname(self.bin_file))
-        popen.wait()
-        output = popen.stdout
+        output = popen.communicate()[0].splitlines()
         cfg_dict.update(self._parse_cacti_output(output))
         return cfg_dict
 
+    def _run_cacti_in_dir(self, index_dict):
+        """Run CACTI for one config in its own temporary directory, so concurrent runs never share sweep.cfg."""
+        work_dir = tempfile.mkdtemp(prefix='cacti_')
+        try:
+            row_dict = index_dict.copy()
+            row_dict.update(self._run_cacti(index_dict, os.path.join(work_dir, 'sweep.cfg')))
+            return row_dict
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
     def locate(self, index_dict):
-        self._df = self._df.drop_duplicates()
+        key = self._index_key(index_dict)
+        if key is not None:
+            position = self._index.get(key)
+            return self._df.iloc[[] if position is None else [position]]
         data = self._df
         for key in index_dict:
             data = data.loc[data[key] == index_dict[key]]
@@ -93,15 +183,38 @@ class CactiSweep(object):
     def get_data(self, index_dict):
         data = self.locate(index_dict)
         if len(data) == 0:
-            print('No entry found, running cacti')
-            row_dict = index_dict.copy()
-            row_dict.update(self._run_cacti(index_dict))
-            self._df = self._df.append(pandas.DataFrame([row_dict]), ignore_index=True)
-            self.update_csv()
-            return self.locate(index_dict)
+            return self.get_data_batch([index_dict])[0]
         else:
             return data
 
+    def _missing(self, index_dicts):
+        missing = {}
+        for index_dict in index_dicts:
+            if len(self.locate(index_dict)) == 0:
+                key = self._index_key(index_dict) or tuple(sorted(index_dict.items()))
+                missing.setdefault(key, index_dict)
+        return list(missing.values())
+
+    def get_data_batch(self, index_dicts):
+        """
+        Look up a list of configs, running CACTI for all the missing ones at once.
+
+        Missing configs run on the shared pool of CACTI_JOBS workers, each in its own temporary
+        directory, and their results are merged into the CSV in a single locked write.
+        Returns one DataFrame per config, in the order given.
+        """
+        missing = self._missing(index_dicts)
+        if missing and os.path.isfile(self.csv_file):
+            # Another simulation may have run some of them since this table was loaded
+            self._df = self._dedupe(pandas.read_csv(self.csv_file))
+            self._build_index()
+            missing = self._missing(index_dicts)
+        if missing:
+            print('No entry found for {} configs, running cacti'.format(len(missing)))
+            rows = list(_get_cacti_pool().map(self._run_cacti_in_dir, missing))
+            self.update_csv(rows)
+        return [self.locate(index_dict) for index_dict in index_dicts]
+
     def get_data_clean(self, index_dict):
         data = self.get_data(index_dict)
         cols = [
@@ -131,47 +131,32 @@ class ibuf(buffer):
         # print("Load Cyce",  cycle)
         return(cycle)
         
-    def load(self, arr1DIndex):
+    def memLatency(self, ibufLoad, wbufLoad, bbufLoad):
+        """DDR cycles to fetch the input, weight and bias tiles that are flagged for loading."""
         _totMemLatency = 0
-        # to count how many times we are adding 
-        cnt = 0
-        #print ("initially time = ", _totMemLatency)
+        if ibufLoad:
+            _totMemLatency +=  self.updatedCycle(self.decoder.IBUFTileSize)
+        if wbufLoad:
+            _totMemLatency +=  self.updatedCycle(self.decoder.WBUFTileSize)
+        if bbufLoad:
+            _totMemLatency +=  self.updatedCycle(self.decoder.BBUFTileSize)
+        return _totMemLatency
 
+    def load(self, arr1DIndex):
         if self.decoder.ibufReuse[arr1DIndex] == 0:
             self.nextLoadTag = not self.loadTag
-            #print ("At IBUF 0 : ", not self.loadTag)
-            #print ("At IBUF 1: ", self.loadTag, self.nextLoadTag)
-            #print (f"ibuf tile size = {self.decoder.IBUFTileSize}")
             assert (self.nextLoadTag != self.compute.ibufComputeTag), "Load and Compute Tag cannot be same for IBUF!'"
-            _totMemLatency +=  self.updatedCycle(self.decoder.IBUFTileSize)
-            #print (f"ibuf: tile size {self.decoder.IBUFTileSize} time =  {_totMemLatency}")
-        else: 
-            _totMemLatency += 0
-        
+
         if self.decoder.wbufReuse[arr1DIndex] == 0:
             self.nextLoadTag = not self.loadTag
-            #print (f"wbuf tile size = {self.decoder.WBUFTileSize}")
-
             assert (self.nextLoadTag != self.compute.wbufComputeTag), "Load and Compute Tag cannot be same for WBUF!'"
-            _totMemLatency +=  self.updatedCycle(self.decoder.WBUFTileSize)
-            #print (f"wbuf: tile size {self.decoder.WBUFTileSize} time =  {_totMemLatency}")
 
-        
-        else: 
-            _totMemLatency += 0
-        
         if self.decoder.bbufReuse[arr1DIndex] == 0:
             self.nextLoadTag = not self.loadTag
-            #print (f"bbuf tile size = {self.decoder.BBUFTileSize}")
-
             assert (self.nextLoadTag != self.compute.bbufComputeTag), "Load and Compute Tag cannot be same for BBUF!'"
-            _totMemLatency +=  self.updatedCycle(self.decoder.BBUFTileSize)
-            #print (f"bbuf: tile size {self.decoder.BBUFTileSize} time =  {_totMemLatency}")
 
-        
-        else: 
-            _totMemLatency += 0
-        
+        _totMemLatency = self.memLatency(self.decoder.ibufReuse[arr1DIndex] == 0, self.decoder.wbufReuse[arr1DIndex] == 0,
+                                         self.decoder.bbufReuse[arr1DIndex] == 0)
         print ("Memroy load total Cycles = ", _totMemLatency, '\n')
 
         return math.ceil(_totMemLatency + self.intLatency)
@@ -180,6 +180,8 @@ class decoder():
             _data = json.load(f)
             self.infLatency = _data["infLatency"]
             self.freq = _data['frequency']
+            # closed-form (default), loop (per-tile reference) or validate (both, checked equal)
+            self.tileLoopMode = _data.get('tileLoopMode', 'closed-form')
             self.IBUFinfBandwidth = _data["IBUFinfBandwidth"] 
             self.IBUFinfFrequency = _data["ddr_frequency Mhz"] 
             self.IBUFperAccessReadEnergy = _data["IBUFperAccessReadEnergy"]
@@ -225,6 +225,8 @@ class decoderGemm():
             _data = json.load(f)
             self.infLatency = _data["infLatency"]
             self.freq = _data['frequency']
+            # closed-form (default), loop (per-tile reference) or validate (both, checked equal)
+            self.tileLoopMode = _data.get('tileLoopMode', 'closed-form')
             self.IBUFinfBandwidth = self.infBandwidth
             self.IBUFinfFrequency = _data["ddr_frequency Mhz"] 
             self.IBUFperAccessReadEnergy = _data["IBUFperAccessReadEnergy"]
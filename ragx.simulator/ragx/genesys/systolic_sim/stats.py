@@ -1,8 +1,9 @@
 import csv
 import os
 from sys import *
+from systolic_sim.utils import LazyPerTileCycles
 
-class stats:
+class stats(LazyPerTileCycles):
     def __init__(self, config) -> None:
         # compiler params
         self.layerName = config.layerName
@@ -76,7 +77,7 @@ class stats:
             writer.writerow(row)
         f.close()
 
-    def getStat(self):
+    def getStat(self, perTileCycles = True):
         '''
         _ = self.log.append([self.layerName, self.freq, self.totalCycles, self.memBandwidth, self.memLatency, \
                 self.arrayN, self.arrayM, self.ibufDepth, self.obufDepth, self.wbufDepth, \
@@ -109,7 +110,8 @@ class stats:
                  self.perTileIbufUtil, self.perTileObufUtil, \
                  self.perTileWbufUtil, self.perTileBbufUtil, self.perTileComputeUtils, self.weightLoadCycles]
 
-        return temp, self.perTileCycles
+        ## perTileCycles can be large; callers that only need the totals skip materializing it
+        return temp, self.perTileCycles if perTileCycles else None
 
     def printStats(self):
         self.getStat()
@@ -1,4 +1,6 @@
+import copy
 from math import ceil
+import numpy as np
 from systolic_sim.buffer import *
 from systolic_sim.compute import *
 from systolic_sim.computeGemm import *
@@ -91,6 +93,64 @@ class systolic_sim:
         self.compute.updateTags(_arr1DIndex) 
         self.obuf.updateStoreTag(_prevArr1DIndex)
 
+    def cycleTiles(self, indices):
+        """
+        Closed-form equivalent of the compute-tile loop, for the tiles' 1D indices in loop order.
+
+        After the first, computeTile's cost for a tile depends only on its position in the loop
+        (first, second to last, draining) and on the reuse flags of the tile it prefetches (index + 1)
+        and of the tile it writes back (the previous one). Tiles are grouped by that key, each
+        group is costed once, and the totals are group costs times group sizes. The one-off
+        initial load still goes through computeTile.
+        """
+        numTiles = self.decoder.numComputeTiles
+        self.computeTile(0, 0, -1)
+
+        # The final drain (iteration numTiles) writes back the last compute tile
+        indices = np.append(np.asarray(indices, dtype=int), 0)
+        prevIndices = np.concatenate(([0], indices[:-1]))
+        iters = np.arange(len(indices))
+        iters[-1] = numTiles
+        # 0: first, 1: second to last, 2: draining, 3: any other tile, in computeTile's branch order
+        position = np.where(iters == 0, 0, np.where(iters == numTiles - 1, 1, np.where(iters == numTiles, 2, 3)))
+        loads = (position == 0) | (position == 3)
+        stores = position != 0
+
+        flags = np.zeros((len(indices), 4), dtype=int)
+        for col, reuse in enumerate([self.decoder.ibufReuse, self.decoder.wbufReuse, self.decoder.bbufReuse]):
+            flags[loads, col] = np.asarray(reuse)[indices[loads] + 1] == 0
+        flags[stores, 3] = np.asarray(self.decoder.obufReuse)[prevIndices[stores]] == 0
+        keys = position * 16 + flags @ np.array([8, 4, 2, 1])
+        classKeys, tileClasses, counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+        _computeCycles = self.compute.getComputeCycles()
+        _obufStoreCycles = self.obuf.cycle() + self.obuf.intLatency
+        classCycles, classComputeCycles = [], []
+        for key in classKeys.tolist():
+            _position, ibufLoad, wbufLoad, bbufLoad, obufStore = key // 16, key & 8, key & 4, key & 2, key & 1
+            _ibufLoadCycles = ceil(self.ibuf.memLatency(ibufLoad, wbufLoad, bbufLoad) + self.ibuf.intLatency)
+            _storeCycles = _obufStoreCycles if obufStore else 0
+            if _position == 0:
+                classCycles.append(max(_computeCycles, _ibufLoadCycles))
+            elif _position == 1:
+                classCycles.append(max(_computeCycles, _storeCycles))
+            elif _position == 2:
+                classCycles.append(_storeCycles)
+            else:
+                classCycles.append(max(_computeCycles, _ibufLoadCycles + _storeCycles))
+            classComputeCycles.append(0 if _position == 2 else _computeCycles)
+
+        if np.any(position == 0):
+            self.stats.perTileComputeCycle = _computeCycles
+        drains = np.flatnonzero(position == 2)
+        if len(drains):
+            self.stats.outputStoreCycles = classCycles[tileClasses[drains[-1]]]
+        self.stats.deferPerTileCycles(classCycles, tileClasses)
+        self.stats.totalCycles = repeatedSum(self.stats.totalCycles, [ceil(c) for c in classCycles], counts, tileClasses)
+        self.stats.computeCycles = repeatedSum(self.stats.computeCycles, classComputeCycles, counts, tileClasses)
+        # getComputeCycles() also keeps a running total, once per tile that computes
+        self.compute.totalComputeCycles += _computeCycles * (int(np.count_nonzero(position != 2)) - 1)
+
     def getUtilization(self):
         self.stats.perTileIbufUtil = self.ibuf.bankUtilization
         self.stats.perTileObufUtil = self.obuf.bankUtilization
@@ -108,6 +168,12 @@ class systolic_sim:
                                     self.stats.wbufTotalEnergy + self.stats.bbufTotalEnergy
 
     def cycleConv(self):
+        ## The fused path only needs the first tile's stats, so it always walks the loop
+        if self.fusedLayer is True or self.decoder.tileLoopMode == 'loop':
+            return self.cycleConvLoop()
+        self.cycleClosedForm(convTileIndices(self.decoder.tileDims), systolic_sim.cycleConvLoop)
+
+    def cycleConvLoop(self):
         _iterCount = 0
         _prevArr1DIndex = 0
         self.computeTile(0,_prevArr1DIndex, -1)
@@ -145,6 +211,22 @@ class systolic_sim:
         self.getEnergy()
     
     def cycleGemm(self):
+        ## The fused path only needs the first tile's stats, so it always walks the loop
+        if self.fusedLayer is True or self.decoder.tileLoopMode == 'loop':
+            return self.cycleGemmLoop()
+        self.cycleClosedForm(gemmTileIndices(self.decoder.tileDims), systolic_sim.cycleGemmLoop)
+
+    def cycleClosedForm(self, indices, loop):
+        reference = copy.deepcopy(self) if self.decoder.tileLoopMode == 'validate' else None
+        self.cycleTiles(indices)
+        self.stats.totalCycles += self.decoderCycles
+        self.getUtilization()
+        self.getEnergy()
+        if reference is not None:
+            loop(reference)
+            validateTileLoop(self.stats, reference.stats, TILE_LOOP_STATS)
+
+    def cycleGemmLoop(self):
         _iterCount = 0
         _prevArr1DIndex = 0
         self.computeTile(0,_prevArr1DIndex, -1)
@@ -192,8 +274,8 @@ class systolic_sim:
         
     def printStats(self):
         self.stats.printStats()
-    def getStats(self):
-        return self.stats.getStat()
+    def getStats(self, perTileCycles = True):
+        return self.stats.getStat(perTileCycles)
 
 class main():
     def __init__(self, testDir) -> None:        
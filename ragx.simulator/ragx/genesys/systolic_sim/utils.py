@@ -2,12 +2,17 @@ import os
 import glob
 import math
 import fnmatch
+import numpy as np
 
 dimMapping = { 0: 'OC', 1: 'N', 2: 'IC', 3: 'KH', 4: 'KW', 5: 'OH', 6: 'OW' }
 gemm4dDimMapping = { 0: 'B', 1: 'C', 2: 'M', 3: 'N', 4: 'P' }
 gemmDimMapping = {0: 'M', 1: 'N', 2: 'P' }
 matmulMapping = {0: 'B', 1: 'M', 2: 'N', 3: 'P' }
 
+# systolic_sim stats that the tile loop produces
+TILE_LOOP_STATS = ['totalCycles', 'computeCycles', 'perTileComputeCycle', 'inputLoadCycles',
+                   'outputStoreCycles', 'perTileCycles', 'totalEnergy']
+
 testPath = ''
 def get1DIndex(a, b, c, d, bSize, cSize, dSize):
     _dim4_index = d + (c * dSize) + (b * cSize * dSize) + (a * bSize * cSize * dSize)
@@ -17,6 +22,63 @@ def get5Dto1DIndex(e, a, b, c, d, aSize, bSize, cSize, dSize):
     _dim5_index = d + (c * dSize) + (b * cSize * dSize) + (a * bSize * cSize * dSize) + (e * bSize * cSize * dSize * aSize)
     return _dim5_index
 
+def gemmTileIndices(tileDims):
+    """1D index (get5Dto1DIndex) of every GEMM compute tile, in B x C x M x N x P loop order."""
+    b, c, m, n, p = np.ix_(*(np.arange(tileDims[dim]) for dim in ('B', 'C', 'M', 'N', 'P')))
+    return get5Dto1DIndex(p, n, m, c, b, tileDims['N'], tileDims['M'], tileDims['C'], tileDims['B']).ravel()
+
+def convTileIndices(tileDims):
+    """1D index (get1DIndex) of every conv compute tile, in OC x N x IC x KH x KW x OH x OW loop order."""
+    oc, n, ic, kh, kw, oh, ow = np.ix_(*(np.arange(tileDims[dim]) for dim in ('OC', 'N', 'IC', 'KH', 'KW', 'OH', 'OW')))
+    index = get1DIndex(oc, ic, oh, ow, tileDims['IC'], tileDims['OH'], tileDims['OW'])
+    return np.broadcast_to(index, tuple(tileDims[dim] for dim in ('OC', 'N', 'IC', 'KH', 'KW', 'OH', 'OW'))).ravel()
+
+class LazyPerTileCycles:
+    """
+    perTileCycles that the closed-form tile evaluation only expands into a list when it is read.
+
+    The per-tile loop appends to perTileCycles as before; cycleTiles records each run as its class
+    cycles plus the class of every tile (deferPerTileCycles), which costs one small int per tile.
+    """
+    _perTileCycles = None
+    _pendingTileCycles = ()
+
+    @property
+    def perTileCycles(self):
+        if self._pendingTileCycles:
+            for classCycles, tileClasses in self._pendingTileCycles:
+                self._perTileCycles.extend(np.array(classCycles, dtype=object)[tileClasses].tolist())
+            self._pendingTileCycles = ()
+        return self._perTileCycles
+
+    @perTileCycles.setter
+    def perTileCycles(self, value):
+        self._perTileCycles = value
+        self._pendingTileCycles = ()
+
+    def deferPerTileCycles(self, classCycles, tileClasses):
+        # Rebind rather than append, so shallow copies taken earlier keep their own pending list
+        self._pendingTileCycles = self._pendingTileCycles + ((list(classCycles), tileClasses),)
+
+def repeatedSum(start, classValues, classCounts, tileClasses):
+    """
+    Value of start after adding classValues[tileClasses[i]] for every tile i in order.
+
+    Each class is added with a single multiplication when every value is integral, which is exact;
+    otherwise the values are added tile by tile (in C) so float rounding matches a per-tile loop.
+    """
+    if all(float(v).is_integer() for v in classValues) and float(start).is_integer():
+        return start + sum(v * int(count) for v, count in zip(classValues, classCounts))
+    perTile = np.asarray(classValues, dtype=float)[tileClasses]
+    return np.add.accumulate(np.concatenate(([start], perTile)))[-1].item()
+
+def validateTileLoop(closedForm, loop, fields):
+    """Raise if the closed-form tile evaluation and the per-tile loop disagree on any of fields."""
+    mismatches = [f"{field}: {getattr(closedForm, field)!r} != {getattr(loop, field)!r}"
+                  for field in fields if getattr(closedForm, field) != getattr(loop, field)]
+    if mismatches:
+        raise AssertionError("Closed-form tile cycles differ from the per-tile loop: " + "; ".join(mismatches))
+
 def findFile(dirPath, searchStr):  
     for file in glob.glob(os.path.join(dirPath, searchStr)):
         return file
@@ -45,7 +45,7 @@ class Interconnect:
         """All-reduce operation with different algorithms."""
         comm_time = self.calculate_ring_all_reduce(data_size) if algorithm == 'ring' else self.calculate_tree_all_reduce(data_size)
         self.update_stats("all_reduce", comm_time, data_size)
-        self.logger.stats(f"All-reduce ({algorithm}) completed with communication time {comm_time} µs.")
+        self.logger.stats("All-reduce (%s) completed with communication time %s µs.", algorithm, comm_time)
         return comm_time
 
     def calculate_ring_all_reduce(self, data_size):
@@ -60,42 +60,42 @@ class Interconnect:
         """Scatter operation."""
         comm_time = self.calculate_comm_time(data_size / self.num_accelerators) * (self.num_accelerators - 1)
         self.update_stats("scatter", comm_time, data_size)
-        self.logger.stats(f"Scatter completed with communication time {comm_time} µs.")
+        self.logger.stats("Scatter completed with communication time %s µs.", comm_time)
         return comm_time
 
     def broadcast(self, source_id, data_size):
         """Broadcast operation."""
         comm_time = self.calculate_comm_time(data_size) * (self.num_accelerators - 1)
         self.update_stats("broadcast", comm_time, data_size)
-        self.logger.stats(f"Broadcast completed with communication time {comm_time} µs.")
+        self.logger.stats("Broadcast completed with communication time %s µs.", comm_time)
         return comm_time
 
     def gather(self, target_id, data_size):
         """Gather operation."""
         comm_time = self.calculate_comm_time(data_size / self.num_accelerators) * (self.num_accelerators - 1)
         self.update_stats("gather", comm_time, data_size)
-        self.logger.stats(f"Gather completed with communication time {comm_time} µs.")
+        self.logger.stats("Gather completed with communication time %s µs.", comm_time)
         return comm_time
 
     def point_to_point(self, src_id, dst_id, data_size):
         """Point-to-point communication."""
         comm_time = self.calculate_comm_time(data_size)
         self.update_stats("point_to_point", comm_time, data_size)
-        self.logger.stats(f"Point-to-point from {src_id} to {dst_id} completed in {comm_time} µs.")
+        self.logger.stats("Point-to-point from %s to %s completed in %s µs.", src_id, dst_id, comm_time)
         return comm_time
 
     def reduce_scatter(self, data_size, algorithm='ring'):
         """Reduce-scatter operation."""
         comm_time = self.calculate_ring_all_reduce(data_size) if algorithm == 'ring' else self.calculate_tree_all_reduce(data_size)
         self.update_stats("reduce_scatter", comm_time, data_size)
-        self.logger.stats(f"Reduce-Scatter ({algorithm}) completed with communication time {comm_time} µs.")
+        self.logger.stats("Reduce-Scatter (%s) completed with communication time %s µs.", algorithm, comm_time)
         return comm_time
 
     def all_gather(self, data_size, algorithm='ring'):
         """All-gather operation."""
         comm_time = self.calculate_ring_all_gather(data_size) if algorithm == 'ring' else self.calculate_tree_all_gather(data_size)
         self.update_stats("all_gather", comm_time, data_size)
-        self.logger.stats(f"All-gather ({algorithm}) completed with communication time {comm_time} µs.")
+        self.logger.stats("All-gather (%s) completed with communication time %s µs.", algorithm, comm_time)
         return comm_time
 
     def calculate_ring_all_gather(self, data_size):
@@ -28,7 +28,14 @@ class MemoryUnit:
         self.register_write_energy = 0.5
         self.scratchpads = []
 
+        # Per-scratchpad SRAM costs, indexed like self.scratchpads and filled by initialize_scratchpads
+        self.sram_read_energy = []
+        self.sram_write_energy = []
+        self.sram_leak_power = []
+        self.sram_area = []
+
     def initialize_scratchpads(self, scratchpad_configs):
+        """Set up the scratchpads and resolve their SRAM costs once, so accesses are plain arithmetic."""
         self.scratchpads = []
         for config in scratchpad_configs:
             scratchpad = {
@@ -38,16 +45,26 @@ class MemoryUnit:
                 "data_width": config.get("data_width", 32),
             }
             self.scratchpads.append(scratchpad)
+
+        # Run CACTI once, in parallel, for every geometry not in the sweep table yet
+        self.sram_obj.get_data_batch([self.get_sram_config(scratchpad) for scratchpad in self.scratchpads])
+        sram_costs = [self.get_sram_energy_costs(scratchpad) for scratchpad in self.scratchpads]
+        self.sram_read_energy = [cost[0] for cost in sram_costs]
+        self.sram_write_energy = [cost[1] for cost in sram_costs]
+        self.sram_leak_power = [cost[2] for cost in sram_costs]
+        self.sram_area = [cost[3] for cost in sram_costs]
         return self.scratchpads
 
-    def get_sram_energy_costs(self, scratchpad):
+    def get_sram_config(self, scratchpad):
         total_sram_size = scratchpad['banks'] * scratchpad['bank_depth'] * scratchpad['data_width'] // 8
-        cfg_dict = {
+        return {
             'size (bytes)': total_sram_size,
             'block size (bytes)': scratchpad['data_width'] // 8,
             'read-write port': 1
         }
-        sram_data = self.sram_obj.get_data_clean(cfg_dict)
+
+    def get_sram_energy_costs(self, scratchpad):
+        sram_data = self.sram_obj.get_data_clean(self.get_sram_config(scratchpad))
 
         # Use .iloc[0] to extract the single value from the Series
         read_energy = float(sram_data['read_energy_nJ'].iloc[0]) / (scratchpad['data_width'] // 8)
@@ -58,16 +75,14 @@ class MemoryUnit:
         return read_energy, write_energy, leak_power, area
 
 
-    def compute_read_energy(self, scratchpad, num_accesses):
-        read_energy, _, _, _ = self.get_sram_energy_costs(scratchpad)
-        total_read_energy = num_accesses * read_energy
+    def compute_read_energy(self, scratchpad_index, num_accesses):
+        total_read_energy = num_accesses * self.sram_read_energy[scratchpad_index]
 
         # self.stats.update_energy("read_energy", total_read_energy)
         return num_accesses, total_read_energy
 
-    def compute_write_energy(self, scratchpad, num_accesses):
-        _, write_energy, _, _ = self.get_sram_energy_costs(scratchpad)
-        total_write_energy = num_accesses * write_energy
+    def compute_write_energy(self, scratchpad_index, num_accesses):
+        total_write_energy = num_accesses * self.sram_write_energy[scratchpad_index]
 
         self.stats.update_energy("write_energy", total_write_energy)
         return num_accesses, total_write_energy
@@ -92,15 +107,14 @@ class MemoryUnit:
         num_tiles = ceil(data_size / scratchpad['size'])
 
         dram_reads, _, dram_read_energy = self.dram_read_energy(num_tiles, scratchpad['size'])
-        scratchpad_reads, scratchpad_read_energy = self.compute_read_energy(scratchpad, num_accesses)
+        scratchpad_reads, scratchpad_read_energy = self.compute_read_energy(scratchpad_index, num_accesses)
 
         total_energy = dram_read_energy + scratchpad_read_energy
         # self.stats.update_memory_cycles("DRAM_to_executor", dram_reads)
         # self.stats.update_energy("load_to_scratchpad", total_energy)
 
-        self.logger.info(f"Loaded {data_size} bytes from DRAM to Scratchpad {scratchpad_index}: "
-                         f"{dram_reads} DRAM reads, {num_accesses} Scratchpad reads, "
-                         f"Total energy: {total_energy} nJ.")
+        self.logger.debug("Loaded %s bytes from DRAM to Scratchpad %s: %s DRAM reads, %s Scratchpad reads, "
+                          "Total energy: %s nJ.", data_size, scratchpad_index, dram_reads, num_accesses, total_energy)
 
         return total_energy
 
@@ -109,16 +123,15 @@ class MemoryUnit:
         num_accesses = ceil(data_size / (scratchpad['data_width'] // 8))
         num_tiles = ceil(data_size / scratchpad['size'])
 
-        scratchpad_writes, scratchpad_write_energy = self.compute_write_energy(scratchpad, num_accesses)
+        scratchpad_writes, scratchpad_write_energy = self.compute_write_energy(scratchpad_index, num_accesses)
         dram_writes, _, dram_write_energy = self.dram_write_energy(num_tiles, scratchpad['size'])
 
         total_energy = scratchpad_write_energy + dram_write_energy
         self.stats.update_memory_cycles("executor_to_DRAM", dram_writes)
         self.stats.update_energy("store_to_dram", total_energy)
 
-        self.logger.info(f"Stored {data_size} bytes from Scratchpad {scratchpad_index} to DRAM: "
-                         f"{num_accesses} Scratchpad writes, {dram_writes} DRAM writes, "
-                         f"Total energy: {total_energy} nJ.")
+        self.logger.debug("Stored %s bytes from Scratchpad %s to DRAM: %s Scratchpad writes, %s DRAM writes, "
+                          "Total energy: %s nJ.", data_size, scratchpad_index, num_accesses, dram_writes, total_energy)
 
         return total_energy
 
@@ -127,15 +140,15 @@ class MemoryUnit:
         dest_scratchpad = self.scratchpads[dest_index]
 
         num_accesses = ceil(data_size / (src_scratchpad['data_width'] // 8))
-        scratchpad_reads, scratchpad_read_energy = self.compute_read_energy(src_scratchpad, num_accesses)
-        scratchpad_writes, scratchpad_write_energy = self.compute_write_energy(dest_scratchpad, num_accesses)
+        scratchpad_reads, scratchpad_read_energy = self.compute_read_energy(src_index, num_accesses)
+        scratchpad_writes, scratchpad_write_energy = self.compute_write_energy(dest_index, num_accesses)
 
         total_energy = scratchpad_read_energy + scratchpad_write_energy
         self.stats.update_energy("scratchpad_transfer", total_energy)
 
-        self.logger.info(f"Transferred {data_size} bytes from Scratchpad {src_index} to Scratchpad {dest_index}: "
-                         f"{scratchpad_reads} Scratchpad reads, {scratchpad_writes} Scratchpad writes, "
-                         f"Total energy: {total_energy} nJ.")
+        self.logger.debug("Transferred %s bytes from Scratchpad %s to Scratchpad %s: %s Scratchpad reads, "
+                          "%s Scratchpad writes, Total energy: %s nJ.",
+                          data_size, src_index, dest_index, scratchpad_reads, scratchpad_writes, total_energy)
 
         return total_energy
 
@@ -145,8 +158,8 @@ class MemoryUnit:
         total_energy = num_accesses * register_read_energy
 
         self.stats.record_memory_transfer("register_file_to_executor", num_accesses, total_energy)
-        self.logger.info(f"Loaded {data_size} bytes from Register File: {num_accesses} reads, "
-                         f"Total energy: {total_energy} nJ.")
+        self.logger.debug("Loaded %s bytes from Register File: %s reads, Total energy: %s nJ.",
+                          data_size, num_accesses, total_energy)
 
         return total_energy
 
@@ -156,8 +169,8 @@ class MemoryUnit:
         total_energy = num_accesses * register_write_energy
 
         self.stats.record_memory_transfer("executor_to_register_file", num_accesses, total_energy)
-        self.logger.info(f"Stored {data_size} bytes to Register File: {num_accesses} writes, "
-                         f"Total energy: {total_energy} nJ.")
+        self.logger.debug("Stored %s bytes to Register File: %s writes, Total energy: %s nJ.",
+                          data_size, num_accesses, total_energy)
 
         return total_energy
 
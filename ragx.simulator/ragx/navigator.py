@@ -1,45 +1,56 @@
 class Navigator:
     """Navigator is responsible for fetching data and activating tasks in the pipeline."""
-    def __init__(self, env, memory_unit, distributor, config, logger):
+    def __init__(self, env, memory_unit, distributor, config, logger, nvme, read_time_us):
         self.env = env
         self.memory_unit = memory_unit
         self.distributor = distributor
         self.config = config
         self.logger = logger
-        self.pending_tasks = []
+        self.nvme = nvme  # the accelerator's NVMe device; its capacity is the number of outstanding reads
+        self.read_time_us = read_time_us
+        self.busy_time = 0
+        self.intervals = []  # (start, end) of every read, in us
+        self.scratchpad_energy = 0
+        self.discarded_energy = 0  # scratchpad energy of reads no kernel used
+
+    def submit(self, data_request):
+        """Start fetching a request's data; returns the event fired once its task has executed."""
+        data_request.setdefault('done', self.env.event())
+        self.env.process(self.fetch_data(data_request))
+        return data_request['done']
 
     def fetch_data(self, data_request):
-        """Fetches data from memory and sends it to the distributor."""
+        """Fetches data from NVMe into a scratchpad and sends it to the distributor."""
+        if self.has_dependency(data_request):
+            yield self.env.all_of(data_request['depends_on'])
+
         data_size = data_request['size']
-        
-        # Load data from DRAM to scratchpad (SimPy)
-        yield self.env.process(self.memory_unit.load_from_dram_to_scratchpad(data_size))
-        
+        read_time = data_request['read_time'] if 'read_time' in data_request else self.read_time_us(data_size)
+        with self.nvme.request() as request:
+            yield request
+            start = self.env.now
+            yield self.env.timeout(read_time)
+        self.busy_time += read_time
+        self.intervals.append((start, self.env.now))
+
+        # Stage the data in the scratchpad
+        energy = self.memory_unit.load_from_dram_to_scratchpad(data_request.get('scratchpad_index', 0), data_size)
+        self.scratchpad_energy += energy
+        if data_request.get('kernel') is None:
+            # Nothing runs on the data (e.g. a speculative read that guessed wrong)
+            self.discarded_energy += energy
+            data_request['done'].succeed()
+            return
+
         # Send the data to the distributor to schedule on backend
         self.distributor.enqueue_task(data_request)
-        self.logger.info(f"Navigator fetched data of size {data_size} and sent to distributor.")
+        self.logger.debug("Navigator fetched data of size %s and sent to distributor.", data_size)
 
     def manage_data_flow(self, data_requests):
-        """Manages multiple data fetching tasks. Can overlap if there are no dependencies."""
-        processes = []
-        
-        for request in data_requests:
-            if not self.has_dependency(request):
-                process = self.env.process(self.fetch_data(request))
-                processes.append(process)
-            else:
-                # Add to pending if there is a dependency
-                self.pending_tasks.append(request)
-
-        yield self.env.all_of(processes)  # Wait for all non-dependent tasks to complete
+        """Manages multiple data fetching tasks. Requests overlap unless they depend on each other."""
+        done = [self.submit(request) for request in data_requests]
+        yield self.env.all_of(done)  # Wait for all tasks to complete
 
-    def resolve_dependencies(self):
-        """Resolve dependencies and activate any tasks that were stalled."""
-        for task in list(self.pending_tasks):
-            if not self.has_dependency(task):
-                self.pending_tasks.remove(task)
-                self.env.process(self.fetch_data(task))
-                
     def has_dependency(self, data_request):
-        """Check if a data request has a dependency."""
-        return 'depends_on' in data_request and not data_request['depends_on'].triggered
+        """Check if a data request has an unfinished dependency."""
+        return any(not event.triggered for event in data_request.get('depends_on', []))
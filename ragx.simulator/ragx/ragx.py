@@ -3,10 +3,9 @@ from ragx.systolicexecutor import SystolicExecutor
 from ragx.vectorexecutor import VectorExecutor
 from ragx.scalarexecutor import ScalarExecutor
 from ragx.interconnect import Interconnect
-from config.select_kernel import select_kernel
+from config.select_kernel import resolve_kernels
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Setting up custom logging levels
@@ -28,15 +27,13 @@ def system(self, message, *args, **kwargs):
 logging.Logger.stats = stats
 logging.Logger.system = system
 
-# Configure the base logging level and format globally
-# logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
-logging.basicConfig(level=STATS_LEVEL_NUM, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
+# The base logging level and format are configured by the entry point (eurekastore.configure_logging)
 
 # Function to create a customized logger for each component
 def get_component_logger(component_name):
     # Create a specific logger for the component
     logger = logging.getLogger(component_name)
-    logger.setLevel(logging.DEBUG)  # Set to desired level for this component
+    logger.setLevel(logging.INFO)  # Set to desired level for this component
 
     # Define a custom formatter for this component
     formatter = logging.Formatter(f'%(asctime)s - {component_name} - %(levelname)s - %(message)s')
@@ -66,6 +63,9 @@ class RAGXAccelerator:
         self.config = config
         self.logger = logger
 
+        # Resolve every kernel this config can reach once, failing fast on missing directories
+        self.kernels = resolve_kernels(config)
+
         dram_cost = config.get('dram_cost', 1e-9)
         self.memory_unit = MemoryUnit(dram_cost, config, memory_logger, stats)
         self.systolic_executor = SystolicExecutor(config, systolic_logger, stats)
@@ -102,7 +102,7 @@ class RAGXAccelerator:
         elif task_type in ["reduce"]:
             if neighbors is None:
                 raise ValueError("Reduction requires neighbors.")
-            print (f"Executing reduction for num_dimensions - {num_dimensions}")
+            self.logger.debug("Executing reduction for num_dimensions - %s", num_dimensions)
             return self.perform_reduce(num_dimensions)
 
         elif task_type in ["all_reduce"]:
@@ -120,19 +120,17 @@ class RAGXAccelerator:
         else:
             raise ValueError(f"Unsupported task type: {task_type}")
 
-        print (f"Task '{task_type}' executed for node {node}.")
-        self.logger.info(f"Task '{task_type}' executed for node {node}.")
+        self.logger.debug("Task '%s' executed for node %s.", task_type, node)
 
     def embed_query(self, query_size, scratchpad_index):
         """Handles the query embedding using systolic array with different embedding kernels."""
-        self.logger.info(f"Embedding query using systolic array.")
+        self.logger.info("Embedding query using systolic array.")
         # data_size = query_size
         # self.load_data_from_dram(scratchpad_index, data_size)
 
         # kernel = self.config['kernels']['embedding']
-        kernel, kernel_path = select_kernel(self.config, "embedding", self.config['benchmark'], self.config['dataset_size'],\
-                                             self.config['query']['batch_size'], self.config['execution_mode']['parallelism'], base_path=self.config['kernels']['base_directory'])
-        
+        kernel, kernel_path = self.kernels['embedding']
+
         dimensions = self.config['query']['dimensions']
         batch_size = self.config['query']['batch_size']
         
@@ -155,11 +153,11 @@ class RAGXAccelerator:
         cores_per_processor = self.config['vector_processor']['num_lanes']
 
         docs_per_processor = (num_docs + vector_processors - 1) // vector_processors
-        self.logger.info(f"Executing scoring for {num_docs} documents; {num_dimensions} dimensions, {docs_per_processor} documents per processor.")
+        self.logger.debug("Executing scoring for %d documents; %s dimensions, %d documents per processor.",
+                          num_docs, num_dimensions, docs_per_processor)
 
         # Selecting the appropriate kernel based on the configuration
-        kernel, kernel_path = select_kernel(self.config, "scoring", self.config['benchmark'], self.config['dataset_size'],\
-                                             self.config['query']['batch_size'], self.config['execution_mode']['parallelism'], base_path=self.config['kernels']['base_directory'])
+        kernel, kernel_path = self.kernels['scoring']
 
         if kernel is None:
             self.logger.error("Kernel not defined for vector processor.")
@@ -221,15 +219,14 @@ class RAGXAccelerator:
     def dimension_split_scoring_sparse(self, neighbors):
         """Sparse processing for document distribution across processors without embedding steps."""
         num_docs = len(neighbors)
-        print (f"Executing scoring for {num_docs} documents.")
+        self.logger.debug("Executing scoring for %d documents.", num_docs)
         vector_processors = self.config['vector_processor']['num_processors']
         
         # docs_per_processor = (num_docs + vector_processors - 1) // vector_processors
         # total_cycles = 0
 
         # Selecting the appropriate kernel based on the configuration
-        kernel, kernel_path = select_kernel(self.config, "scoring", self.config['benchmark'], self.config['dataset_size'],\
-                                             self.config['query']['batch_size'], self.config['execution_mode']['parallelism'], base_path=self.config['kernels']['base_directory'])
+        kernel, kernel_path = self.kernels['scoring']
         if kernel is None:
             self.logger.error("Kernel not defined for vector processor.")
             return
@@ -273,7 +270,7 @@ class RAGXAccelerator:
         
         # Update stats for memory transfers
         # self.stats.record_memory_transfer("DRAM_to_executor", load_cycles, load_energy)
-        self.logger.info(f"Loaded {data_size} units from DRAM in {load_cycles} cycles.")
+        self.logger.debug("Loaded %s units from DRAM in %s cycles.", data_size, load_cycles)
         return load_cycles
 
     def store_data_to_dram(self, scratchpad_index, data_size):
@@ -282,7 +279,7 @@ class RAGXAccelerator:
 
         # Update stats for memory transfers
         # self.stats.record_memory_transfer("executor_to_DRAM", store_cycles, store_energy)
-        self.logger.info(f"Stored {data_size} units to DRAM in {store_cycles} cycles.")
+        self.logger.debug("Stored %s units to DRAM in %s cycles.", data_size, store_cycles)
         return store_cycles
 
     def perform_reduction(self, neighbors):
@@ -294,7 +291,7 @@ class RAGXAccelerator:
         # Update stats for reduction task
         self.stats.update_compute_cycles("reduction", vector_cycles)
         # self.stats.update_energy("reduction", reduction_energy)
-        self.logger.info(f"Reduction executed in {vector_cycles} cycles.")
+        self.logger.debug("Reduction executed in %s cycles.", vector_cycles)
         return vector_cycles
     
     def perform_search(self, neighbors):
@@ -306,7 +303,7 @@ class RAGXAccelerator:
         # Update stats for reduction task
         # self.stats.update_compute_cycles("reduction", vector_cycles)
         # self.stats.update_energy("reduction", reduction_energy)
-        self.logger.info(f"Reduction executed in {scalar_cycles} cycles.")
+        self.logger.debug("Reduction executed in %s cycles.", scalar_cycles)
         return scalar_cycles
     
 
@@ -320,10 +317,15 @@ class RAGXAccelerator:
         # self.stats.update_energy("reduction", reduction_energy)
         # self.logger.info(f"Reduction executed in {scalar_cycles} cycles with energy {reduction_energy}.")
         return scalar_us
+
+    def perform_reduce_repeated(self, num_dimensions, repeats):
+        """Perform `repeats` identical reductions, updating stats exactly as that many perform_reduce calls."""
+        scalar_us, energy = self.scalar_executor.execute_repeated("addition", num_dimensions, repeats)
+        return scalar_us
     
     def handle_kernel_request(self, kernel_name, data):
         """Choose the appropriate kernel for a task."""
         if kernel_name == "all_reduce":
             self.interconnect.perform_collective("all_reduce", data)
         else:
-            self.logger.info(f"Kernel '{kernel_name}' executed.")
+            self.logger.debug("Kernel '%s' executed.", kernel_name)
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import closing
+
+
+def hash_directory(*paths):
+    """Hash the relative names and contents of every file under the given directories."""
+    digest = hashlib.sha1()
+    for path in paths:
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                file_path = os.path.join(root, filename)
+                digest.update(os.path.relpath(file_path, path).encode())
+                with open(file_path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Keyed store of GeneSys results backed by SQLite.
+
+    Entries are loaded once into an in-memory dict; lookups that miss fall back to an
+    indexed query so results written by concurrent sweeps are picked up. Each row is
+    keyed on a hash of the kernel directory (and GeneSys config), so recompiling a
+    kernel invalidates its old results automatically.
+    """
+
+    def __init__(self, cache_filename, table, key_fields, logger, timeout=60):
+        self.cache_filename = cache_filename
+        self.table = table
+        self.key_fields = ['kernel', 'kernel_hash'] + list(key_fields)
+        self.logger = logger
+        self.timeout = timeout
+        self.kernel_hashes = {}
+        self.entries = {}
+
+        cache_dir = os.path.dirname(cache_filename)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        columns = ", ".join(f"{field} TEXT NOT NULL" for field in self.key_fields)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({columns}, stats TEXT NOT NULL, "
+                         f"PRIMARY KEY ({', '.join(self.key_fields)}))")
+            rows = conn.execute(f"SELECT {', '.join(self.key_fields)}, stats FROM {self.table}").fetchall()
+        for row in rows:
+            self.entries[tuple(row[:-1])] = json.loads(row[-1])
+
+    def _connect(self):
+        return sqlite3.connect(self.cache_filename, timeout=self.timeout)
+
+    def kernel_hash(self, kernel_path, config_path=None):
+        """Content hash of a kernel directory (and GeneSys config), computed once per path."""
+        if kernel_path not in self.kernel_hashes:
+            paths = [kernel_path] if config_path is None else [kernel_path, config_path]
+            self.kernel_hashes[kernel_path] = hash_directory(*paths)
+        return self.kernel_hashes[kernel_path]
+
+    def make_key(self, kernel, kernel_hash, *values):
+        return (kernel, kernel_hash) + tuple(str(value) for value in values)
+
+    def get(self, key):
+        """Return the cached stats dict for key, or None."""
+        if key in self.entries:
+            return self.entries[key]
+
+        where = " AND ".join(f"{field} = ?" for field in self.key_fields)
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(f"SELECT stats FROM {self.table} WHERE {where}", key).fetchone()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading cache file: {e}")
+            return None
+
+        if row is None:
+            return None
+        self.entries[key] = json.loads(row[0])
+        return self.entries[key]
+
+    def put(self, key, stats_dict):
+        """Persist stats_dict under key; the first writer wins if several processes race."""
+        placeholders = ", ".join("?" * (len(self.key_fields) + 1))
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(f"INSERT OR IGNORE INTO {self.table} VALUES ({placeholders})",
+                             key + (json.dumps(stats_dict),))
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating cache file: {e}")
+        self.entries.setdefault(key, stats_dict)
@@ -20,6 +20,39 @@ class ScalarExecutor:
 
     def execute(self, operation, data_size, scratchpad_index=0, accel_id=None, node_id=None):
         """Perform a specific operation and return the cycles, energy consumed, and latency in µs."""
+        total_cycles, total_energy, latency_us = self.compute_cost(operation, data_size, scratchpad_index)
+
+        # Log the operation and computed cycles
+        self.logger.debug("Performing %s on data size %s. Operation cycles: %s, Total energy: %s nJ, Latency: %s µs.",
+                          operation, data_size, total_cycles, total_energy, latency_us)
+
+        # Update stats
+        self.update_stats(operation, total_cycles, total_energy, accel_id, node_id)
+
+        return latency_us, total_energy
+
+    def execute_repeated(self, operation, data_size, repeats, scratchpad_index=0, accel_id=None):
+        """
+        Perform the same operation `repeats` times back to back, e.g. one reduce per trace entry.
+
+        Equivalent to calling execute() `repeats` times without node_id: the system stats receive
+        the same sequence of additions, but the cost is only computed once. With accel_id, the
+        accelerator's scalar stats are charged as well.
+        """
+        total_cycles, total_energy, latency_us = self.compute_cost(operation, data_size, scratchpad_index)
+        self.logger.debug("Performing %s on data size %s x%d. Operation cycles: %s, Total energy: %s nJ, Latency: %s µs.",
+                          operation, data_size, repeats, total_cycles, total_energy, latency_us)
+
+        if accel_id is not None:
+            self.stats.update_accelerator_stat(accel_id, "scalar", "compute", total_cycles * repeats)
+            self.stats.update_accelerator_stat(accel_id, "scalar", "energy", total_energy * repeats)
+        self.stats.accumulate_system_stat("total_latency", [total_cycles] * repeats)
+        self.stats.accumulate_system_stat("total_energy", [total_energy] * repeats)
+
+        return latency_us, total_energy
+
+    def compute_cost(self, operation, data_size, scratchpad_index=0):
+        """Return (total cycles, energy in nJ, latency in µs) of an operation without updating stats."""
         if operation not in self.operation_cycle_costs:
             raise ValueError(f"Unknown operation: {operation}")
 
@@ -49,15 +82,7 @@ class ScalarExecutor:
         total_energy = memory_energy + operation_energy
         latency_us = total_cycles / (self.frequency_ghz * 1e3)  # Convert cycles at 1 GHz to µs
 
-        # Log the operation and computed cycles
-        self.logger.info(f"Performing {operation} on data size {data_size}. "
-                         f"Operation cycles: {total_cycles}, Total energy: {total_energy} nJ, "
-                         f"Latency: {latency_us} µs.")
-
-        # Update stats
-        self.update_stats(operation, total_cycles, total_energy, accel_id, node_id)
-
-        return latency_us, total_energy
+        return total_cycles, total_energy, latency_us
 
     def get_energy_consumption(self, cycles):
         """Calculate energy consumed based on the number of cycles."""
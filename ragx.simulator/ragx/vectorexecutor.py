@@ -1,7 +1,7 @@
-import subprocess
-import csv
-import os
-from collections import defaultdict
+import io
+from contextlib import redirect_stdout
+from ragx.genesys import simulate as genesys_simulate
+from ragx.result_cache import ResultCache
 
 class VectorExecutor:
     def __init__(self, config, logger, stats):
@@ -11,9 +11,12 @@ class VectorExecutor:
         self.genesys_config_path = config.get("genesys_config_path", "ragx/genesys/configs/")
         self.genesys_testdir = config.get("genesys_testdir", "ragx/genesys/fpga_sim_validation/test/")
         self.genesys_output_dir = config.get("genesys_output_dir", "test-results/")
-        self.genesys_output_file = config['kernels']['scoring'] + ".csv"
-        self.output_filename = self.genesys_output_dir + self.genesys_output_file
-        self.cache_filename = config.get("cache_filename", "execution_cache/scoring_cache.csv")
+        # worker processes for a kernel's layers; None uses every CPU
+        self.genesys_processes = config.get("genesys_processes")
+        # per-layer GeneSys results, shared by every kernel and executor
+        self.genesys_layer_cache = config.get("genesys_layer_cache", "execution_cache/genesys_layer_cache.db")
+        self.cache_filename = config.get("cache_filename", "execution_cache/scoring_cache.db")
+        self.cache = ResultCache(self.cache_filename, "scoring", ['dimensions', 'batch_size', 'num_neighbors_len'], logger)
         self.stats = stats
 
     def execute(self, kernel, kernel_path, dimensions, batch_size, num_neighbors):
@@ -21,33 +24,28 @@ class VectorExecutor:
         num_neighbors_len = len(num_neighbors)
         # print (f"here Vector: Executing kernel {kernel} with dimensions {dimensions}, batch size {batch_size}, and num_neighbors {num_neighbors}.")
         # Check the cache for existing results
-        print (f"here Vector: Checking cache for existing results.")
-        print ("kernel: ", kernel)
-        print ("dimensions: ", dimensions)
-        print ("batch_size: ", batch_size)
-        print ("num_neighbors_len: ", num_neighbors_len)
-        cached_result = self.check_cache(kernel, dimensions, batch_size, num_neighbors_len)
+        self.logger.debug("Vector: Checking cache for kernel %s, dimensions %s, batch_size %s, num_neighbors_len %s.",
+                          kernel, dimensions, batch_size, num_neighbors_len)
+        cache_key = self.cache_key(kernel, kernel_path, dimensions, batch_size, num_neighbors_len)
+        cached_result = self.check_cache(cache_key)
         if cached_result:
-            self.logger.info("Vector: Reusing cached result based on previous parameters.")
+            self.logger.debug("Vector: Reusing cached result based on previous parameters.")
             return cached_result
 
-        # Prepare the command to run Genesys
-        command = [
-            "python3", "-u", "ragx/genesys/genesys_sim/genesys.py",
-            self.genesys_config_path, kernel_path,
-            "--mode", "energy"
-        ]
-        print(f"Genesys run command: {command}")
-        
+        # Run Genesys in-process, capturing its console output, and get the summed statistics
+        self.logger.info("Vector: GeneSys simulating %s with config %s", kernel_path, self.genesys_config_path)
+        genesys_output = io.StringIO()
+
         try:
-            result = subprocess.run(command, check=True, capture_output=True, text=True)
-            self.logger.info(f"Genesys output:\n{result.stdout}")
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"Error executing Genesys simulation: {e.stderr}")
+            with redirect_stdout(genesys_output):
+                stats_dict = genesys_simulate(self.genesys_config_path, kernel_path, mode="energy",
+                                              processes=self.genesys_processes,
+                                              layerCache=self.genesys_layer_cache)
+            self.logger.debug("Genesys output:\n%s", genesys_output.getvalue())
+        except Exception as e:
+            self.logger.error("Error executing Genesys simulation: %s", e)
             return None
 
-        # Parse the resulting CSV to get the summed statistics
-        stats_dict = self.parse_csv_and_sum(self.output_filename)
         compute_time = stats_dict.get("totCycles")
         if compute_time is None:
             self.logger.error("Failed to extract compute time from Genesys output.")
@@ -55,7 +53,7 @@ class VectorExecutor:
 
         # Cache the new results if they are not already in cache
         if not cached_result:
-            self.update_cache(kernel, dimensions, batch_size, num_neighbors_len, stats_dict)
+            self.update_cache(cache_key, stats_dict)
         
         # Print stats if configured to do so
         if self.config.get("print_genesys_output", False):
@@ -64,12 +62,18 @@ class VectorExecutor:
 
         return stats_dict
 
-    def check_cache(self, kernel, dimensions, batch_size, num_neighbors_len):
-        """Check if parameters exist in the cache CSV and return cached results if available."""
-        if not os.path.exists(self.cache_filename):
+    def cache_key(self, kernel, kernel_path, dimensions, batch_size, num_neighbors_len):
+        """Build the cache key, hashing the kernel directory and GeneSys config so edits invalidate it."""
+        kernel_hash = self.cache.kernel_hash(kernel_path, self.genesys_config_path)
+        return self.cache.make_key(kernel, kernel_hash, dimensions, batch_size, num_neighbors_len)
+
+    def check_cache(self, cache_key):
+        """Return only the relevant cached fields for cache_key, if available."""
+        cached = self.cache.get(cache_key)
+        if cached is None:
             return None
+
         # Define the specific fields we want to retrieve
-        
         desired_fields = [
             'totCycles', 'totTime(us)',
             'wbuf_totalReadEnergy', 'bbuf_totalReadEnergy', 'obuf_readEnergy',
@@ -78,78 +82,8 @@ class VectorExecutor:
             'vmem2_totalReadEnergy', 'vmem2_totalWriteEnergy', 
             'vmem2_totalDDRWriteEnergy'
         ]
+        return {key: float(value) for key, value in cached.items() if key in desired_fields}
 
-        try:
-            with open(self.cache_filename, mode='r') as cache_file:
-                reader = csv.DictReader(cache_file)
-                for row in reader:
-                    # Ensure the row values are correctly casted as strings for comparison
-                    if (row['kernel'] == kernel and
-                        row['dimensions'] == str(dimensions) and
-                        row['batch_size'] == str(batch_size) and
-                        row['num_neighbors_len'] == str(num_neighbors_len)):
-                        # Convert cached values to floats for returned statistics
-                        # Collect only the desired fields from the row
-                        return {key: float(value) if key in desired_fields else value 
-                                for key, value in row.items() 
-                                if key in desired_fields}
-                        # return {key: float(value) for key, value in row.items() if key not in ['kernel', 'dimensions', 'batch_size', 'num_neighbors_len']}
-        except Exception as e:
-            self.logger.error(f"Error reading cache file: {e}")
-        
-        return None
-
-    def update_cache(self, kernel, dimensions, batch_size, num_neighbors_len, stats_dict):
-        """Append new results to the cache CSV file only if they don't already exist."""
-        # Check if this entry already exists in cache
-        if self.check_cache(kernel, dimensions, batch_size, num_neighbors_len):
-            self.logger.info("Vector: Cache entry already exists, skipping write.")
-            return  # Skip if entry is already cached
-        
-        file_exists = os.path.isfile(self.cache_filename)
-        
-        try:
-            with open(self.cache_filename, mode='a', newline='') as cache_file:
-                fieldnames = ['kernel', 'dimensions', 'batch_size', 'num_neighbors_len'] + list(stats_dict.keys())
-                writer = csv.DictWriter(cache_file, fieldnames=fieldnames)
-                
-                # Write header if file doesn't exist
-                if not file_exists:
-                    writer.writeheader()
-
-                # Prepare and write the new row
-                row = {
-                    'kernel': kernel,
-                    'dimensions': dimensions,
-                    'batch_size': batch_size,
-                    'num_neighbors_len': num_neighbors_len,
-                    **stats_dict
-                }
-                writer.writerow(row)
-        except Exception as e:
-            self.logger.error(f"Error updating cache file: {e}")
-
-    def parse_csv_and_sum(self, file_path):
-        """Parse CSV file and sum numeric values, returning a dictionary with results."""
-        sums = defaultdict(float)
-        try:
-            with open(file_path, 'r') as file:
-                reader = csv.reader(file)
-                next(reader)  # Ignore the first "ignore" row
-                headers = next(reader)
-
-                for row in reader:
-                    for i in range(2, len(row)):
-                        column_name = headers[i]
-                        try:
-                            numeric_value = float(row[i])
-                            sums[column_name] += numeric_value
-                        except ValueError:
-                            continue  # Ignore non-numeric values
-
-        except FileNotFoundError:
-            self.logger.error(f"CSV file not found: {file_path}")
-        except Exception as e:
-            self.logger.error(f"Error parsing CSV file: {e}")
-
-        return dict(sums)
+    def update_cache(self, cache_key, stats_dict):
+        """Persist new results; entries already written by another process are kept."""
+        self.cache.put(cache_key, stats_dict)
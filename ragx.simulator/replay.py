@@ -0,0 +1,225 @@
+import sys
+import argparse
+import logging
+import numpy as np
+import simpy
+from config.configparser import ConfigParser
+from eurekastore import LOG_LEVELS, EurekaStoreSim, configure_logging
+from tracefile.tracefile import load_trace
+
+logger = logging.getLogger(__name__)
+
+LATENCY_PERCENTILES = [50, 95, 99, 99.9]
+
+
+def generate_arrivals(process, num_queries=None, rate_qps=None, timestamps_file=None, seed=0):
+    """
+    Generate query arrival times in microseconds.
+
+    Args:
+        process (str): 'poisson' (exponential inter-arrivals), 'fixed' (constant rate) or
+            'timestamps' (one arrival time in seconds per line of timestamps_file).
+        num_queries (int): Number of arrivals to generate (timestamps: optional cap).
+        rate_qps (float): Offered load in queries per second (poisson and fixed).
+        timestamps_file (str): Path of the timestamps file.
+        seed (int): Seed for the Poisson process.
+
+    Returns:
+        numpy.ndarray: Sorted arrival times in us, starting at 0.
+    """
+    if process == 'timestamps':
+        arrivals = np.sort(np.loadtxt(timestamps_file, dtype=np.float64, ndmin=1)) * 1e6
+        arrivals = arrivals[:num_queries] if num_queries else arrivals
+        return arrivals - arrivals[0]
+
+    if not rate_qps or rate_qps <= 0:
+        raise ValueError(f"Arrival process '{process}' requires a positive rate (QPS).")
+    mean_interarrival_us = 1e6 / rate_qps
+    if process == 'poisson':
+        gaps = np.random.default_rng(seed).exponential(mean_interarrival_us, num_queries)
+    elif process == 'fixed':
+        gaps = np.full(num_queries, mean_interarrival_us)
+    else:
+        raise ValueError(f"Unknown arrival process '{process}'. Choose from 'poisson', 'fixed' or 'timestamps'.")
+    gaps[0] = 0
+    return np.cumsum(gaps)
+
+
+class QueryStages:
+    """Service times of one query, derived from its trace with the single-query latency model."""
+
+    def __init__(self, embedding, nvme_reads, compute, final_reduce, top_k_transfer, host_latency):
+        self.embedding = embedding            # systolic query embedding on the accelerator
+        self.nvme_reads = nvme_reads          # per-hop NVMe read on the shared NVMe channel(s)
+        self.compute = compute                # per-hop scoring (overlapped with reduce) on the accelerator
+        self.final_reduce = final_reduce      # final reduction on the accelerator
+        self.top_k_transfer = top_k_transfer  # top-k transfer over the interconnect to the host
+        self.host_latency = host_latency      # host-side metadata search, not contended
+
+    def unloaded_latency(self):
+        return (self.embedding + float(np.sum(self.nvme_reads + self.compute)) + self.final_reduce
+                + self.top_k_transfer + self.host_latency)
+
+
+class QueryReplay:
+    """
+    Replays many per-query traces against shared hardware with simpy.
+
+    Each RAGXAccelerator, the NVMe channel(s) and the interconnect are resources with FIFO
+    queues. A query is pinned at arrival to the accelerator with the fewest outstanding queries
+    and then alternates between NVMe reads and compute on that accelerator, hop by hop, so
+    queries interleave on the hardware. With a single query in flight the latency reduces to the
+    standalone execution model of EurekaStoreSim.
+    """
+
+    def __init__(self, config, trace_files):
+        if config['execution_mode']['parallelism'] != 'standalone':
+            raise ValueError("Replay models standalone execution; set execution_mode.parallelism to 'standalone'.")
+
+        self.config = config
+        self.trace_files = trace_files
+        self.sparse_layout = config['benchmark'] in ['splade', 'bm25']
+        self.num_accelerators = config.get('num_accelerators', 1)
+        self.nvme_channels = config.get('nvme_channels', 1)
+
+        # The first trace sets up accelerators and kernels; the rest reuse them
+        self.sim = EurekaStoreSim(trace_files[0], config)
+        self.stages = {}
+
+    def query_stages(self, trace_file):
+        """Service times of the query in trace_file, computed once per trace."""
+        if trace_file in self.stages:
+            return self.stages[trace_file]
+
+        sim = self.sim
+        sim.trace_data = load_trace(trace_file, sparse_layout=self.sparse_layout)
+        accelerator = sim.accelerators[0]
+        top_k_transfer = sim.send_top_k_to_cpu_latency(self.config['topk'] * self.config['query']['datatype_bytes'])
+
+        if sim.execution_type == 'dense':
+            embedding = accelerator.embed_query(sim.get_query_vector_size(sim.batch_size, sim.query_dimensions), 0)
+            _, nvme_reads, scoring = sim.dense_entry_latencies(accelerator)
+            reduce = np.full(len(scoring), accelerator.scalar_executor.compute_cost("addition", 2)[2])
+            final_reduce = accelerator.scalar_executor.compute_cost("addition", sim.query_dimensions)[2]
+            host_latency = self.config['metadata']['compute_latency']
+        else:
+            embedding = 0
+            _, nvme_reads, scoring, reduce = sim.sparse_entry_latencies(accelerator)
+            final_reduce = accelerator.scalar_executor.compute_cost("addition", sim.query_dimensions)[2]
+            host_latency = 0
+
+        # Execution overlaps each hop's reduce with its NVMe read + scoring (the last hop has none),
+        # so the accelerator is busy for whatever the hop takes beyond its NVMe read
+        reduce[-1:] = 0
+        compute = np.maximum(scoring + nvme_reads, reduce) - nvme_reads
+
+        self.stages[trace_file] = QueryStages(embedding, nvme_reads, compute, final_reduce, top_k_transfer, host_latency)
+        return self.stages[trace_file]
+
+    def use(self, resource_name, resource, duration):
+        """Hold a resource for `duration` us, queueing FIFO behind earlier requests."""
+        with resource.request() as request:
+            yield request
+            yield self.env.timeout(duration)
+        self.busy_time[resource_name] += duration
+
+    def query(self, query_id, arrival, stages):
+        yield self.env.timeout(arrival - self.env.now)
+
+        accelerator_id = min(range(self.num_accelerators), key=lambda i: self.outstanding[i])
+        accelerator_name = f"accelerator_{accelerator_id}"
+        accelerator = self.accelerators[accelerator_id]
+        self.outstanding[accelerator_id] += 1
+
+        if stages.embedding:
+            yield from self.use(accelerator_name, accelerator, stages.embedding)
+        for nvme_read, compute in zip(stages.nvme_reads.tolist(), stages.compute.tolist()):
+            yield from self.use("nvme", self.nvme, nvme_read)
+            yield from self.use(accelerator_name, accelerator, compute)
+        yield from self.use(accelerator_name, accelerator, stages.final_reduce)
+        self.outstanding[accelerator_id] -= 1
+
+        yield from self.use("interconnect", self.interconnect, stages.top_k_transfer)
+        yield self.env.timeout(stages.host_latency)
+
+        self.latencies[query_id] = self.env.now - arrival
+        self.completions[query_id] = self.env.now
+
+    def run(self, arrivals):
+        """Replay one query per arrival, cycling through the trace files, and return the summary."""
+        self.env = simpy.Environment()
+        self.accelerators = [simpy.Resource(self.env, capacity=1) for _ in range(self.num_accelerators)]
+        self.nvme = simpy.Resource(self.env, capacity=self.nvme_channels)
+        self.interconnect = simpy.Resource(self.env, capacity=1)
+        self.outstanding = [0] * self.num_accelerators
+        self.busy_time = {f"accelerator_{i}": 0 for i in range(self.num_accelerators)}
+        self.busy_time.update({"nvme": 0, "interconnect": 0})
+        self.latencies = np.zeros(len(arrivals))
+        self.completions = np.zeros(len(arrivals))
+
+        for query_id, arrival in enumerate(arrivals.tolist()):
+            stages = self.query_stages(self.trace_files[query_id % len(self.trace_files)])
+            self.env.process(self.query(query_id, arrival, stages))
+        self.env.run()
+
+        return self.summarize(arrivals)
+
+    def summarize(self, arrivals):
+        makespan_us = self.completions.max() - arrivals.min()
+        capacity = {name: 1 for name in self.busy_time}
+        capacity["nvme"] = self.nvme_channels
+
+        summary = {
+            "num_queries": len(arrivals),
+            "offered_qps": (len(arrivals) - 1) / (arrivals.max() - arrivals.min()) * 1e6 if len(arrivals) > 1 else 0,
+            "achieved_qps": len(arrivals) / makespan_us * 1e6,
+            "mean_latency": float(np.mean(self.latencies)),
+            "unloaded_latency": float(np.mean([self.query_stages(trace).unloaded_latency() for trace in self.trace_files])),
+            "latency_percentiles": {f"p{p:g}": float(np.percentile(self.latencies, p)) for p in LATENCY_PERCENTILES},
+            "utilization": {name: busy / (capacity[name] * makespan_us) for name, busy in self.busy_time.items()},
+        }
+        return summary
+
+
+def print_replay_summary(summary):
+    print("\n=== Replay Stats ===")
+    print(f"num_queries: {summary['num_queries']}")
+    print(f"offered_qps: {summary['offered_qps']}")
+    print(f"achieved_qps: {summary['achieved_qps']}")
+    print(f"mean_latency: {summary['mean_latency']}")
+    print(f"unloaded_latency: {summary['unloaded_latency']}")
+    print("latency_percentiles:")
+    for key, value in summary['latency_percentiles'].items():
+        print(f"  {key}: {value}")
+    print("utilization:")
+    for key, value in summary['utilization'].items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay many per-query traces under an arrival process.")
+    parser.add_argument('config', type=str, help="path to the simulator config.")
+    parser.add_argument('traces', type=str, nargs='+', help="per-query trace files, replayed round-robin.")
+    parser.add_argument('--arrival', type=str, default='poisson', choices=['poisson', 'fixed', 'timestamps'],
+                        help="arrival process.")
+    parser.add_argument('--rate', type=float, default=None, help="offered load in queries per second.")
+    parser.add_argument('--num_queries', type=int, default=None,
+                        help="number of queries (default: one per trace, or every timestamp).")
+    parser.add_argument('--timestamps', type=str, default=None,
+                        help="file with one arrival time in seconds per line (--arrival timestamps).")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the Poisson process.")
+    parser.add_argument('--log_level', type=str, default='WARNING', choices=list(LOG_LEVELS),
+                        help="diagnostic output level of the simulator (default: WARNING).")
+    args = parser.parse_args()
+    configure_logging(LOG_LEVELS[args.log_level])
+
+    if args.arrival == 'timestamps' and args.timestamps is None:
+        sys.exit("--arrival timestamps requires --timestamps FILE")
+
+    print ("Units: Times in us, Data size in bytes, Bandwidth in GB")
+    config = ConfigParser().load_config(args.config)
+    num_queries = args.num_queries or (None if args.arrival == 'timestamps' else len(args.traces))
+    arrivals = generate_arrivals(args.arrival, num_queries, args.rate, args.timestamps, args.seed)
+
+    replay = QueryReplay(config, args.traces)
+    print_replay_summary(replay.run(arrivals))
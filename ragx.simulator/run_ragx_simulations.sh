@@ -31,11 +31,12 @@ for CONFIG_PATH in "${!CONFIG_TRACE_MAP[@]}"; do
     
     # Construct the log file name based on the configuration
     LOG_FILE="${LOG_DIR}/${CONFIG_FILENAME}-trace_output.txt"
+    SUMMARY_FILE="${LOG_DIR}/${CONFIG_FILENAME}-trace_output.json"
     
-    # Run the simulation and redirect both stdout and stderr to the log file
-    PYTHONUNBUFFERED=1 python3 eurekastore.py "$CONFIG_PATH" "$TRACE_PATH" > "$LOG_FILE" 2>&1
+    # Run the simulation and redirect both stdout and stderr to the log file; stats also go to a JSON summary
+    PYTHONUNBUFFERED=1 python3 eurekastore.py "$CONFIG_PATH" "$TRACE_PATH" --summary "$SUMMARY_FILE" --no_print_nodes > "$LOG_FILE" 2>&1
     
-    echo "Output saved to $LOG_FILE"
+    echo "Output saved to $LOG_FILE and $SUMMARY_FILE"
 done
 
 # Analyze and collate the results after all simulations are completed
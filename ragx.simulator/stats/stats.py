@@ -1,4 +1,9 @@
+import json
 from collections import defaultdict
+import numpy as np
+
+# Trace stats that accumulate across visits to the same node; the rest keep the latest value
+ACCUMULATED_TRACE_STATS = ["scoring_time", "reduce_time", "embedding_time", "energy"]
 
 class Stats:
     """Tracks comprehensive execution stats including system-wide, accelerator-specific, and node-by-node statistics."""
@@ -37,6 +42,8 @@ class Stats:
             "embedding_time": 0,
             "energy": 0
         }
+        # Column blocks queued by update_trace_stats, applied to trace_stats["nodes"] in order on first use
+        self.pending_trace_columns = []
 
         # Accelerator stats (including systolic, vector, scalar, etc.)
         self.accelerator_stats = defaultdict(lambda: {
@@ -64,6 +71,9 @@ class Stats:
             "accelerator_energy": 0
         }
 
+        # Pipelined engine: per-resource busy and overlapped time, plus speculative prefetch counts
+        self.pipeline_stats = {}
+
     # Update system stats with nested structure handling
     def update_system_stat(self, name, value, subkey=None):
         """Updates a system-level stat. If `subkey` is provided, updates that specific sub-stat."""
@@ -77,11 +87,57 @@ class Stats:
         else:
             raise ValueError(f"Unknown system stat '{name}'.")
 
+    def accumulate_system_stat(self, name, values, subkey=None):
+        """
+        Add every value in `values` to a system stat, in order.
+
+        Produces exactly the same result as calling update_system_stat once per value: the
+        running sum is a sequential cumsum, not numpy's pairwise summation.
+        """
+        if len(values) == 0:
+            return
+        current = self.system_stats[name][subkey] if subkey else self.system_stats.get(name)
+        if current is None:
+            raise ValueError(f"Unknown system stat '{name}' or subkey '{subkey}'.")
+        total = np.cumsum(np.concatenate(([current], values)))[-1].item()
+        if subkey:
+            self.system_stats[name][subkey] = total
+        else:
+            self.system_stats[name] = total
+
+    def update_trace_stats(self, node_ids, **columns):
+        """
+        Column-wise update_trace_stat: element i of every column applies to node_ids[i], in order.
+
+        Columns (lists or numpy arrays) are only queued here; building the per-node dicts is
+        deferred to flush_trace_stats so vectorized execution stays O(1) in Python calls.
+        """
+        self.pending_trace_columns.append((node_ids, columns))
+
+    def flush_trace_stats(self):
+        """Apply queued update_trace_stats blocks to trace_stats["nodes"]."""
+        nodes = self.trace_stats["nodes"]
+        for node_ids, columns in self.pending_trace_columns:
+            node_ids = node_ids.tolist() if isinstance(node_ids, np.ndarray) else node_ids
+            for name, values in columns.items():
+                if values is None:
+                    continue
+                values = values.tolist() if isinstance(values, np.ndarray) else values
+                if name in ACCUMULATED_TRACE_STATS:
+                    for node_id, value in zip(node_ids, values):
+                        nodes[node_id][name] += value
+                else:
+                    for node_id, value in zip(node_ids, values):
+                        nodes[node_id][name] = value
+        self.pending_trace_columns = []
+
     # Update trace stats for node-specific or general stats
     def update_trace_stat(self, node_id, scoring_time=None, reduce_time=None, embedding_time=None, energy=None, data_size=None, num_neighbors=None, nvme_read=None, metadata_latency=None):
         """Updates a trace-level stat for a node, only updating values that are explicitly provided."""
 
         # print(f"Updating trace stat for node {node_id}")
+        if self.pending_trace_columns:
+            self.flush_trace_stats()
 
         # Only update each stat if a non-None value is provided
         if scoring_time is not None:
@@ -137,13 +193,83 @@ class Stats:
         else:
             raise ValueError(f"Unknown system energy stat '{name}'.")
 
-    
+    def update_scratchpad_energy(self, accel_id, energy):
+        """Charges energy spent staging NVMe reads into an accelerator's scratchpad to the accelerator and system totals."""
+        self.accelerator_stats[accel_id]["scratchpad_energy"] += energy
+        self.system_energy_stats["accelerator_energy"] += energy
+        self.system_stats["total_energy"] += energy
+
+    def cost_stats(self):
+        """
+        Snapshot of the energy and kernel latency recorded so far, as {(accelerator id or None for the system, stat): value}.
+
+        The scalar executor adds its reduce cycles to the system total_latency, so that is included with the energy.
+        """
+        costs = {(None, "total_energy"): self.system_stats["total_energy"], (None, "total_latency"): self.system_stats["total_latency"]}
+        for accel_id, accel_stats in self.accelerator_stats.items():
+            costs[(accel_id, "energy")] = accel_stats["energy"]
+            for unit in ["systolic", "vector", "scalar"]:
+                costs[(accel_id, unit)] = accel_stats[unit]["energy"]
+        return costs
+
+    def repeat_costs(self, since, repeats):
+        """Charge the energy and latency recorded after the `since` snapshot `repeats` more times, e.g. for repeated query batches."""
+        for (accel_id, name), value in self.cost_stats().items():
+            extra = (value - since.get((accel_id, name), 0)) * repeats
+            if accel_id is None:
+                self.system_stats[name] += extra
+            elif name == "energy":
+                self.accelerator_stats[accel_id]["energy"] += extra
+            else:
+                self.accelerator_stats[accel_id][name]["energy"] += extra
+
+    # Record the pipelined engine's overlap
+    def update_pipeline_stats(self, **stats):
+        """Records pipeline stats (per-resource overlap, speculative reads) of the pipelined engine."""
+        self.pipeline_stats.update(stats)
+
+    def summary(self, include_nodes=False):
+        """
+        All stats as a JSON-serializable dict.
+
+        Per-node trace stats can run to millions of entries, so they are only included (as a
+        list of rows, one per node) when include_nodes is set.
+        """
+        self.flush_trace_stats()
+        # the system energy report shows the same total as the system stats
+        self.system_energy_stats["total_energy"] = self.system_stats["total_energy"]
+        summary = {
+            "system": self.system_stats,
+            "system_energy": self.system_energy_stats,
+            "interconnect": self.interconnect_stats,
+            "accelerators": {str(accel_id): accel_stats for accel_id, accel_stats in self.accelerator_stats.items()},
+            "trace": {key: value for key, value in self.trace_stats.items() if key != "nodes"},
+        }
+        if self.pipeline_stats:
+            summary["pipeline"] = self.pipeline_stats
+        summary["trace"]["num_nodes"] = len(self.trace_stats["nodes"])
+        if include_nodes:
+            summary["nodes"] = [{"node": node_id, **node_stats} for node_id, node_stats in self.trace_stats["nodes"].items()]
+        return summary
+
+    def write_summary(self, summary_file, include_nodes=False, metadata=None):
+        """Write summary() (plus optional run metadata) to summary_file as JSON."""
+        summary = {"metadata": metadata or {}, **self.summary(include_nodes)}
+        with open(summary_file, 'w') as file:
+            json.dump(summary, file, indent=2, default=lambda value: value.item() if isinstance(value, np.generic) else str(value))
+
     # Print stats (updated to show detailed trace information)
-    def print_stats(self):
+    def print_stats(self, include_nodes=True):
         """Prints all stats in a structured format."""
+        self.flush_trace_stats()
+        # the system energy report shows the same total as the system stats
+        self.system_energy_stats["total_energy"] = self.system_stats["total_energy"]
         print("\n=== Trace Stats ===")
         for key, value in self.trace_stats.items():
             if key == "nodes":
+                if not include_nodes:
+                    print(f"Nodes: {len(value)} (per-node stats not printed)")
+                    continue
                 print("Nodes:")
                 for node_id, node_stats in value.items():
                     print(f"  Node {node_id}:")
@@ -172,6 +298,16 @@ class Stats:
         print("\n=== System Energy Stats ===")
         for key, value in self.system_energy_stats.items():
             print(f"{key}: {value}")
+
+        if self.pipeline_stats:
+            print("\n=== Pipeline Stats ===")
+            for key, value in self.pipeline_stats.items():
+                if isinstance(value, dict):
+                    print(f"{key}:")
+                    for subkey, subvalue in value.items():
+                        print(f"  {subkey}: {subvalue}")
+                else:
+                    print(f"{key}: {value}")
         
         print("\n\n=== System Stats ===")
         for key, value in self.system_stats.items():
@@ -0,0 +1,249 @@
+import os
+import csv
+import sys
+import json
+import time
+import hashlib
+import argparse
+import itertools
+import traceback
+from fnmatch import fnmatch
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import yaml
+from config.configparser import ConfigParser
+
+# Config keys a grid may vary; dotted keys address nested sections
+SWEEP_PARAMETERS = [
+    'num_accelerators', 'execution_mode.*', 'query.batch_size',
+    'interconnect.*', 'nvme_*', 'vector_processor.*',
+]
+
+
+def load_grid(grid_file=None, params=()):
+    """
+    Build the sweep grid from a YAML file and/or KEY=V1,V2,... overrides.
+
+    The grid file maps dotted config keys to lists of values, e.g.
+    {'num_accelerators': [1, 2, 4], 'interconnect.bandwidth': [4, 16]}. Values given on the
+    command line are parsed as YAML scalars and replace any grid-file entry for the same key.
+    """
+    grid = {}
+    if grid_file:
+        with open(grid_file, 'r') as file:
+            grid.update(yaml.safe_load(file) or {})
+    for param in params:
+        key, _, values = param.partition('=')
+        if not values:
+            raise ValueError(f"Grid parameter '{param}' must look like KEY=V1,V2,...")
+        grid[key] = [yaml.safe_load(value) for value in values.split(',')]
+
+    for key, values in grid.items():
+        if not any(fnmatch(key, pattern) for pattern in SWEEP_PARAMETERS):
+            raise ValueError(f"Cannot sweep '{key}'. Sweepable parameters: {', '.join(SWEEP_PARAMETERS)}")
+        if not isinstance(values, list) or not values:
+            grid[key] = [values]
+    return grid
+
+
+def grid_points(grid):
+    """Cartesian product of the grid as a list of {dotted key: value} dicts, in grid order."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def apply_overrides(config, overrides):
+    """Set each dotted key of overrides in config, creating intermediate sections as needed."""
+    for key, value in overrides.items():
+        section = config
+        *parents, leaf = key.split('.')
+        for parent in parents:
+            section = section.setdefault(parent, {})
+        section[leaf] = value
+    return config
+
+
+def point_id(config_path, trace_file, overrides):
+    """Stable id of a sweep point, used to name its result and log and to resume."""
+    key = json.dumps([os.path.abspath(config_path), os.path.abspath(trace_file), overrides], sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def summarize_stats(stats):
+    """Flatten the system-level Stats summary of one run into a results-table row."""
+    summary = stats.summary()
+    row = {
+        'total_latency': summary['system']['total_latency'],
+        'total_energy': summary['system']['total_energy'],
+    }
+    sections = {
+        'latency_breakdown': summary['system']['latency_breakdown'],
+        'energy': summary['system_energy'],
+        'interconnect': summary['interconnect'],
+    }
+    for prefix, values in sections.items():
+        row.update({f'{prefix}.{key}': value for key, value in values.items()})
+    return row
+
+
+class redirect_output:
+    """Point the process's stdout and stderr file descriptors (prints, logging, GeneSys) at a file."""
+
+    def __init__(self, file):
+        self.file = file
+
+    def __enter__(self):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.saved = [os.dup(1), os.dup(2)]
+        os.dup2(self.file.fileno(), 1)
+        os.dup2(self.file.fileno(), 2)
+
+    def __exit__(self, *exc):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, saved in zip([1, 2], self.saved):
+            os.dup2(saved, fd)
+            os.close(saved)
+
+
+def run_point(config_path, trace_file, overrides, log_file, log_level='INFO'):
+    """Simulate one sweep point in a worker process; its console output goes to log_file."""
+    # Imported here so the parent process never sets up eurekastore's loggers
+    from eurekastore import LOG_LEVELS, EurekaStoreSim, configure_logging
+
+    configure_logging(LOG_LEVELS[log_level])
+    start = time.time()
+    config = apply_overrides(ConfigParser().load_config(config_path), overrides)
+    # points already run in parallel, so each simulates its kernels' layers serially by default
+    config.setdefault('genesys_processes', 1)
+    with open(log_file, 'w') as log, redirect_output(log):
+        try:
+            sim = EurekaStoreSim(trace_file, config)
+            sim.run(print_nodes=False)
+            result = {'status': 'ok', **summarize_stats(sim.stats)}
+        except Exception as e:
+            traceback.print_exc()
+            result = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+    result['runtime_s'] = time.time() - start
+    return result
+
+
+class Sweep:
+    """
+    Runs every point of a grid over a base config on a process pool.
+
+    Each finished point is written atomically to <output_dir>/points/<point id>.json, so an
+    interrupted sweep resumes by skipping the points that already succeeded. Workers share the
+    on-disk kernel result cache (execution_cache/), so a GeneSys result computed by one point
+    is reused by every later point in any worker. The results table is rebuilt from the point
+    files at the end of every run.
+    """
+
+    def __init__(self, config_path, trace_file, grid, output_dir):
+        self.config_path = config_path
+        self.trace_file = trace_file
+        self.grid = grid
+        self.output_dir = output_dir
+        self.points_dir = os.path.join(output_dir, 'points')
+        self.logs_dir = os.path.join(output_dir, 'logs')
+        os.makedirs(self.points_dir, exist_ok=True)
+        os.makedirs(self.logs_dir, exist_ok=True)
+
+        self.points = [(point_id(config_path, trace_file, overrides), overrides) for overrides in grid_points(grid)]
+
+    def point_file(self, pid):
+        return os.path.join(self.points_dir, f'{pid}.json')
+
+    def load_point(self, pid):
+        if not os.path.exists(self.point_file(pid)):
+            return None
+        with open(self.point_file(pid), 'r') as file:
+            return json.load(file)
+
+    def save_point(self, pid, overrides, result):
+        record = {'point_id': pid, 'config': self.config_path, 'trace': self.trace_file,
+                  'parameters': overrides, **result}
+        tmp_file = self.point_file(pid) + '.tmp'
+        with open(tmp_file, 'w') as file:
+            json.dump(record, file, indent=2)
+        os.replace(tmp_file, self.point_file(pid))
+
+    def pending_points(self):
+        """Points without a successful result yet."""
+        return [(pid, overrides) for pid, overrides in self.points
+                if (self.load_point(pid) or {}).get('status') != 'ok']
+
+    def run(self, jobs=None, log_level='INFO'):
+        pending = self.pending_points()
+        print(f"Sweep: {len(self.points)} points, {len(self.points) - len(pending)} already done, "
+              f"{len(pending)} to run on {jobs or os.cpu_count()} workers.")
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(run_point, self.config_path, self.trace_file, overrides,
+                            os.path.join(self.logs_dir, f'{pid}.txt'), log_level): (pid, overrides)
+                for pid, overrides in pending
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    pid, overrides = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker itself died (e.g. out of memory)
+                        result = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+                    self.save_point(pid, overrides, result)
+                    print(f"[{done}/{len(pending)}] {pid} {overrides}: {result['status']} "
+                          f"{result.get('total_latency', result.get('error', ''))}")
+            except KeyboardInterrupt:
+                print("Sweep interrupted; finished points are saved, rerun to resume.")
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def write_table(self, results_file):
+        """Write one row per grid point (in grid order) with its parameters and results."""
+        rows = []
+        for pid, overrides in self.points:
+            record = self.load_point(pid) or {'point_id': pid, 'status': 'pending'}
+            row = {'point_id': pid, **overrides}
+            row.update({key: value for key, value in record.items()
+                        if key not in ['point_id', 'config', 'trace', 'parameters']})
+            rows.append(row)
+
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        with open(results_file, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep a grid of configurations over one trace in parallel.")
+    parser.add_argument('config', type=str, help="path to the base simulator config.")
+    parser.add_argument('trace', type=str, help="path to the trace file.")
+    parser.add_argument('--grid', type=str, default=None,
+                        help="YAML file mapping dotted config keys to lists of values.")
+    parser.add_argument('--param', type=str, action='append', default=[],
+                        help="grid axis as KEY=V1,V2,... (repeatable), e.g. interconnect.bandwidth=4,16.")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: all CPUs).")
+    parser.add_argument('--output_dir', type=str, default='sweep_results',
+                        help="directory for per-point results, logs and the results table.")
+    parser.add_argument('--log_level', type=str, default='INFO',
+                        choices=['DEBUG', 'SYSTEM', 'INFO', 'STATS', 'WARNING', 'ERROR'],
+                        help="diagnostic output level of each point's log.")
+    args = parser.parse_args()
+
+    grid = load_grid(args.grid, args.param)
+    if not grid:
+        sys.exit("Nothing to sweep: pass --grid FILE and/or --param KEY=V1,V2,...")
+
+    sweep = Sweep(args.config, args.trace, grid, args.output_dir)
+    try:
+        sweep.run(args.jobs, args.log_level)
+    finally:
+        results_file = os.path.join(args.output_dir, 'results.csv')
+        rows = sweep.write_table(results_file)
+        failed = sum(row['status'] == 'error' for row in rows)
+        print(f"Results saved to {results_file} ({len(rows)} points, {failed} failed)")
@@ -0,0 +1,302 @@
+import json
+import textwrap
+
+import numpy as np
+
+from tracefile.tracefile import (DENSE_ENTRY, TraceData, is_binary_trace, iter_trace_entries, load_binary_trace,
+                                 load_trace, save_binary_trace)
+
+PLACEMENT_STRATEGIES = ['random', 'locality', 'graph']
+
+
+class DocumentGraph:
+    """
+    Undirected neighbor graph over document ids, stored CSR-style like TraceData.
+
+    Document v's neighbors are neighbors[offsets[v]:offsets[v + 1]]; every edge is stored in
+    both directions, without duplicates or self-loops.
+    """
+
+    def __init__(self, offsets, neighbors, entry_point=0):
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.entry_point = entry_point
+
+    @property
+    def num_docs(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.neighbors) // 2
+
+    def degrees(self):
+        return np.diff(self.offsets)
+
+    def sources(self):
+        """Source document of every entry of neighbors."""
+        return np.repeat(np.arange(self.num_docs), self.degrees())
+
+    @classmethod
+    def from_edges(cls, sources, targets, num_docs, entry_point=0):
+        """Build the graph from directed (source, target) edge arrays over documents [0, num_docs)."""
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        keep = sources != targets
+        edges = np.unique(np.concatenate((sources[keep] * num_docs + targets[keep],
+                                          targets[keep] * num_docs + sources[keep])))
+        offsets = np.zeros(num_docs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges // num_docs, minlength=num_docs), out=offsets[1:])
+        return cls(offsets, edges % num_docs, entry_point)
+
+
+def load_hnsw_graph(index_file):
+    """
+    Level-0 graph of a FAISS HNSW index, e.g. one written by benchmarks/*/create_hnsw_*.py.
+
+    Level 0 holds every document and is the level the search spends its hops on; the upper
+    levels only pick its entry point.
+    """
+    try:
+        import faiss
+    except ImportError as error:
+        raise ImportError("Reading HNSW indexes requires faiss (pip install faiss-cpu).") from error
+
+    index = faiss.read_index(index_file)
+    hnsw = index.hnsw
+    offsets = faiss.vector_to_array(hnsw.offsets).astype(np.int64)
+    links = faiss.vector_to_array(hnsw.neighbors).astype(np.int64)
+    begin, end = hnsw.cum_nb_neighbors(0), hnsw.cum_nb_neighbors(1)
+
+    targets = links[offsets[:-1, None] + np.arange(begin, end)].ravel()
+    sources = np.repeat(np.arange(index.ntotal), end - begin)
+    valid = targets >= 0  # unused neighbor slots are -1
+    return DocumentGraph.from_edges(sources[valid], targets[valid], index.ntotal, int(hnsw.entry_point))
+
+
+def load_trace_graph(trace_files, num_docs=None):
+    """
+    Graph of the hops recorded in dense traces: every hop links its node to the neighbors it scored.
+
+    Posting-list traces carry no document graph and are skipped. num_docs defaults to one past
+    the largest document id seen.
+    """
+    sources, targets, entry_point = [], [], None
+    for trace_file in trace_files:
+        trace = load_trace(trace_file)
+        if trace.nodes.dtype == object:
+            continue
+        listed = np.diff(trace.neighbor_offsets) == trace.neighbor_counts
+        hops = np.flatnonzero((trace.entry_types == DENSE_ENTRY) & listed)
+        if len(hops) == 0:
+            continue
+        entries = np.repeat(np.arange(len(trace)), np.diff(trace.neighbor_offsets))
+        in_hop = np.isin(entries, hops)
+        sources.append(trace.nodes[entries[in_hop]].astype(np.int64))
+        targets.append(trace.neighbor_ids[in_hop].astype(np.int64))
+        if entry_point is None:
+            entry_point = int(trace.nodes[hops[0]])
+
+    if not sources:
+        raise ValueError("None of the traces records dense hops with neighbor ids.")
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    if num_docs is None:
+        num_docs = int(max(sources.max(), targets.max())) + 1
+    return DocumentGraph.from_edges(sources, targets, num_docs, entry_point)
+
+
+def place_random(num_docs, num_partitions, seed=0):
+    """Every document on a random partition, with partition sizes differing by at most one."""
+    return np.random.default_rng(seed).permutation(num_docs) % num_partitions
+
+
+def place_locality(graph, num_partitions):
+    """
+    Documents in breadth-first order from the graph's entry point, cut into equal contiguous ranges.
+
+    A search walks from the entry point through neighboring documents, so nearby documents tend
+    to share a partition. Documents without neighbors cannot cut an edge; they fill the
+    partitions up to equal sizes.
+    """
+    order = bfs_order(graph)
+    placement = np.empty(graph.num_docs, dtype=np.int64)
+    placement[order] = np.arange(len(order)) * num_partitions // max(len(order), 1)
+
+    # top every partition up to the same size with documents that have no neighbors
+    isolated = np.flatnonzero(graph.degrees() == 0)
+    target_size = -(-graph.num_docs // num_partitions)
+    free = target_size - np.bincount(placement[order], minlength=num_partitions)
+    placement[isolated] = np.repeat(np.arange(num_partitions), free)[:len(isolated)]
+    return placement
+
+
+def place_graph(graph, num_partitions, imbalance=0.03, iterations=20):
+    """
+    Partition the graph to minimize cross-partition edges, starting from the locality placement.
+
+    Each round moves every document that has more neighbors on another partition to the one
+    holding most of them (balanced label propagation). Moves between two partitions are paired
+    up highest gain first, so they keep sizes unchanged, and unpaired moves only go as far as a
+    partition may grow: (1 + imbalance) times the mean size. The best placement seen is returned.
+    """
+    placement = place_locality(graph, num_partitions)
+    if num_partitions == 1 or graph.num_edges == 0:
+        return placement
+
+    capacity = int(np.ceil(graph.num_docs / num_partitions * (1 + imbalance)))
+    sources, docs = graph.sources(), np.arange(graph.num_docs)
+    best_placement, best_cut = placement.copy(), edge_cut(graph, placement)
+
+    for _ in range(iterations):
+        # neighbors of every document on every partition
+        counts = np.bincount(sources * num_partitions + placement[graph.neighbors],
+                             minlength=graph.num_docs * num_partitions).reshape(graph.num_docs, num_partitions)
+        targets = counts.argmax(axis=1)
+        gains = counts[docs, targets] - counts[docs, placement]
+        movers = np.flatnonzero(gains > 0)
+        if len(movers) == 0:
+            break
+        movers = movers[np.argsort(-gains[movers], kind='stable')]
+
+        sizes = np.bincount(placement, minlength=num_partitions)
+        moved = placement.copy()
+        for a in range(num_partitions):
+            for b in range(a + 1, num_partitions):
+                to_b = movers[(placement[movers] == a) & (targets[movers] == b)]
+                to_a = movers[(placement[movers] == b) & (targets[movers] == a)]
+                paired = min(len(to_b), len(to_a))
+                extra_b = max(0, min(len(to_b) - paired, capacity - sizes[b]))
+                extra_a = max(0, min(len(to_a) - paired, capacity - sizes[a]))
+                moved[to_b[:paired + extra_b]] = b
+                moved[to_a[:paired + extra_a]] = a
+                sizes[a] += extra_a - extra_b
+                sizes[b] += extra_b - extra_a
+        placement = moved
+
+        cut = edge_cut(graph, placement)
+        if cut >= best_cut:
+            break
+        best_placement, best_cut = placement.copy(), cut
+    return best_placement
+
+
+def plan_placement(strategy, graph, num_partitions, seed=0, imbalance=0.03, iterations=20):
+    """Assign every document of graph to one of num_partitions accelerators with the given strategy."""
+    if strategy == 'random':
+        return place_random(graph.num_docs, num_partitions, seed)
+    if strategy == 'locality':
+        return place_locality(graph, num_partitions)
+    if strategy == 'graph':
+        return place_graph(graph, num_partitions, imbalance, iterations)
+    raise ValueError(f"Unknown placement strategy '{strategy}'. Choose from {PLACEMENT_STRATEGIES}.")
+
+
+def bfs_order(graph):
+    """Documents with neighbors in breadth-first order, from the entry point and then from every unvisited component."""
+    degrees = graph.degrees()
+    visited = degrees == 0
+    order = []
+    start = graph.entry_point if not visited[graph.entry_point] else None
+    while True:
+        if start is None:
+            unvisited = np.flatnonzero(~visited)
+            if len(unvisited) == 0:
+                break
+            start = unvisited[0]
+        frontier = np.array([start])
+        visited[start] = True
+        while len(frontier):
+            order.append(frontier)
+            # neighbors of the frontier, in frontier order, first occurrence only
+            counts = degrees[frontier]
+            positions = np.repeat(graph.offsets[frontier] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            candidates = graph.neighbors[positions]
+            candidates = candidates[~visited[candidates]]
+            _, first = np.unique(candidates, return_index=True)
+            frontier = candidates[np.sort(first)]
+            visited[frontier] = True
+        start = None
+    return np.concatenate(order) if order else np.zeros(0, dtype=np.int64)
+
+
+def edge_cut(graph, placement):
+    """Number of undirected edges whose documents are on different partitions."""
+    return int(np.count_nonzero(placement[graph.sources()] != placement[graph.neighbors])) // 2
+
+
+def placed_trace(trace, placement):
+    """
+    A copy of trace whose partitions list the placement of every neighbor.
+
+    Each dense hop is assigned to the accelerator holding its node. Entries without neighbor ids
+    (posting lists) keep their partitions.
+    """
+    if trace.nodes.dtype == object:
+        return trace
+    listed = np.diff(trace.neighbor_offsets) == trace.neighbor_counts
+    placed = listed & (trace.entry_types == DENSE_ENTRY)
+
+    entries = np.repeat(np.arange(len(trace)), np.diff(trace.neighbor_offsets))
+    partition_counts = np.where(placed, trace.neighbor_counts, np.diff(trace.partition_offsets))
+    partition_offsets = np.zeros(len(trace) + 1, dtype=np.int64)
+    np.cumsum(partition_counts, out=partition_offsets[1:])
+
+    partition_ids = np.empty(partition_offsets[-1], dtype=np.int64)
+    kept = np.repeat(~placed, partition_counts)
+    partition_ids[~kept] = placement[trace.neighbor_ids[placed[entries]]]
+    partition_ids[kept] = trace.partition_ids[np.repeat(~placed, np.diff(trace.partition_offsets))]
+
+    assigned_accelerators = np.where(placed, placement[trace.nodes.astype(np.int64)], trace.assigned_accelerators)
+    return TraceData(
+        nodes=trace.nodes,
+        entry_types=trace.entry_types,
+        neighbor_counts=trace.neighbor_counts,
+        neighbor_offsets=trace.neighbor_offsets,
+        neighbor_ids=trace.neighbor_ids,
+        partition_offsets=partition_offsets,
+        partition_ids=partition_ids,
+        data_sizes=trace.data_sizes,
+        embedding_sizes=trace.embedding_sizes,
+        assigned_accelerators=assigned_accelerators,
+    )
+
+
+def cross_partition_neighbors(trace, placement):
+    """Fraction of the scored neighbors of a trace's dense hops that live off the hop node's partition."""
+    if trace.nodes.dtype == object:
+        return 0.0
+    listed = np.diff(trace.neighbor_offsets) == trace.neighbor_counts
+    placed = listed & (trace.entry_types == DENSE_ENTRY)
+    entries = np.repeat(np.arange(len(trace)), np.diff(trace.neighbor_offsets))
+    in_hop = placed[entries]
+    if not in_hop.any():
+        return 0.0
+    hop_nodes = trace.nodes[entries[in_hop]].astype(np.int64)
+    return float(np.mean(placement[trace.neighbor_ids[in_hop]] != placement[hop_nodes]))
+
+
+def write_placed_trace(trace_file, output_file, placement):
+    """
+    Rewrite trace_file's partitions (and assigned accelerators) from placement into output_file.
+
+    Binary traces are rewritten column-wise. JSON and JSON-lines traces are streamed entry by
+    entry and written back in their own layout, keeping every other field.
+    """
+    if is_binary_trace(trace_file):
+        save_binary_trace(placed_trace(load_binary_trace(trace_file), placement), output_file)
+        return
+
+    json_lines = trace_file.endswith('.jsonl')
+    with open(output_file, 'w') as file:
+        if not json_lines:
+            file.write('[\n')
+        for i, entry in enumerate(iter_trace_entries(trace_file)):
+            if 'node' in entry and isinstance(entry['node'], int) and len(entry['neighbors']) > 0:
+                entry['partitions'] = placement[entry['neighbors']].tolist()
+                entry['assigned_accelerator'] = int(placement[entry['node']])
+            if json_lines:
+                file.write(json.dumps(entry) + '\n')
+            else:
+                file.write((',\n' if i else '') + textwrap.indent(json.dumps(entry, indent=4), '    '))
+        if not json_lines:
+            file.write('\n]')
@@ -0,0 +1,348 @@
+import json
+import struct
+from array import array
+
+import numpy as np
+
+DENSE_ENTRY = 0
+SPARSE_ENTRY = 1
+
+# Characters allowed between top-level entries of a JSON array or a JSON-lines file
+ENTRY_SEPARATORS = ' \t\r\n,[]'
+
+# Binary trace layout:
+#   MAGIC | uint64 header length | JSON header | padding | column arrays, each ALIGNMENT-aligned
+# The header records the dtype, offset (from the aligned end of the header) and length of every
+# TraceData column, so loading is one read-only mmap plus a zero-copy view per column.
+MAGIC = b'RAGXTRC1'
+ALIGNMENT = 64
+BINARY_TRACE_EXTENSION = '.rtrace'
+
+TRACE_COLUMNS = [
+    'nodes', 'entry_types', 'neighbor_counts', 'neighbor_offsets', 'neighbor_ids',
+    'partition_offsets', 'partition_ids', 'data_sizes', 'embedding_sizes', 'assigned_accelerators',
+]
+
+
+def iter_trace_entries(trace_file, chunk_size=1 << 20):
+    """
+    Yield trace entries one at a time from a JSON array or JSON-lines file.
+
+    The file is read in chunks and decoded incrementally, so only the entry being
+    parsed (plus one chunk) is ever held in memory.
+
+    Args:
+        trace_file (str): Path to the JSON or JSONL trace.
+        chunk_size (int): Number of characters read from the file at a time.
+
+    Yields:
+        dict: One decoded trace entry.
+    """
+    decoder = json.JSONDecoder()
+    with open(trace_file, 'r') as file:
+        buffer = file.read(chunk_size)
+        pos = 0
+        while buffer:
+            # Skip the array brackets, commas and whitespace between entries
+            while pos < len(buffer) and buffer[pos] in ENTRY_SEPARATORS:
+                pos += 1
+            if pos == len(buffer):
+                buffer, pos = file.read(chunk_size), 0
+                continue
+
+            try:
+                entry, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The entry straddles the chunk boundary; read more and retry
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield entry
+
+
+class TraceData:
+    """
+    Column-oriented trace storage.
+
+    Every per-entry field is a numpy array indexed by entry position. Neighbor ids and
+    partition ids are stored CSR-style: entry i owns
+    neighbor_ids[neighbor_offsets[i]:neighbor_offsets[i + 1]] (likewise for partitions).
+
+    Traces that only record a neighbor count (the sparse "Number of Neighbors" layout)
+    have no ids; neighbors() then returns a range of the recorded length as a placeholder.
+    """
+
+    def __init__(self, nodes, entry_types, neighbor_counts, neighbor_offsets, neighbor_ids,
+                 partition_offsets, partition_ids, data_sizes, embedding_sizes, assigned_accelerators):
+        self.nodes = nodes
+        self.entry_types = entry_types
+        self.neighbor_counts = neighbor_counts
+        self.neighbor_offsets = neighbor_offsets
+        self.neighbor_ids = neighbor_ids
+        self.partition_offsets = partition_offsets
+        self.partition_ids = partition_ids
+        self.data_sizes = data_sizes
+        self.embedding_sizes = embedding_sizes
+        self.assigned_accelerators = assigned_accelerators  # -1 where the trace assigns none
+
+    def __len__(self):
+        return len(self.neighbor_counts)
+
+    @property
+    def num_dense(self):
+        return int(np.count_nonzero(self.entry_types == DENSE_ENTRY))
+
+    @property
+    def num_sparse(self):
+        return int(np.count_nonzero(self.entry_types == SPARSE_ENTRY))
+
+    def has_neighbor_ids(self, i):
+        return self.neighbor_offsets[i + 1] - self.neighbor_offsets[i] == self.neighbor_counts[i]
+
+    def neighbors(self, i):
+        """Neighbor (or posting-list document) ids of entry i as a zero-copy view."""
+        if not self.has_neighbor_ids(i):
+            return range(int(self.neighbor_counts[i]))
+        return self.neighbor_ids[self.neighbor_offsets[i]:self.neighbor_offsets[i + 1]]
+
+    def targets(self, i):
+        """The entry's node followed by its neighbors, i.e. every vector scored for entry i."""
+        neighbors = self.neighbors(i)
+        if isinstance(neighbors, range):
+            return range(len(neighbors) + 1)
+        return np.concatenate(([self.nodes[i]], neighbors))
+
+    def partitions(self, i):
+        return self.partition_ids[self.partition_offsets[i]:self.partition_offsets[i + 1]]
+
+    def partition_count(self, i):
+        partitions = self.partitions(i)
+        return len(np.unique(partitions)) if len(partitions) else 1
+
+    def neighbors_per_partition(self, i):
+        partitions, counts = np.unique(self.partitions(i), return_counts=True)
+        return dict(zip(partitions.tolist(), counts.tolist()))
+
+    def neighbor_shards(self, num_shards):
+        """
+        Neighbors of every entry owned by each of num_shards shards, as an (entries, num_shards) array.
+
+        Neighbor j of an entry lives on shard partitions[j] % num_shards. Entries that do not list
+        one partition per neighbor keep all their neighbors on their first partition (shard 0 if
+        they list none).
+        """
+        counts = np.zeros((len(self), num_shards), dtype=np.int64)
+        partition_counts = np.diff(self.partition_offsets)
+        per_neighbor = partition_counts == self.neighbor_counts
+
+        entries = np.repeat(np.arange(len(self)), partition_counts)
+        listed = per_neighbor[entries]
+        np.add.at(counts, (entries[listed], self.partition_ids[listed] % num_shards), 1)
+
+        whole = np.flatnonzero(~per_neighbor)
+        shards = np.zeros(len(whole), dtype=np.int64)
+        has_partition = partition_counts[whole] > 0
+        shards[has_partition] = self.partition_ids[self.partition_offsets[whole[has_partition]]] % num_shards
+        counts[whole, shards] += self.neighbor_counts[whole]
+        return counts
+
+    def discovery_entries(self):
+        """
+        Entry at which every entry's node first appeared among the listed neighbors.
+
+        Entries whose node is never listed as a neighbor before or at it (the traversal's entry
+        point, token entries, or traces without neighbor ids) get their own position.
+        """
+        owners = np.repeat(np.arange(len(self)), np.diff(self.neighbor_offsets))
+        ids, first = np.unique(self.neighbor_ids, return_index=True)  # owners ascend, so first listing
+        discovered = np.arange(len(self))
+        if len(ids) == 0 or self.nodes.dtype == object:
+            return discovered
+
+        position = np.minimum(np.searchsorted(ids, self.nodes), len(ids) - 1)
+        listed = ids[position] == self.nodes
+        discovered[listed] = np.minimum(owners[first[position[listed]]], discovered[listed])
+        return discovered
+
+    def assigned_accelerator(self, i):
+        accelerator = int(self.assigned_accelerators[i])
+        return None if accelerator < 0 else accelerator
+
+    def sparse_statistics(self):
+        """Posting statistics over sparse (token) entries, or an empty dict if there are none."""
+        sparse = self.entry_types == SPARSE_ENTRY
+        if not sparse.any():
+            return {}
+
+        total_postings = int(self.neighbor_counts[sparse].sum())
+        documents = [self.neighbor_ids[self.neighbor_offsets[i]:self.neighbor_offsets[i + 1]]
+                     for i in np.flatnonzero(sparse)]
+        return {
+            "total_postings": total_postings,
+            "avg_postings_per_token": total_postings / int(sparse.sum()),
+            "unique_documents_count": len(np.unique(np.concatenate(documents))),
+        }
+
+
+class TraceBuilder:
+    """Accumulates streamed entries into compact typed buffers and freezes them into a TraceData."""
+
+    def __init__(self, sparse_layout=False):
+        self.sparse_layout = sparse_layout
+        self.nodes = array('q')
+        self.entry_types = array('b')
+        self.neighbor_counts = array('q')
+        self.neighbor_offsets = array('q', [0])
+        self.neighbor_ids = array('q')
+        self.partition_offsets = array('q', [0])
+        self.partition_ids = array('q')
+        self.data_sizes = array('q')
+        self.embedding_sizes = array('q')
+        self.assigned_accelerators = array('q')
+
+    def append_node(self, node):
+        if isinstance(self.nodes, array) and not isinstance(node, int):
+            # Token traces name entries by string; fall back to a plain list
+            self.nodes = list(self.nodes)
+        self.nodes.append(node)
+
+    def append(self, entry):
+        if 'node' in entry:
+            entry_type = DENSE_ENTRY
+            node = entry["node"]
+            neighbors = entry["neighbors"]
+            if self.sparse_layout:
+                # Posting-list traces record only the number of documents scored
+                neighbor_count = entry["Number of Neighbors"]
+                assigned_accelerator = -1
+            else:
+                neighbor_count = len(neighbors)
+                assigned_accelerator = entry.get("assigned_accelerator", -1)
+            embedding_size = entry.get("embedding_size", 128)
+        elif 'token' in entry:
+            entry_type = SPARSE_ENTRY
+            node = entry["token"]
+            neighbors = entry["documents"]
+            neighbor_count = len(neighbors)
+            assigned_accelerator = -1
+            embedding_size = -1
+        else:
+            raise ValueError("Trace entry format not recognized. Each entry must contain either 'node' or 'token'.")
+
+        partitions = entry["partitions"] if isinstance(entry["partitions"], list) else [entry["partitions"]]
+
+        self.append_node(node)
+        self.entry_types.append(entry_type)
+        self.neighbor_counts.append(neighbor_count)
+        self.neighbor_ids.extend(neighbors)
+        self.neighbor_offsets.append(len(self.neighbor_ids))
+        self.partition_ids.extend(partitions)
+        self.partition_offsets.append(len(self.partition_ids))
+        self.data_sizes.append(entry.get("data_size", 50))
+        self.embedding_sizes.append(embedding_size)
+        self.assigned_accelerators.append(assigned_accelerator)
+
+    def build(self):
+        if isinstance(self.nodes, array):
+            nodes = np.frombuffer(self.nodes, dtype=np.int64)
+        else:
+            nodes = np.array(self.nodes, dtype=object)
+        return TraceData(
+            nodes=nodes,
+            entry_types=np.frombuffer(self.entry_types, dtype=np.int8),
+            neighbor_counts=np.frombuffer(self.neighbor_counts, dtype=np.int64),
+            neighbor_offsets=np.frombuffer(self.neighbor_offsets, dtype=np.int64),
+            neighbor_ids=np.frombuffer(self.neighbor_ids, dtype=np.int64),
+            partition_offsets=np.frombuffer(self.partition_offsets, dtype=np.int64),
+            partition_ids=np.frombuffer(self.partition_ids, dtype=np.int64),
+            data_sizes=np.frombuffer(self.data_sizes, dtype=np.int64),
+            embedding_sizes=np.frombuffer(self.embedding_sizes, dtype=np.int64),
+            assigned_accelerators=np.frombuffer(self.assigned_accelerators, dtype=np.int64),
+        )
+
+
+def align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def is_binary_trace(trace_file):
+    with open(trace_file, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def compact_ids(values):
+    """Narrow an id column to int32 when every id fits, halving its size on disk."""
+    int32 = np.iinfo(np.int32)
+    if len(values) == 0 or (values.min() >= int32.min and values.max() <= int32.max):
+        return values.astype(np.int32)
+    return values
+
+
+def save_binary_trace(trace, trace_file):
+    """Write a TraceData to trace_file in the binary trace format."""
+    columns = {name: np.ascontiguousarray(getattr(trace, name)) for name in TRACE_COLUMNS}
+    if columns['nodes'].dtype == object:
+        # Token traces name entries by string; fixed-width unicode keeps them mmap-able
+        columns['nodes'] = columns['nodes'].astype(str)
+    for name in ['nodes', 'neighbor_ids', 'partition_ids']:
+        if columns[name].dtype.kind == 'i':
+            columns[name] = compact_ids(columns[name])
+
+    arrays, offset = {}, 0
+    for name, values in columns.items():
+        offset = align(offset)
+        arrays[name] = {'dtype': values.dtype.str, 'offset': offset, 'length': len(values)}
+        offset += values.nbytes
+    header = json.dumps({'version': 1, 'num_entries': len(trace), 'arrays': arrays}).encode()
+
+    data_start = align(len(MAGIC) + 8 + len(header))
+    with open(trace_file, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack('<Q', len(header)))
+        file.write(header)
+        for name, values in columns.items():
+            file.write(b'\0' * (data_start + arrays[name]['offset'] - file.tell()))
+            file.write(values.tobytes())
+
+
+def load_binary_trace(trace_file):
+    """Memory-map a binary trace; every TraceData column is a read-only view into the file."""
+    with open(trace_file, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{trace_file} is not a binary trace file.")
+        (header_length,) = struct.unpack('<Q', file.read(8))
+        header = json.loads(file.read(header_length))
+
+    data_start = align(len(MAGIC) + 8 + header_length)
+    buffer = np.memmap(trace_file, dtype=np.uint8, mode='r')
+    columns = {}
+    for name in TRACE_COLUMNS:
+        spec = header['arrays'][name]
+        dtype = np.dtype(spec['dtype'])
+        start = data_start + spec['offset']
+        columns[name] = buffer[start:start + spec['length'] * dtype.itemsize].view(dtype)
+    return TraceData(**columns)
+
+
+def load_trace(trace_file, sparse_layout=False):
+    """
+    Load a trace into a TraceData, memory-mapping binary traces and streaming JSON/JSONL ones.
+
+    Args:
+        trace_file (str): Path to the trace.
+        sparse_layout (bool): True for posting-list traces (bm25, splade) whose entries carry
+            "Number of Neighbors" instead of explicit neighbor ids. Binary traces already
+            record their layout, so this only applies to JSON input.
+
+    Returns:
+        TraceData: The columnar trace.
+    """
+    if is_binary_trace(trace_file):
+        return load_binary_trace(trace_file)
+
+    builder = TraceBuilder(sparse_layout)
+    for entry in iter_trace_entries(trace_file):
+        builder.append(entry)
+    return builder.build()